@@ -1,14 +1,33 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, make_response, stream_with_context
 from flask_cors import CORS
+from concurrent.futures import TimeoutError as FutureTimeout
+from functools import wraps
+import hmac
+import json
 import os
 import sys
+import time
+
+from model.batching import DEADLINE_GRACE, MicroBatcher
+from model.concurrency import (
+    AdmissionController, AdmissionRejected, BoundedExecutor, RouteBusy, RouteLimiter, parse_limits
+)
+from model.genai_loader import LOADING, WARMING, ReasonerLoader
+from model.inference_server import InferenceClient, InferenceServer, parse_address
+from model.reasoning_cache import ReasoningCache, reasoning_key
+from model.rule_engine import get_rule_book, get_rule_engine
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
 
+# Largest JSON array accepted by /verdict/batch (NDJSON input is streamed)
+MAX_BATCH_SIZE = int(os.environ.get('MAX_BATCH_SIZE', 10000))
+# Cases scored together per chunk of NDJSON input
+NDJSON_CHUNK_SIZE = 500
+
 # Try to import the AI judge model
 try:
-    from model.ai_judge import ml_predict_verdict
+    from model.ai_judge import ml_predict_verdict, ml_predict_verdicts
     AI_MODEL_AVAILABLE = True
     print("✅ AI Judge model loaded successfully!")
 except Exception as e:
@@ -16,14 +35,241 @@ except Exception as e:
     print(f"⚠️  AI Judge model not available: {e}")
     print("📝 Using fallback logic for verdicts")
 
-# Try to import the local GenAI Reasoner
+# Verdict engine: "rules" (ai_judge keyword scoring) or "tfidf" (the trained
+# TF-IDF classifier in model/predictor.py, whose class probability becomes
+# the confidence); requests can pick one with "engine" in the JSON body or
+# ?engine= on the URL
+VERDICT_ENGINES = ('rules', 'tfidf')
+VERDICT_ENGINE = os.environ.get('VERDICT_ENGINE', 'rules').lower()
+# A model trained with --structured scores text-only cases on training-mean
+# evidence columns, which pushes nearly all of them to one verdict; such
+# cases go to the rules engine instead unless VERDICT_IMPUTE_STRUCTURED=1
+VERDICT_IMPUTE_STRUCTURED = os.environ.get('VERDICT_IMPUTE_STRUCTURED', '0') == '1'
+
+try:
+    # get_predictor() is called per request: it swaps in newly published
+    # bundles (see model/online_training.py) without a restart
+    from model.predictor import get_predictor, get_predictor_book
+    verdict_predictor = get_predictor()
+    PREDICTOR_AVAILABLE = True
+    print(f"✅ TF-IDF verdict predictor loaded from {verdict_predictor.source} "
+          f"(version {(verdict_predictor.version or 'pickle')[:12]})")
+    if verdict_predictor.structured_columns and not VERDICT_IMPUTE_STRUCTURED:
+        print("📝 Cases without structured evidence columns will use the rules engine "
+              "(VERDICT_IMPUTE_STRUCTURED=1 imputes them instead)")
+except Exception as e:
+    verdict_predictor = None
+    PREDICTOR_AVAILABLE = False
+    print(f"⚠️  TF-IDF verdict predictor not available: {e}")
+
+# Decided cases posted to /cases/adjudicated are appended to the JSONL log
+# that model/online_training.py learns from. Whoever can post cases steers
+# the model, so the route is disabled unless ADJUDICATED_CASES_TOKEN is set;
+# clients send it as "Authorization: Bearer <token>"
 try:
-    from model.gen_ai_reasoner import LocalGenAIReasoner
-    genai = LocalGenAIReasoner()
-    print("🧠 Local GenAI Reasoner loaded successfully!")
+    from model.dataset_loader import normalize_verdict
+    from model.online_training import DEFAULT_LOG as DEFAULT_ADJUDICATED_LOG, append_cases
+    CASE_LOG_AVAILABLE = True
 except Exception as e:
-    genai = None
-    print(f"⚠️  Local GenAI Reasoner not available: {e}")
+    CASE_LOG_AVAILABLE = False
+    print(f"⚠️  Adjudicated case log not available: {e}")
+ADJUDICATED_LOG_PATH = os.environ.get('ADJUDICATED_LOG_PATH') or (
+    DEFAULT_ADJUDICATED_LOG if CASE_LOG_AVAILABLE else None
+)
+ADJUDICATED_CASES_TOKEN = os.environ.get('ADJUDICATED_CASES_TOKEN') or None
+# Largest batch of decided cases accepted per request
+MAX_ADJUDICATED_CASES = int(os.environ.get('MAX_ADJUDICATED_CASES', 1000))
+
+# Local GenAI Reasoner is imported and loaded in a background thread so
+# the API (and /health) is available immediately after boot
+# Seconds /api/genai_reason waits for a still-loading model before falling
+# back to rule-based reasoning
+GENAI_WAIT_TIMEOUT = float(os.environ.get('GENAI_WAIT_TIMEOUT', 0))
+# Seconds a /api/genai_reason request may take before generation is cut
+# short; clients can ask for a different budget with the X-Latency-Budget
+# header, capped so requests always finish inside gunicorn's --timeout 120
+GENAI_LATENCY_BUDGET = float(os.environ.get('GENAI_LATENCY_BUDGET', 60))
+GENAI_MAX_LATENCY_BUDGET = float(os.environ.get('GENAI_MAX_LATENCY_BUDGET', 110))
+# Concurrent /api/genai_reason calls arriving within this window share one
+# batched generate call (GENAI_MAX_BATCH=1 disables batching)
+GENAI_BATCH_WINDOW_MS = float(os.environ.get('GENAI_BATCH_WINDOW_MS', 50))
+GENAI_MAX_BATCH = int(os.environ.get('GENAI_MAX_BATCH', 8))
+# Sampling makes reasoning vary between runs, so cached reasoning is only
+# served when a request asks for it ("cache": true) or when
+# GENAI_DETERMINISTIC=1 switches the model to greedy decoding
+GENAI_DETERMINISTIC = os.environ.get('GENAI_DETERMINISTIC', '0') == '1'
+
+# CPU load mode: "float32" (default), "bfloat16", or opt-in "int8" (dynamic
+# quantization of Linear layers: smaller and faster, but the reasoning text
+# differs from the float32 model's)
+GENAI_CPU_PRECISION = os.environ.get('GENAI_CPU_PRECISION', 'float32')
+# Shared model process: with GENAI_INFERENCE_ADDRESS set (a Unix socket
+# path, or host:port on a loopback host), the LLM is loaded once by
+# `python app.py --inference-server` and every gunicorn worker forwards
+# reasoning calls to it instead of loading its own copy. The connection
+# carries pickles, so there is no default authkey: both sides must be given
+# the same secret GENAI_INFERENCE_AUTHKEY
+GENAI_INFERENCE_ADDRESS = os.environ.get('GENAI_INFERENCE_ADDRESS') or None
+GENAI_INFERENCE_AUTHKEY = os.environ.get('GENAI_INFERENCE_AUTHKEY') or None
+if GENAI_INFERENCE_ADDRESS:
+    if not GENAI_INFERENCE_AUTHKEY:
+        sys.exit("❌ GENAI_INFERENCE_ADDRESS is set but GENAI_INFERENCE_AUTHKEY is not; "
+                 "set it to a random secret shared by the inference server and the workers")
+    try:
+        parse_address(GENAI_INFERENCE_ADDRESS)
+    except ValueError as e:
+        sys.exit(f"❌ {e}")
+# Seconds a worker waits for the inference server to come up and finish loading
+GENAI_INFERENCE_CONNECT_TIMEOUT = float(os.environ.get('GENAI_INFERENCE_CONNECT_TIMEOUT', 600))
+INFERENCE_SERVER = __name__ == '__main__' and '--inference-server' in sys.argv
+
+# Torch intra-op threads default to the cores available to each gunicorn
+# worker (WEB_CONCURRENCY workers share the box, unless the model lives in
+# the inference server); request threads funnel generation through the
+# batcher, so one inter-op thread is enough
+GENAI_NUM_THREADS = int(os.environ.get('GENAI_NUM_THREADS') or 0) or max(
+    1, (os.cpu_count() or 1) // (
+        1 if INFERENCE_SERVER else max(1, int(os.environ.get('WEB_CONCURRENCY', 1)))
+    )
+)
+GENAI_INTEROP_THREADS = int(os.environ.get('GENAI_INTEROP_THREADS', 1))
+# Local snapshot of the model (config, tokenizer, *.safetensors): loaded
+# offline with memory-mapped weights, which cuts cold starts after the
+# instance spins down
+GENAI_MODEL_PATH = os.environ.get('GENAI_MODEL_PATH') or None
+# Opt-in speculative decoding: "prompt_lookup" (drafts from the case text,
+# greedy) or the name of a small draft model. Assisted generation runs one
+# prompt at a time, so it replaces micro-batching
+GENAI_SPECULATIVE = os.environ.get('GENAI_SPECULATIVE') or None
+# Inference backend: "torch" (transformers) or "onnx" (ONNX Runtime serving
+# a bundle from `python -m model.export_onnx`, no torch needed at runtime)
+GENAI_BACKEND = os.environ.get('GENAI_BACKEND', 'torch').lower()
+GENAI_ONNX_PATH = os.environ.get('GENAI_ONNX_PATH') or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'model', 'models', 'genai-onnx'
+)
+# Synthetic cases run through the model (GENAI_WARMUP_TOKENS new tokens
+# each) before it is reported ready, so no user request takes the cold
+# path; 0 disables warm-up
+GENAI_WARMUP_ROUNDS = int(os.environ.get('GENAI_WARMUP_ROUNDS', 3))
+GENAI_WARMUP_TOKENS = int(os.environ.get('GENAI_WARMUP_TOKENS', 16))
+
+# Backpressure: a route holds at most its ROUTE_CONCURRENCY limit of server
+# threads (429 beyond it, 0 = unlimited). Reasoning requests pass an
+# admission queue: GENAI_CONCURRENCY generate at once and GENAI_QUEUE_SIZE
+# more wait, served by priority (X-Priority: high/normal/low) and fairly
+# across clients (X-Client-Id, else the client address). A full queue gets
+# 503 with Retry-After; a request whose expected wait (from the running
+# tokens/sec average) would overrun its latency budget gets rule-based
+# reasoning straight away. With gunicorn --threads 16 the defaults leave
+# /verdict and /health at least 4 free threads while reasoning requests
+# pile up
+ROUTE_CONCURRENCY = parse_limits(os.environ.get(
+    'ROUTE_CONCURRENCY', 'verdict_batch=2,genai_reason=8,genai_stream=2'
+))
+GENAI_CONCURRENCY = int(os.environ.get('GENAI_CONCURRENCY', 4))
+GENAI_QUEUE_SIZE = int(os.environ.get('GENAI_QUEUE_SIZE', 4))
+GENAI_RETRY_AFTER = int(os.environ.get('GENAI_RETRY_AFTER', 10))
+
+route_limiter = RouteLimiter(ROUTE_CONCURRENCY)
+admission = AdmissionController(
+    GENAI_CONCURRENCY, GENAI_QUEUE_SIZE, default_retry_after=GENAI_RETRY_AFTER
+)
+# Admission already bounds the calls in flight, so the executor needs no backlog
+llm_executor = BoundedExecutor(GENAI_CONCURRENCY, 0)
+
+reasoning_cache = ReasoningCache(
+    max_entries=int(os.environ.get('GENAI_CACHE_SIZE', 256)),
+    ttl=float(os.environ.get('GENAI_CACHE_TTL', 7 * 24 * 3600)),
+    db_path=os.environ.get('GENAI_CACHE_PATH') or None,
+    max_disk_entries=int(os.environ.get('GENAI_CACHE_DISK_SIZE', 10000))
+)
+
+
+def _build_reasoner():
+    if GENAI_BACKEND == 'onnx':
+        from model.onnx_reasoner import OnnxGenAIReasoner
+        reasoner = OnnxGenAIReasoner(
+            GENAI_ONNX_PATH,
+            num_threads=GENAI_NUM_THREADS,
+            interop_threads=GENAI_INTEROP_THREADS,
+            speculative=GENAI_SPECULATIVE
+        )
+    else:
+        from model.gen_ai_reasoner import LocalGenAIReasoner
+        reasoner = LocalGenAIReasoner(
+            cpu_precision=GENAI_CPU_PRECISION,
+            num_threads=GENAI_NUM_THREADS,
+            interop_threads=GENAI_INTEROP_THREADS,
+            speculative=GENAI_SPECULATIVE,
+            snapshot_dir=GENAI_MODEL_PATH
+        )
+    if GENAI_DETERMINISTIC:
+        reasoner.fast_generation_config.do_sample = False
+    return MicroBatcher(
+        reasoner,
+        window_ms=GENAI_BATCH_WINDOW_MS,
+        max_batch=1 if reasoner.speculative else GENAI_MAX_BATCH
+    )
+
+
+def _warm_up_reasoner(batcher):
+    # Straight to the reasoner so warm-up calls stay out of batching stats
+    return batcher.reasoner.warm_up(GENAI_WARMUP_ROUNDS, GENAI_WARMUP_TOKENS)
+
+
+def _connect_inference_server():
+    return InferenceClient(
+        GENAI_INFERENCE_ADDRESS,
+        authkey=GENAI_INFERENCE_AUTHKEY,
+        connect_timeout=GENAI_INFERENCE_CONNECT_TIMEOUT
+    )
+
+
+if GENAI_INFERENCE_ADDRESS and not INFERENCE_SERVER:
+    # The inference server loads and warms up the model
+    genai_loader = ReasonerLoader(
+        _connect_inference_server,
+        enabled=os.environ.get('GENAI_ENABLED', '1') != '0'
+    )
+else:
+    genai_loader = ReasonerLoader(
+        _build_reasoner,
+        enabled=os.environ.get('GENAI_ENABLED', '1') != '0',
+        warm_up=_warm_up_reasoner if GENAI_WARMUP_ROUNDS > 0 else None
+    )
+genai_loader.start()
+
+
+def limit_concurrency(route):
+    """Refuse requests beyond the route's ROUTE_CONCURRENCY limit with 429"""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            try:
+                route_limiter.enter(route)
+            except RouteBusy as e:
+                return _overloaded(429, "Too many concurrent requests", str(e), 1)
+            try:
+                response = make_response(view(*args, **kwargs))
+            except Exception:
+                route_limiter.leave(route)
+                raise
+            if response.is_streamed:
+                # The slot is held until the streamed body is done or abandoned
+                response.call_on_close(lambda: route_limiter.leave(route))
+            else:
+                route_limiter.leave(route)
+            return response
+        return wrapper
+    return decorator
+
+
+def _overloaded(status, error, message, retry_after):
+    """429/503 backpressure response telling the client when to retry"""
+    response = jsonify({"error": error, "message": message, "retry_after": retry_after})
+    response.status_code = status
+    response.headers["Retry-After"] = str(retry_after)
+    return response
 
 
 @app.route('/', methods=['GET'])
@@ -34,10 +280,15 @@ def home():
         "message": "AI Court Backend API",
         "version": "2.0.0",
         "ai_model_available": AI_MODEL_AVAILABLE,
-        "genai_available": genai is not None,
+        "tfidf_predictor_available": PREDICTOR_AVAILABLE,
+        "verdict_engine": VERDICT_ENGINE,
+        "genai_available": genai_loader.ready,
         "endpoints": {
             "POST /verdict": "Submit a case for judgment",
+            "POST /verdict/batch": "Submit many cases (JSON array or NDJSON) for judgment",
+            "POST /cases/adjudicated": "Log decided cases for incremental training",
             "POST /api/genai_reason": "Generate logical & emotional reasoning",
+            "POST /api/genai_reason/stream": "Stream reasoning tokens as Server-Sent Events",
             "GET /health": "Health check",
             "GET /": "API information"
         }
@@ -50,11 +301,25 @@ def health():
     return jsonify({
         "status": "healthy",
         "ai_model": "loaded" if AI_MODEL_AVAILABLE else "using fallback",
-        "genai": "active" if genai else "not available"
+        "tfidf_predictor": "loaded" if PREDICTOR_AVAILABLE else "unavailable",
+        "tfidf_model": get_predictor().info() if PREDICTOR_AVAILABLE else None,
+        "tfidf_reloads": get_predictor_book().reloads if PREDICTOR_AVAILABLE else None,
+        "verdict_engine": VERDICT_ENGINE,
+        "genai": genai_loader.status(),
+        "genai_batching": genai_loader.reasoner.stats() if genai_loader.ready else None,
+        "reasoning_cache": reasoning_cache.stats(),
+        "concurrency": {
+            "routes": route_limiter.stats(),
+            "genai_executor": llm_executor.stats(),
+            "genai_admission": admission.stats()
+        },
+        "rules_version": get_rule_engine().version,
+        "rules_reloads": get_rule_book().reloads
     })
 
 
 @app.route('/verdict', methods=['POST'])
+@limit_concurrency('verdict')
 def get_verdict():
     """
     Endpoint to get a verdict for a case
@@ -62,8 +327,15 @@ def get_verdict():
     {
         "plaintiff": "...",
         "defendant": "...",
-        "evidence": "..."
+        "evidence": "...",
+        "engine": "rules" | "tfidf"   (optional, default VERDICT_ENGINE)
     }
+    The tfidf engine answers with a numeric confidence and per-class
+    "probabilities". Models trained with --structured also need the
+    dataset's evidence columns (plaintiff_evidence, ..., defendant_score);
+    a request without them is answered by the rules engine and lists them
+    under "missing_structured" (or, with VERDICT_IMPUTE_STRUCTURED=1, is
+    scored on training means and lists them under "imputed")
     """
     try:
         data = request.get_json()
@@ -80,6 +352,24 @@ def get_verdict():
                 "message": "Both plaintiff and defendant statements are required"
             }), 400
 
+        engine = _verdict_engine(data)
+        if engine not in VERDICT_ENGINES:
+            return _unknown_engine()
+
+        missing = None
+        if engine == 'tfidf' and PREDICTOR_AVAILABLE:
+            try:
+                predictor = get_predictor()
+                structured = _structured_fields(data, predictor.structured_columns)
+                missing = _refused_structured(predictor, structured)
+                if not missing:
+                    verdict = predictor.predict(plaintiff, defendant, evidence, structured)
+                    verdict["model"] = "TF-IDF Verdict Predictor"
+                    return jsonify(verdict), 200
+            except Exception as e:
+                # Fall through to the rule-based engine
+                print(f"Error using TF-IDF predictor: {e}")
+
         # Use AI model if available, otherwise fallback
         if AI_MODEL_AVAILABLE:
             try:
@@ -97,6 +387,8 @@ def get_verdict():
             verdict = get_fallback_verdict(plaintiff, defendant)
             verdict["model"] = "Fallback Logic"
 
+        if missing:
+            verdict["missing_structured"] = missing
         return jsonify(verdict), 200
 
     except Exception as e:
@@ -104,7 +396,284 @@ def get_verdict():
         return jsonify({"error": "Internal server error", "message": str(e)}), 500
 
 
+@app.route('/verdict/batch', methods=['POST'])
+@limit_concurrency('verdict_batch')
+def get_verdict_batch():
+    """
+    Endpoint to get verdicts for many cases in one request
+    Accepts a JSON array of cases (or {"cases": [...]}):
+    [
+        {"plaintiff": "...", "defendant": "...", "evidence": "..."},
+        ...
+    ]
+    or NDJSON (Content-Type: application/x-ndjson), one case per line,
+    which is streamed back as NDJSON results in the same order.
+    A bad case gets an "error" entry instead of failing the whole batch.
+    The engine is chosen with {"engine": ..., "cases": [...]} or ?engine=
+    (see /verdict); the tfidf engine scores each chunk with one sparse
+    transform and one predict_proba call.
+    """
+    if request.mimetype == 'application/x-ndjson':
+        engine = _verdict_engine(None)
+        if engine not in VERDICT_ENGINES:
+            return _unknown_engine()
+        return Response(
+            stream_with_context(_stream_ndjson_verdicts(request.stream, engine)),
+            mimetype='application/x-ndjson'
+        )
+
+    try:
+        data = request.get_json(silent=True)
+        engine = _verdict_engine(data)
+        if engine not in VERDICT_ENGINES:
+            return _unknown_engine()
+        cases = data.get('cases') if isinstance(data, dict) else data
+        if not isinstance(cases, list):
+            return jsonify({
+                "error": "Invalid batch",
+                "message": "Expected a JSON array of cases or an object with a 'cases' array"
+            }), 400
+
+        if len(cases) > MAX_BATCH_SIZE:
+            return jsonify({
+                "error": "Batch too large",
+                "message": f"At most {MAX_BATCH_SIZE} cases per request; use NDJSON to stream more"
+            }), 413
+
+        results = score_batch(cases, engine=engine)
+        return jsonify({
+            "results": results,
+            "count": len(results),
+            "errors": sum(1 for result in results if "error" in result)
+        }), 200
+
+    except Exception as e:
+        print(f"Error processing verdict batch: {e}")
+        return jsonify({"error": "Internal server error", "message": str(e)}), 500
+
+
+def _stream_ndjson_verdicts(stream, engine=None):
+    """Score NDJSON cases chunk by chunk, yielding one result line per case"""
+    chunk = []
+    start = 0
+    for line in _iter_lines(stream):
+        if not line.strip():
+            continue
+        try:
+            chunk.append(json.loads(line))
+        except ValueError as e:
+            chunk.append(_BatchError(f"Invalid JSON: {e}"))
+
+        if len(chunk) >= NDJSON_CHUNK_SIZE:
+            yield from _ndjson_lines(score_batch(chunk, start, engine))
+            start += len(chunk)
+            chunk = []
+
+    if chunk:
+        yield from _ndjson_lines(score_batch(chunk, start, engine))
+
+
+def _iter_lines(stream, block_size=64 * 1024):
+    """Split a request body into lines, reading it in large blocks"""
+    pending = b""
+    while True:
+        block = stream.read(block_size)
+        if not block:
+            break
+        lines = (pending + block).split(b"\n")
+        pending = lines.pop()
+        yield from lines
+    if pending:
+        yield pending
+
+
+def _ndjson_lines(results):
+    for result in results:
+        yield json.dumps(result) + "\n"
+
+
+class _BatchError:
+    """Placeholder for a batch item that could not even be parsed"""
+
+    def __init__(self, message):
+        self.message = message
+
+
+def _validate_case(case):
+    """Return (plaintiff, defendant, evidence) or an error message"""
+    if isinstance(case, _BatchError):
+        return case.message
+    if not isinstance(case, dict):
+        return "Each case must be a JSON object"
+
+    fields = []
+    for name in ('plaintiff', 'defendant', 'evidence'):
+        value = case.get(name) or ''
+        if not isinstance(value, str):
+            return f"'{name}' must be a string"
+        fields.append(value.strip())
+
+    if not fields[0] or not fields[1]:
+        return "Both plaintiff and defendant statements are required"
+    return tuple(fields)
+
+
+def _structured_fields(case, columns):
+    """The numeric evidence columns (of those a hybrid model uses) present in a request case"""
+    return {
+        name: case[name] for name in columns
+        if isinstance(case.get(name), (int, float)) and not isinstance(case[name], bool)
+    }
+
+
+def _refused_structured(predictor, structured):
+    """
+    Structured columns the predictor needs but a case lacks, when it must
+    not be scored on imputed values (an empty list means score it)
+    """
+    if VERDICT_IMPUTE_STRUCTURED:
+        return []
+    return predictor.missing_structured(structured)
+
+
+def score_batch(cases, start=0, engine=None):
+    """
+    Score a list of raw case objects, returning one result per case in
+    input order. Valid cases are scored together with ml_predict_verdicts
+    (or VerdictPredictor.predict_batch for the tfidf engine, except cases
+    lacking the structured columns it needs, see /verdict); result indexes
+    are numbered from start.
+    """
+    results = []
+    valid = []
+
+    for i, case in enumerate(cases, start):
+        checked = _validate_case(case)
+        if isinstance(checked, str):
+            results.append({"index": i, "error": checked})
+        else:
+            results.append({"index": i})
+            valid.append((results[-1], checked, case))
+
+    if (engine or VERDICT_ENGINE) == 'tfidf' and PREDICTOR_AVAILABLE and valid:
+        try:
+            predictor = get_predictor()
+            scored, refused = [], []
+            for item in valid:
+                structured = _structured_fields(item[2], predictor.structured_columns)
+                missing = _refused_structured(predictor, structured)
+                if missing:
+                    item[0]["missing_structured"] = missing
+                    refused.append(item)
+                else:
+                    scored.append((item, structured))
+            predictions = predictor.predict_batch(
+                [fields + (structured,) for (_, fields, _), structured in scored]
+            )
+        except Exception as e:
+            print(f"Error using TF-IDF predictor for batch: {e}")
+            predictions = None
+
+        if predictions is not None:
+            for ((result, _, _), _), prediction in zip(scored, predictions):
+                result.update(prediction)
+                result["model"] = "TF-IDF Verdict Predictor"
+            # Refused cases go on to the rules engine
+            valid = refused
+            if not valid:
+                return results
+
+    if AI_MODEL_AVAILABLE:
+        try:
+            verdicts = ml_predict_verdicts([fields for _, fields, _ in valid])
+        except Exception as e:
+            print(f"Error using AI model for batch: {e}")
+            verdicts = None
+
+        if verdicts is not None:
+            for (result, _, _), winner in zip(valid, verdicts):
+                result.update({
+                    "winner": winner,
+                    "confidence": "high",
+                    "model": "AI Judge ML Model"
+                })
+            return results
+
+    model_used = "Fallback Logic" if not AI_MODEL_AVAILABLE else "Fallback Logic (AI Model Error)"
+    for result, (plaintiff, defendant, _), _ in valid:
+        try:
+            result.update(get_fallback_verdict(plaintiff, defendant))
+            result["model"] = model_used
+        except Exception as e:
+            result["error"] = str(e)
+    return results
+
+
+@app.route('/cases/adjudicated', methods=['POST'])
+def log_adjudicated_cases():
+    """
+    Endpoint to record decided cases for incremental training
+    Accepts one case, a JSON array of cases or {"cases": [...]}:
+    {
+        "plaintiff": "...",
+        "defendant": "...",
+        "evidence": "...",              (optional)
+        "verdict": "Plaintiff" | "Defendant" | "Neutral",
+        "case_id": "..."                (optional)
+    }
+    All cases are appended to ADJUDICATED_LOG_PATH in one write, or none
+    are: any invalid case fails the request with 400 and its "errors".
+    Requires "Authorization: Bearer <ADJUDICATED_CASES_TOKEN>".
+    """
+    if not (CASE_LOG_AVAILABLE and ADJUDICATED_CASES_TOKEN):
+        return jsonify({
+            "error": "Case log disabled",
+            "message": "Set ADJUDICATED_CASES_TOKEN to accept adjudicated cases"
+        }), 403
+    scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+    if scheme.lower() != 'bearer' or not hmac.compare_digest(
+            token.strip().encode(), ADJUDICATED_CASES_TOKEN.encode()):
+        return jsonify({"error": "Unauthorized", "message": "Invalid or missing token"}), 401
+
+    data = request.get_json(silent=True)
+    cases = data.get('cases', [data]) if isinstance(data, dict) else data
+    if not isinstance(cases, list) or not cases:
+        return jsonify({
+            "error": "Invalid cases",
+            "message": "Expected a case object, a JSON array of cases or {\"cases\": [...]}"
+        }), 400
+    if len(cases) > MAX_ADJUDICATED_CASES:
+        return jsonify({
+            "error": "Batch too large",
+            "message": f"At most {MAX_ADJUDICATED_CASES} cases per request"
+        }), 413
+
+    records, errors = [], []
+    for i, case in enumerate(cases):
+        checked = _validate_case(case)
+        verdict = normalize_verdict(case.get('verdict')) if isinstance(case, dict) else None
+        if isinstance(checked, str):
+            errors.append({"index": i, "error": checked})
+        elif verdict is None:
+            errors.append({"index": i, "error": "'verdict' must be Plaintiff, Defendant or Neutral"})
+        else:
+            record = dict(zip(('plaintiff', 'defendant', 'evidence'), checked), verdict=verdict)
+            if case.get('case_id') is not None:
+                record['case_id'] = str(case['case_id'])
+            records.append(record)
+    if errors:
+        return jsonify({"error": "Invalid cases", "errors": errors}), 400
+
+    try:
+        append_cases(records, ADJUDICATED_LOG_PATH)
+    except OSError as e:
+        print(f"Error logging adjudicated cases: {e}")
+        return jsonify({"error": "Could not log cases", "message": str(e)}), 500
+    return jsonify({"logged": len(records)}), 201
+
+
 @app.route('/api/genai_reason', methods=['POST'])
+@limit_concurrency('genai_reason')
 def genai_reason():
     """
     Endpoint for Local GenAI to generate reasoning
@@ -113,8 +682,14 @@ def genai_reason():
         "plaintiff": "...",
         "defendant": "...",
         "evidence": "...",
-        "verdict": "Plaintiff/Defendant/Neutral"
+        "verdict": "Plaintiff/Defendant/Neutral",
+        "cache": true   (optional: reuse reasoning from an identical earlier case)
     }
+    Optional header X-Latency-Budget: seconds allowed for generation; text
+    cut short is ended at its last full sentence ("model" says so)
+    Optional headers X-Priority (high/normal/low) and X-Client-Id order the
+    GenAI queue; rule-based reasoning is returned at once when the expected
+    wait exceeds the budget, and 503 with Retry-After when the queue is full
     """
     try:
         data = request.get_json()
@@ -123,10 +698,30 @@ def genai_reason():
         evidence = data.get("evidence", "")
         verdict = data.get("verdict", "")
 
+        deadline = time.monotonic() + _latency_budget()
+        genai = genai_loader.get(timeout=GENAI_WAIT_TIMEOUT)
+        cached = False
         if genai:
-            # Use GenAI if available
-            reasoning = genai.generate_reasoning(plaintiff, defendant, evidence, verdict)
+            # Use GenAI if available (or its cached answer for this exact case)
             model_used = "Local GenAI (Phi-3 Mini)"
+            cache_key = _reasoning_cache_key(genai, data, plaintiff, defendant, evidence, verdict)
+            reasoning = reasoning_cache.get(cache_key) if cache_key else None
+            cached = reasoning is not None
+            if not cached:
+                result = _generate_admitted(genai, (plaintiff, defendant, evidence, verdict), deadline)
+                reasoning = result["reasoning"]
+                if result["outcome"] == "busy":
+                    # Queue too long to finish within the budget
+                    reasoning = generate_fallback_reasoning(plaintiff, defendant, evidence, verdict)
+                    model_used = "Rule-Based Reasoning (GenAI busy)"
+                elif result["outcome"] == "timeout":
+                    # Deadline hit before a usable answer was produced
+                    reasoning = generate_fallback_reasoning(plaintiff, defendant, evidence, verdict)
+                    model_used = "Rule-Based Reasoning (GenAI deadline)"
+                elif result["outcome"] == "truncated":
+                    model_used = "Local GenAI (Phi-3 Mini, truncated at deadline)"
+                elif cache_key:
+                    reasoning_cache.put(cache_key, reasoning)
             
             print(f"\n{'='*60}")
             print(f"🔍 BACKEND DEBUG - SENDING TO FRONTEND:")
@@ -137,15 +732,20 @@ def genai_reason():
             print(f"First char: '{reasoning[0]}' (visible: {reasoning[0].isprintable() if reasoning else False})")
             print(f"{'='*60}\n")
         else:
-            # Use fallback reasoning
+            # Use fallback reasoning (model still loading, failed or disabled)
             reasoning = generate_fallback_reasoning(plaintiff, defendant, evidence, verdict)
             model_used = "Rule-Based Reasoning"
+            if genai_loader.state in (LOADING, WARMING):
+                model_used = "Rule-Based Reasoning (GenAI loading)"
         
         return jsonify({
             "reasoning": reasoning,
-            "model": model_used
+            "model": model_used,
+            "cached": cached
         })
 
+    except AdmissionRejected as e:
+        return _overloaded(503, "GenAI queue is full", str(e), e.retry_after)
     except Exception as e:
         print(f"Error generating reasoning: {e}")
         # If GenAI fails, use fallback
@@ -164,79 +764,210 @@ def genai_reason():
             return jsonify({"error": "GenAI reasoning failed", "message": str(e)}), 500
 
 
-def get_fallback_verdict(plaintiff, defendant):
-    """Rule-based fallback logic for verdict generation"""
-    plaintiff_lower = plaintiff.lower()
-    defendant_lower = defendant.lower()
+@app.route('/api/genai_reason/stream', methods=['POST'])
+@limit_concurrency('genai_stream')
+def genai_reason_stream():
+    """
+    Streaming variant of /api/genai_reason using Server-Sent Events
+    Same JSON body; responds with text/event-stream events:
+        event: token  data: {"text": "..."}                    (repeated)
+        event: done   data: {"reasoning": "...", "model": "...", "cached": false}
+        event: error  data: {"error": "...", "message": "..."}
+    Same X-Latency-Budget, X-Priority and X-Client-Id handling as
+    /api/genai_reason: generation stops at the budget (rule-based reasoning
+    if nothing was produced by then); responds 503 with Retry-After (before
+    streaming) when the GenAI queue is full
+    """
+    data = request.get_json(silent=True) or {}
+    plaintiff = data.get("plaintiff", "")
+    defendant = data.get("defendant", "")
+    evidence = data.get("evidence", "")
+    verdict = data.get("verdict", "")
 
-    plaintiff_score = 0
-    defendant_score = 0
+    deadline = time.monotonic() + _latency_budget()
+    genai = genai_loader.get(timeout=GENAI_WAIT_TIMEOUT)
+    cache_key = cached_reasoning = ticket = None
+    busy = False
+    if genai:
+        cache_key = _reasoning_cache_key(genai, data, plaintiff, defendant, evidence, verdict)
+        cached_reasoning = reasoning_cache.get(cache_key) if cache_key else None
+        if cached_reasoning is None:
+            # Generation happens on this request's thread but holds a GenAI
+            # slot until the response is closed
+            try:
+                ticket = _admit(deadline)
+            except AdmissionRejected as e:
+                if e.reason not in AdmissionRejected.LATE:
+                    return _overloaded(503, "GenAI queue is full", str(e), e.retry_after)
+                print(f"⏳ GenAI busy: {e}")
+                genai, busy = None, True
 
-    # Strong property rights keywords for defendant - INCREASED WEIGHT
-    property_rights = ['my property', 'private property', 'my land', 'ownership', 'property deed', 
-                       'title deed', 'my house', 'my driveway', 'my garden']
-    for keyword in property_rights:
-        if keyword in defendant_lower:
-            defendant_score += 5  # Increased from 3 to 5 - very strong claim
-    
-    # Unauthorized access/trespass claims - INCREASED WEIGHT
-    trespass_keywords = ['without permission', 'never asked', 'trespassing', 'unauthorized', 
-                         'no right to', 'no permission', 'didnt ask', "didn't ask"]
-    for keyword in trespass_keywords:
-        if keyword in defendant_lower:
-            defendant_score += 4  # Increased from 2 to 4
-    
-    # Control/rights assertions - NEW
-    control_keywords = ['right to control', 'my right', 'have the right', 'control access']
-    for keyword in control_keywords:
-        if keyword in defendant_lower:
-            defendant_score += 3
-    
-    # Evidence keywords - boost score significantly
-    evidence_keywords = ['evidence', 'proof', 'document', 'witness', 'contract', 'receipt', 
-                        'record', 'deed', 'title', 'agreement', 'written', 'signed', 'confirms']
-    for keyword in evidence_keywords:
-        if keyword in plaintiff_lower:
-            plaintiff_score += 3
-        if keyword in defendant_lower:
-            defendant_score += 3
-
-    # Clear wrongdoing by defendant
-    negative_keywords = ['refused', 'failed', 'breach', 'violated', 'damaged', 'fraud', 
-                        'illegal', 'stole', 'theft', 'took without', 'broke', 'destroyed']
-    for keyword in negative_keywords:
-        if keyword in plaintiff_lower and keyword == 'refused':
-            # Special case: "refused" in property context is defendant's right
-            if 'property' in defendant_lower or 'permission' in defendant_lower:
-                defendant_score += 2  # Refusing access is their right
+    streamed = {}  # Result of the generated stream, for releasing its slot
+
+    def events():
+        parts = []
+        cached = False
+        model_used = "Local GenAI (Phi-3 Mini)"
+        try:
+            if genai:
+                cached = cached_reasoning is not None
+                if cached:
+                    parts.append(cached_reasoning)
+                    yield _sse("token", {"text": cached_reasoning})
+                else:
+                    result = yield from _relay_stream(genai.generate_reasoning_stream(
+                        plaintiff, defendant, evidence, verdict, deadline=deadline
+                    ), parts)
+                    streamed.update(result)
+                    outcome = result.get("outcome")
+                    if outcome == "timeout" or (outcome == "truncated" and not "".join(parts).strip()):
+                        # Deadline hit before any text was produced
+                        model_used = "Rule-Based Reasoning (GenAI deadline)"
+                        parts = [generate_fallback_reasoning(plaintiff, defendant, evidence, verdict)]
+                        yield _sse("token", {"text": parts[0]})
+                    elif outcome == "truncated":
+                        model_used = "Local GenAI (Phi-3 Mini, truncated at deadline)"
+                    elif cache_key:
+                        reasoning_cache.put(cache_key, "".join(parts))
             else:
-                plaintiff_score += 2
-        elif keyword in plaintiff_lower:
-            plaintiff_score += 2
-        if keyword in defendant_lower and keyword != 'refused':
-            defendant_score -= 2
-
-    # Strong defense/justification by defendant
-    defense_keywords = ['justified', 'necessary', 'reasonable', 'legal', 'rights', 
-                       'complied', 'permission', 'allowed', 'authorized', 'lawful']
-    for keyword in defense_keywords:
-        if keyword in defendant_lower:
-            defendant_score += 2
-        if keyword in plaintiff_lower:
-            plaintiff_score += 1
-
-    # Payment/financial claims
-    payment_keywords = ['paid', 'payment', 'money', '$', 'fee', 'cost', 'charge', 'invoice']
-    for keyword in payment_keywords:
-        if keyword in plaintiff_lower:
-            plaintiff_score += 3  # Increased from 2 to 3
-    
-    # Service/product issues
-    service_issues = ['unsatisfactory', 'poor quality', 'defective', 'broken', 'damaged', 
-                     'not working', 'faulty', 'never received', 'didnt receive']
-    for keyword in service_issues:
-        if keyword in plaintiff_lower:
-            plaintiff_score += 3  # Increased from 2 to 3
+                model_used = "Rule-Based Reasoning"
+                if busy:
+                    model_used = "Rule-Based Reasoning (GenAI busy)"
+                elif genai_loader.state in (LOADING, WARMING):
+                    model_used = "Rule-Based Reasoning (GenAI loading)"
+                parts.append(generate_fallback_reasoning(plaintiff, defendant, evidence, verdict))
+                yield _sse("token", {"text": parts[-1]})
+        except Exception as e:
+            print(f"Error streaming reasoning: {e}")
+            if parts:
+                # Part of the answer already reached the client
+                yield _sse("error", {"error": "GenAI reasoning failed", "message": str(e)})
+                return
+            model_used = "Rule-Based Reasoning (Fallback)"
+            parts.append(generate_fallback_reasoning(plaintiff, defendant, evidence, verdict))
+            yield _sse("token", {"text": parts[-1]})
+
+        yield _sse("done", {"reasoning": "".join(parts), "model": model_used, "cached": cached})
+
+    response = Response(
+        stream_with_context(events()),
+        mimetype='text/event-stream',
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+    if ticket is not None:
+        # Tokens feed the throughput estimate; unknown if the client left early
+        response.call_on_close(lambda: admission.release(ticket, streamed.get("tokens")))
+    return response
+
+
+def _verdict_engine(data):
+    """Engine requested in the JSON body or query string, else VERDICT_ENGINE"""
+    engine = data.get('engine') if isinstance(data, dict) else None
+    engine = engine or request.args.get('engine') or VERDICT_ENGINE
+    return engine.lower() if isinstance(engine, str) else engine
+
+
+def _unknown_engine():
+    return jsonify({
+        "error": "Unknown engine",
+        "message": f"engine must be one of {', '.join(VERDICT_ENGINES)}"
+    }), 400
+
+
+def _latency_budget():
+    """Seconds this request may spend on reasoning (X-Latency-Budget header or default)"""
+    try:
+        budget = float(request.headers.get('X-Latency-Budget', GENAI_LATENCY_BUDGET))
+    except ValueError:
+        budget = GENAI_LATENCY_BUDGET
+    if budget != budget:  # NaN
+        budget = GENAI_LATENCY_BUDGET
+    return min(max(budget, 0.0), GENAI_MAX_LATENCY_BUDGET)
+
+
+def _client_id():
+    """Identity used for fair queueing: X-Client-Id, else the original client address"""
+    client = request.headers.get('X-Client-Id', '').strip()
+    if client:
+        return client
+    forwarded = request.headers.get('X-Forwarded-For', '')
+    return forwarded.split(',')[0].strip() or request.remote_addr or 'unknown'
+
+
+def _admit(deadline=None):
+    """Wait for a GenAI slot for this request (raises AdmissionRejected)"""
+    priority = request.headers.get('X-Priority', 'normal').strip().lower()
+    return admission.admit(_client_id(), priority, deadline)
+
+
+def _generate_admitted(genai, case, deadline):
+    """
+    Run generate_reasoning_detailed once admitted. Returns the result, or
+    outcome "busy" when the expected wait rules out finishing by deadline;
+    raises AdmissionRejected when the queue is full.
+    """
+    try:
+        ticket = _admit(deadline)
+    except AdmissionRejected as e:
+        if e.reason not in AdmissionRejected.LATE:
+            raise
+        print(f"⏳ GenAI busy: {e}")
+        return {"reasoning": None, "outcome": "busy"}
+
+    try:
+        future = llm_executor.submit(genai.generate_reasoning_detailed, *case, deadline=deadline)
+    except Exception:
+        admission.release(ticket)
+        raise
+    # The slot is held until generation ends, even if this request stops waiting
+    future.add_done_callback(lambda done: admission.release(
+        ticket, None if done.exception() else done.result().get("tokens")
+    ))
+    try:
+        return future.result(timeout=max(0.0, deadline - time.monotonic()) + DEADLINE_GRACE)
+    except FutureTimeout:
+        return {"reasoning": None, "outcome": "timeout"}
+
+
+def _reasoning_cache_key(genai, data, plaintiff, defendant, evidence, verdict):
+    """Cache key for a reasoning request, or None if it must not use the cache"""
+    if not (GENAI_DETERMINISTIC or data.get("cache") is True):
+        return None
+    reasoner = genai.reasoner
+    return reasoning_key(
+        plaintiff, defendant, evidence, verdict,
+        reasoner.model_name, reasoner.fast_generation_config
+    )
+
+
+def _sse(event, payload):
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+
+def _relay_stream(stream, parts):
+    """
+    Yield each piece of a reasoning stream as a token event, collecting the
+    text in parts; returns the stream's result ({"outcome", "tokens"})
+    """
+    try:
+        while True:
+            try:
+                text = next(stream)
+            except StopIteration as done:
+                return done.value or {}
+            parts.append(text)
+            yield _sse("token", {"text": text})
+    finally:
+        stream.close()
+
+
+def get_fallback_verdict(plaintiff, defendant):
+    """Rule-based fallback logic for verdict generation"""
+    # Keyword weights live in data/verdict_rules.json (profile "fallback")
+    engine = get_rule_engine()
+    plaintiff_score, defendant_score = engine.score("fallback", plaintiff, defendant)
+    high_confidence_margin = engine.profile("fallback").high_confidence_margin
 
     # Determine winner with clearer threshold
     score_diff = abs(plaintiff_score - defendant_score)
@@ -245,14 +976,14 @@ def get_fallback_verdict(plaintiff, defendant):
     
     if plaintiff_score > defendant_score:
         winner = "Plaintiff"
-        confidence = "high" if score_diff >= 4 else "medium"
+        confidence = "high" if score_diff >= high_confidence_margin else "medium"
         reasoning = (
             f"The plaintiff's arguments appear stronger based on the evidence presented. "
             f"Their claims are better supported by documentation and reasoning."
         )
     elif defendant_score > plaintiff_score:
         winner = "Defendant"
-        confidence = "high" if score_diff >= 4 else "medium"
+        confidence = "high" if score_diff >= high_confidence_margin else "medium"
         reasoning = (
             f"The defendant provides reasonable and well-supported justifications "
             f"that effectively counter the plaintiff's claims."
@@ -472,7 +1203,13 @@ def internal_error(error):
     }), 500
 
 
-if __name__ == '__main__':
+if __name__ == '__main__' and INFERENCE_SERVER:
+    if not GENAI_INFERENCE_ADDRESS:
+        sys.exit("❌ Set GENAI_INFERENCE_ADDRESS to run the inference server")
+    InferenceServer(
+        genai_loader, GENAI_INFERENCE_ADDRESS, authkey=GENAI_INFERENCE_AUTHKEY
+    ).serve_forever()
+elif __name__ == '__main__':
     print("\n" + "-" * 50)
     print("🏛️  AI COURT BACKEND SERVER")
     print("-" * 50)
@@ -486,7 +1223,7 @@ if __name__ == '__main__':
     print(f"🖥️ Server starting on port {port}")
     print(f"🌍 Environment: {'Production' if is_production else 'Development'}")
     print(f"🤖 AI Model: {'Loaded' if AI_MODEL_AVAILABLE else 'Fallback'}")
-    print(f"🧠 GenAI Reasoner: {'Active' if genai else 'Unavailable'}")
+    print(f"🧠 GenAI Reasoner: {genai_loader.state.title()} (loading in background)")
     print("-" * 50 + "\n")
 
     # Use 0.0.0.0 to accept connections from any IP (required for Render)
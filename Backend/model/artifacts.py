@@ -0,0 +1,495 @@
+"""
+Verdict Model Artifacts - Versioned, Memory-Mapped Bundles
+Stores the TF-IDF (or hashing) vectorizer and verdict classifier as one
+directory: a manifest.json with training metadata and per-file SHA-256
+hashes, the vocabulary, IDF weights and linear coefficients as .npy arrays
+loaded with mmap, and a joblib fallback for classifiers that are not linear
+
+Bundles are immutable once written: the served model lives at
+<root>/current, a symlink that publish_bundle atomically repoints at a
+freshly written <root>/versions/<version>, so files a running server has
+memory-mapped are never rewritten.
+
+Usage (from Backend/), to convert existing pickles:
+    python -m model.artifacts --model model.pkl --vectorizer vectorizer.pkl \
+        --root model/models/verdict
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+
+import joblib
+import numpy as np
+
+from .hashing_vectorizer import HashingTfidfVectorizer
+from .preprocessing import FEATURE_NAMES as HEURISTIC_NAMES
+
+DEFAULT_ROOT = os.path.join(os.path.dirname(__file__), "models", "verdict")
+
+MANIFEST_FILE = "manifest.json"
+FORMAT_VERSION = 1
+
+VOCABULARY_FILE = "vocabulary.npy"
+IDF_FILE = "idf.npy"
+COEF_FILE = "coef.npy"
+INTERCEPT_FILE = "intercept.npy"
+CLASSES_FILE = "classes.npy"
+MODEL_JOBLIB_FILE = "model.joblib"
+VECTORIZER_JOBLIB_FILE = "vectorizer.joblib"
+# HybridVectorizer columns after the text features
+STRUCTURED_FILL_FILE = "structured_fill.npy"
+STRUCTURED_SCALE_FILE = "structured_scale.npy"
+HEURISTIC_SCALE_FILE = "heuristic_scale.npy"
+# Trainer state for incremental updates; never loaded for serving
+CHECKPOINT_FILE = "checkpoint.joblib"
+
+# publish_bundle layout: <root>/versions/<version>/ and a <root>/current symlink
+VERSIONS_DIR = "versions"
+CURRENT_LINK = "current"
+DEFAULT_BUNDLE = os.path.join(DEFAULT_ROOT, CURRENT_LINK)
+
+# TfidfVectorizer settings that affect transform() once the vocabulary is fixed
+VECTORIZER_PARAMS = (
+    "lowercase", "strip_accents", "analyzer", "token_pattern", "ngram_range",
+    "stop_words", "norm", "use_idf", "smooth_idf", "sublinear_tf", "binary",
+    "encoding", "decode_error", "input",
+)
+# HashingTfidfVectorizer settings (it has no vocabulary at all)
+HASHING_PARAMS = (
+    "n_features", "ngram_range", "stop_words", "lowercase", "token_pattern",
+    "strip_accents", "norm", "smooth_idf", "sublinear_tf", "binary", "min_df", "max_df",
+    "use_idf",
+)
+
+
+class BundleError(Exception):
+    """A bundle is missing, corrupt, or its parts do not belong together"""
+
+
+def _sha256(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _content_hash(files):
+    """One hash for the whole bundle, from its files' hashes"""
+    listing = json.dumps({name: info["sha256"] for name, info in files.items()}, sort_keys=True)
+    return hashlib.sha256(listing.encode("utf-8")).hexdigest()
+
+
+def _softmax(scores):
+    scores = scores - scores.max(axis=1, keepdims=True)
+    np.exp(scores, out=scores)
+    return scores / scores.sum(axis=1, keepdims=True)
+
+
+def _sigmoid(scores):
+    return 1.0 / (1.0 + np.exp(-scores))
+
+
+def _probabilities(scores, link):
+    """Class probabilities from decision_function-style scores"""
+    if link == "softmax":
+        return _softmax(scores)
+    if link == "binary":
+        positive = _sigmoid(scores[:, 0])
+        return np.column_stack([1.0 - positive, positive])
+    if link == "ovr":
+        probabilities = _sigmoid(scores)
+        return probabilities / probabilities.sum(axis=1, keepdims=True)
+    # No probabilistic link: all the mass on the best-scoring class
+    if scores.shape[1] == 1:
+        scores = np.column_stack([-scores[:, 0], scores[:, 0]])
+    return (scores == scores.max(axis=1, keepdims=True)).astype(float)
+
+
+class LinearVerdictModel:
+    """
+    Linear classifier rebuilt from a bundle's coefficient arrays, with the
+    classes_ / n_features_in_ / predict / predict_proba surface the
+    VerdictPredictor uses
+    """
+
+    def __init__(self, classes, coef, intercept, link):
+        self.classes_ = classes
+        self.coef_ = coef
+        self.intercept_ = intercept
+        self.link = link
+        self.n_features_in_ = coef.shape[1]
+
+    def decision_function(self, X):
+        return np.asarray(X @ self.coef_.T) + self.intercept_
+
+    def predict_proba(self, X):
+        return _probabilities(self.decision_function(X), self.link)
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+def _probe_link(model, n_features):
+    """
+    The formula that turns model's decision_function into its
+    predict_proba (checked on probe inputs), or None if none matches
+    """
+    if not (hasattr(model, "coef_") and hasattr(model, "decision_function")):
+        return None
+    if not hasattr(model, "predict_proba"):
+        return "argmax"
+
+    rng = np.random.default_rng(0)
+    probe = rng.random((8, n_features)) * (rng.random((8, n_features)) < 0.2)
+    expected = model.predict_proba(probe)
+    scores = np.asarray(model.decision_function(probe), dtype=float)
+    if scores.ndim == 1:
+        scores = scores[:, None]
+    for link in ("softmax", "binary", "ovr"):
+        if link == "binary" and scores.shape[1] != 1:
+            continue
+        try:
+            if np.allclose(_probabilities(scores.copy(), link), expected, atol=1e-6):
+                return link
+        except ValueError:
+            continue
+    return None
+
+
+def _json_settings(params, names):
+    """params[names] as JSON values, or None if one cannot be stored"""
+    settings = {}
+    for name in names:
+        value = params[name]
+        if callable(value):
+            return None
+        if isinstance(value, (set, frozenset, tuple)):
+            value = sorted(value) if name == "stop_words" else list(value)
+        settings[name] = value
+    return settings
+
+
+def _vectorizer_settings(vectorizer):
+    """
+    (format, JSON settings) that rebuild vectorizer from its IDF vector
+    (plus the vocabulary for "tfidf"), or (None, None)
+    """
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    if type(vectorizer) is HashingTfidfVectorizer:
+        return "hashing", _json_settings(vectorizer.get_params(), HASHING_PARAMS)
+    if type(vectorizer) is not TfidfVectorizer or not vectorizer.use_idf:
+        return None, None
+    params = vectorizer.get_params()
+    if any(params[name] is not None for name in ("preprocessor", "tokenizer")):
+        return None, None
+    settings = _json_settings(params, VECTORIZER_PARAMS)
+    if settings is not None:
+        settings["dtype"] = np.dtype(params["dtype"]).name
+        return "tfidf", settings
+    return None, None
+
+
+def is_hybrid(vectorizer):
+    """
+    True for a hybrid_features.HybridVectorizer. hybrid_features needs
+    pandas, which text-only deployments do not install, so it is only
+    imported for hybrid bundles; an instance cannot exist before that.
+    """
+    module = sys.modules.get(f"{__package__}.hybrid_features")
+    return module is not None and type(vectorizer) is module.HybridVectorizer
+
+
+def vectorizer_features(vectorizer):
+    """Number of columns vectorizer.transform produces"""
+    vocabulary = getattr(vectorizer, "vocabulary_", None)
+    if vocabulary:
+        return len(vocabulary)
+    return getattr(vectorizer, "n_features_out_", None)
+
+
+def save_bundle(model, vectorizer, output_dir, metadata=None, checkpoint=None):
+    """
+    Write model and vectorizer to output_dir, which must be new or empty,
+    and return the manifest. metadata (e.g. dataset, sample count,
+    accuracy) is stored as-is under "training"; checkpoint is any trainer
+    state to resume from later (see load_checkpoint). The manifest is
+    written last, so a bundle interrupted mid-write never loads. To replace
+    a bundle that may be served, use publish_bundle.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    if os.listdir(output_dir):
+        # Rewriting a served bundle's .npy files would change (or, if they
+        # shrink, SIGBUS) the arrays a running server has memory-mapped
+        raise BundleError(f"{output_dir} is not empty; publish_bundle replaces bundles safely")
+    manifest_path = os.path.join(output_dir, MANIFEST_FILE)
+
+    n_features = vectorizer_features(vectorizer)
+    if getattr(model, "n_features_in_", n_features) != n_features:
+        raise BundleError(
+            f"model expects {model.n_features_in_} features but the vectorizer produces {n_features}"
+        )
+
+    def save_array(name, array):
+        np.save(os.path.join(output_dir, name), array, allow_pickle=False)
+        return name
+
+    files = [save_array(CLASSES_FILE, np.asarray([str(label) for label in model.classes_]))]
+
+    # A HybridVectorizer is stored as its text vectorizer plus the scaling
+    # arrays of the structured and heuristic columns
+    hybrid = vectorizer if is_hybrid(vectorizer) else None
+    text_vectorizer = hybrid.text_vectorizer if hybrid else vectorizer
+    vectorizer_format, settings = _vectorizer_settings(text_vectorizer)
+    if settings is not None:
+        if vectorizer_format == "tfidf":
+            vocabulary = sorted(text_vectorizer.vocabulary_, key=text_vectorizer.vocabulary_.get)
+            files.append(save_array(VOCABULARY_FILE, np.asarray(vocabulary, dtype=str)))
+        if settings.get("use_idf", True):
+            files.append(save_array(IDF_FILE, np.asarray(text_vectorizer.idf_, dtype=np.float64)))
+        vectorizer_entry = {"format": vectorizer_format, "settings": settings}
+        if hybrid:
+            files.append(save_array(STRUCTURED_FILL_FILE, np.asarray(hybrid.structured_fill_)))
+            files.append(save_array(STRUCTURED_SCALE_FILE, np.asarray(hybrid.structured_scale_)))
+            if hybrid.heuristics:
+                files.append(save_array(HEURISTIC_SCALE_FILE, np.asarray(hybrid.heuristic_scale_)))
+            vectorizer_entry = {
+                "format": "hybrid",
+                "text": vectorizer_entry,
+                "settings": {
+                    "structured_columns": list(hybrid.structured_columns),
+                    "heuristics": list(HEURISTIC_NAMES) if hybrid.heuristics else [],
+                },
+            }
+    else:
+        joblib.dump(vectorizer, os.path.join(output_dir, VECTORIZER_JOBLIB_FILE))
+        files.append(VECTORIZER_JOBLIB_FILE)
+        vectorizer_entry = {"format": "joblib", "type": type(vectorizer).__name__}
+        print(f"⚠️  {type(vectorizer).__name__} stored with joblib (no array format for it)")
+
+    link = _probe_link(model, n_features)
+    if link is not None:
+        files.append(save_array(COEF_FILE, np.ascontiguousarray(model.coef_, dtype=np.float64)))
+        files.append(save_array(INTERCEPT_FILE, np.asarray(model.intercept_, dtype=np.float64)))
+        model_entry = {"format": "linear", "type": type(model).__name__, "link": link}
+    else:
+        joblib.dump(model, os.path.join(output_dir, MODEL_JOBLIB_FILE))
+        files.append(MODEL_JOBLIB_FILE)
+        model_entry = {"format": "joblib", "type": type(model).__name__}
+        print(f"⚠️  {type(model).__name__} stored with joblib (not a linear model)")
+
+    if checkpoint is not None:
+        joblib.dump(checkpoint, os.path.join(output_dir, CHECKPOINT_FILE))
+        files.append(CHECKPOINT_FILE)
+
+    hashed = {}
+    for name in files:
+        path = os.path.join(output_dir, name)
+        hashed[name] = {"sha256": _sha256(path), "bytes": os.path.getsize(path)}
+
+    import sklearn
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "content_hash": _content_hash(hashed),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "sklearn_version": sklearn.__version__,
+        "classes": [str(label) for label in model.classes_],
+        "n_features": n_features,
+        "vectorizer": vectorizer_entry,
+        "model": model_entry,
+        "files": hashed,
+        "training": metadata or {},
+    }
+    with open(manifest_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(manifest_path + ".tmp", manifest_path)
+    print(f"📦 Verdict bundle {manifest['content_hash'][:12]} written to {output_dir}")
+    return manifest
+
+
+def read_manifest(bundle_dir):
+    path = os.path.join(bundle_dir, MANIFEST_FILE)
+    try:
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        raise BundleError(f"no {MANIFEST_FILE} in {bundle_dir}")
+    except ValueError as e:
+        raise BundleError(f"unreadable {path}: {e}")
+    if manifest.get("format_version") != FORMAT_VERSION:
+        raise BundleError(f"{path} has format version {manifest.get('format_version')}, "
+                          f"expected {FORMAT_VERSION}")
+    return manifest
+
+
+def verify_bundle(bundle_dir, manifest):
+    """Check every file against the manifest's size and SHA-256"""
+    files = manifest.get("files") or {}
+    if _content_hash(files) != manifest.get("content_hash"):
+        raise BundleError("manifest content_hash does not match its file list")
+    for name, info in files.items():
+        path = os.path.join(bundle_dir, name)
+        if not os.path.exists(path):
+            raise BundleError(f"{name} is missing from {bundle_dir}")
+        if os.path.getsize(path) != info["bytes"] or _sha256(path) != info["sha256"]:
+            raise BundleError(f"{name} does not match the manifest (stale or corrupt)")
+
+
+def load_bundle(bundle_dir=DEFAULT_BUNDLE, verify=True):
+    """
+    Load (model, vectorizer, manifest) from a bundle. Arrays are memory
+    mapped; with verify the files are checked against their hashes first.
+    Raises BundleError if anything is missing or does not fit together.
+    """
+    manifest = read_manifest(bundle_dir)
+    if verify:
+        verify_bundle(bundle_dir, manifest)
+
+    def load_array(name):
+        return np.load(os.path.join(bundle_dir, name), mmap_mode="r", allow_pickle=False)
+
+    classes = np.asarray(load_array(CLASSES_FILE))
+    if list(classes) != manifest["classes"]:
+        raise BundleError(f"{CLASSES_FILE} does not match the manifest classes")
+    n_features = manifest["n_features"]
+
+    entry = manifest["vectorizer"]
+    hybrid = None
+    if entry["format"] == "hybrid":
+        hybrid = entry["settings"]
+        if hybrid["heuristics"] and hybrid["heuristics"] != list(HEURISTIC_NAMES):
+            raise BundleError("bundle heuristics do not match preprocessing.extract_features")
+        dense_columns = len(hybrid["structured_columns"]) + len(hybrid["heuristics"])
+        n_features -= dense_columns
+        entry = entry["text"]
+
+    if entry["format"] == "tfidf":
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        vocabulary = load_array(VOCABULARY_FILE)
+        idf = load_array(IDF_FILE)
+        if len(vocabulary) != n_features or len(idf) != n_features:
+            raise BundleError(f"vocabulary/IDF sizes {len(vocabulary)}/{len(idf)} "
+                              f"do not match n_features {n_features}")
+        settings = dict(entry["settings"])
+        settings["dtype"] = np.dtype(settings["dtype"]).type
+        settings["ngram_range"] = tuple(settings["ngram_range"])
+        vectorizer = TfidfVectorizer(
+            vocabulary=dict(zip(vocabulary.tolist(), range(n_features))), **settings
+        )
+        vectorizer.idf_ = np.asarray(idf)
+    elif entry["format"] == "hashing":
+        settings = dict(entry["settings"])
+        if settings["n_features"] != n_features:
+            raise BundleError(f"hashing into {settings['n_features']} buckets does not match "
+                              f"n_features {n_features}")
+        vectorizer = HashingTfidfVectorizer(**settings)
+        if vectorizer.use_idf:
+            idf = load_array(IDF_FILE)
+            if len(idf) != n_features:
+                raise BundleError(f"{len(idf)} IDF weights do not match n_features {n_features}")
+            vectorizer.idf_ = idf
+    else:
+        vectorizer = joblib.load(os.path.join(bundle_dir, VECTORIZER_JOBLIB_FILE))
+        if vectorizer_features(vectorizer) != n_features:
+            raise BundleError(f"vectorizer has {vectorizer_features(vectorizer)} features, "
+                              f"manifest says {n_features}")
+
+    if hybrid:
+        try:
+            from .hybrid_features import HybridVectorizer
+        except ImportError as e:
+            raise BundleError(f"hybrid bundles need pandas to load ({e})") from e
+        structured = tuple(hybrid["structured_columns"])
+        vectorizer = HybridVectorizer(vectorizer, structured, bool(hybrid["heuristics"]))
+        vectorizer.structured_fill_ = np.asarray(load_array(STRUCTURED_FILL_FILE))
+        vectorizer.structured_scale_ = np.asarray(load_array(STRUCTURED_SCALE_FILE))
+        shapes = [vectorizer.structured_fill_.shape, vectorizer.structured_scale_.shape]
+        if vectorizer.heuristics:
+            vectorizer.heuristic_scale_ = np.asarray(load_array(HEURISTIC_SCALE_FILE))
+            shapes.append(vectorizer.heuristic_scale_.shape)
+        expected = [(len(structured),)] * 2 + [(len(hybrid["heuristics"]),)] * vectorizer.heuristics
+        if shapes != expected:
+            raise BundleError(f"structured/heuristic scaling arrays {shapes} do not match "
+                              f"the manifest columns")
+        n_features += dense_columns
+
+    entry = manifest["model"]
+    if entry["format"] == "linear":
+        coef = load_array(COEF_FILE)
+        intercept = np.asarray(load_array(INTERCEPT_FILE))
+        rows = 1 if len(classes) == 2 else len(classes)
+        if coef.shape != (rows, n_features) or intercept.shape != (rows,):
+            raise BundleError(f"coefficients {coef.shape} / intercept {intercept.shape} do not fit "
+                              f"{len(classes)} classes and {n_features} features")
+        model = LinearVerdictModel(classes, coef, intercept, entry["link"])
+    else:
+        model = joblib.load(os.path.join(bundle_dir, MODEL_JOBLIB_FILE))
+        if getattr(model, "n_features_in_", n_features) != n_features:
+            raise BundleError(f"model expects {model.n_features_in_} features, "
+                              f"manifest says {n_features}")
+    return model, vectorizer, manifest
+
+
+def load_checkpoint(bundle_dir):
+    """The trainer state saved with a bundle (verified), or None if it has none"""
+    manifest = read_manifest(bundle_dir)
+    if CHECKPOINT_FILE not in manifest["files"]:
+        return None
+    verify_bundle(bundle_dir, manifest)
+    return joblib.load(os.path.join(bundle_dir, CHECKPOINT_FILE))
+
+
+def publish_bundle(model, vectorizer, root=DEFAULT_ROOT, metadata=None, checkpoint=None, keep=3):
+    """
+    Write a bundle to <root>/versions/<version> and atomically repoint the
+    <root>/current symlink at it, so readers of <root>/current see either
+    the old bundle or the complete new one, never a partial write. The
+    newest ``keep`` versions are kept. Returns the new manifest.
+    """
+    versions = os.path.join(root, VERSIONS_DIR)
+    os.makedirs(versions, exist_ok=True)
+    staging = os.path.join(versions, f".staging-{os.getpid()}-{time.time_ns()}")
+    manifest = save_bundle(model, vectorizer, staging, metadata, checkpoint)
+
+    version = time.strftime("%Y%m%dT%H%M%S", time.gmtime()) + "-" + manifest["content_hash"][:12]
+    final = os.path.join(versions, version)
+    if os.path.exists(final):
+        # Same content published within the same second: keep the first copy
+        shutil.rmtree(staging)
+    else:
+        os.rename(staging, final)
+
+    current = os.path.join(root, CURRENT_LINK)
+    link = f"{current}.{os.getpid()}.tmp"
+    os.symlink(os.path.join(VERSIONS_DIR, version), link)
+    os.replace(link, current)
+    print(f"🚀 Published verdict bundle {version} ({current})")
+
+    for old in sorted(name for name in os.listdir(versions) if not name.startswith("."))[:-keep]:
+        if old != version:
+            shutil.rmtree(os.path.join(versions, old), ignore_errors=True)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert pickled verdict model files to a bundle")
+    parser.add_argument("--model", required=True, help="Pickled classifier (joblib/pickle)")
+    parser.add_argument("--vectorizer", required=True, help="Pickled TF-IDF vectorizer")
+    parser.add_argument("--root", default=DEFAULT_ROOT,
+                        help="Bundle root (versions/ and the current symlink)")
+    args = parser.parse_args()
+    publish_bundle(
+        joblib.load(args.model), joblib.load(args.vectorizer), args.root,
+        metadata={"converted_from": [os.path.basename(args.model), os.path.basename(args.vectorizer)]}
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Micro-Batching - Shared generate() Calls for Concurrent Requests
+Collects reasoning requests that arrive within a short window and runs
+them through the reasoner as one left-padded batch instead of separate
+batch-size-1 generate calls competing for the same CPU cores
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError
+
+# Seconds past its deadline a caller keeps waiting for a batched result
+DEADLINE_GRACE = 1.0
+
+_TIMED_OUT = {"reasoning": None, "outcome": "timeout"}
+
+
+class MicroBatcher:
+    """
+    Front for a LocalGenAIReasoner that batches generate_reasoning calls.
+
+    The first queued request opens a window of ``window_ms``; everything
+    that arrives before it closes (up to ``max_batch`` requests) is handed
+    to reasoner.generate_reasoning_batch together, and each caller gets its
+    own completion back. A lone request goes through the reasoner's normal
+    generate_reasoning path. With max_batch=1 batching is disabled.
+    """
+
+    def __init__(self, reasoner, window_ms=50, max_batch=8):
+        self.reasoner = reasoner
+        self.window = max(0.0, float(window_ms)) / 1000
+        self.max_batch = max(1, int(max_batch))
+
+        self._queue = queue.Queue()
+        self._stats_lock = threading.Lock()
+        self._batches = 0
+        self._requests = 0
+        self._max_batch_seen = 0
+        self._batch_sizes = {}
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+        self._thread = None
+        if self.max_batch > 1:
+            self._thread = threading.Thread(
+                target=self._run, name="genai-batcher", daemon=True
+            )
+            self._thread.start()
+
+    def generate_reasoning(self, plaintiff, defendant, evidence, verdict):
+        """Queue a case for the next batch and wait for its reasoning"""
+        return self.generate_reasoning_detailed(plaintiff, defendant, evidence, verdict)["reasoning"]
+
+    def generate_reasoning_detailed(self, plaintiff, defendant, evidence, verdict, deadline=None):
+        """
+        Queue a case with an optional deadline and wait for its
+        {"reasoning", "outcome"} result (see LocalGenAIReasoner)
+        """
+        case = (plaintiff, defendant, evidence, verdict)
+        if self._thread is None:
+            now = time.monotonic()
+            self._record([now], now)
+            return self.reasoner.generate_reasoning_detailed(*case, deadline=deadline)
+
+        future = Future()
+        self._queue.put((case, deadline, future, time.monotonic()))
+        if deadline is None:
+            return future.result()
+        try:
+            return future.result(timeout=max(0.0, deadline - time.monotonic()) + DEADLINE_GRACE)
+        except TimeoutError:
+            # Still queued behind a long batch
+            return dict(_TIMED_OUT)
+
+    def generate_reasoning_stream(self, plaintiff, defendant, evidence, verdict, deadline=None):
+        """Streams are token-by-token per client, so they bypass batching"""
+        return self.reasoner.generate_reasoning_stream(
+            plaintiff, defendant, evidence, verdict, deadline=deadline
+        )
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            closes_at = time.monotonic() + self.window
+            while len(batch) < self.max_batch:
+                remaining = closes_at - time.monotonic()
+                try:
+                    if remaining > 0:
+                        batch.append(self._queue.get(timeout=remaining))
+                    else:
+                        # Window closed; still take anything already waiting
+                        batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._process(batch)
+
+    def _process(self, batch):
+        now = time.monotonic()
+        self._record([queued_at for _, _, _, queued_at in batch], now)
+
+        # Requests whose deadline passed while queued are not generated
+        for _, deadline, future, _ in batch:
+            if deadline is not None and deadline <= now:
+                future.set_result(dict(_TIMED_OUT))
+        batch = [item for item in batch if not item[2].done()]
+        if not batch:
+            return
+
+        cases = [case for case, _, _, _ in batch]
+        deadlines = [deadline for _, deadline, _, _ in batch]
+
+        def deliver(row, result):
+            # Rows cut short by their deadline are answered mid-batch
+            if not batch[row][2].done():
+                batch[row][2].set_result(result)
+
+        try:
+            if len(cases) == 1:
+                results = [self.reasoner.generate_reasoning_detailed(*cases[0], deadline=deadlines[0])]
+            else:
+                results = self.reasoner.generate_reasoning_batch(cases, deadlines, on_result=deliver)
+        except Exception as e:
+            print(f"⚠️  Batched reasoning failed ({len(cases)} requests): {e}")
+            for _, _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for row, result in enumerate(results):
+            deliver(row, result)
+
+    def _record(self, queued_at, started_at):
+        waits = [started_at - t for t in queued_at]
+        size = len(waits)
+        with self._stats_lock:
+            self._batches += 1
+            self._requests += size
+            self._max_batch_seen = max(self._max_batch_seen, size)
+            self._batch_sizes[size] = self._batch_sizes.get(size, 0) + 1
+            self._total_wait += sum(waits)
+            self._max_wait = max(self._max_wait, max(waits))
+
+    def stats(self):
+        """Batch size and queue wait metrics for health endpoints"""
+        with self._stats_lock:
+            batches = self._batches
+            requests = self._requests
+            return {
+                "window_ms": round(self.window * 1000),
+                "max_batch": self.max_batch,
+                "queue_depth": self._queue.qsize(),
+                "batches": batches,
+                "requests": requests,
+                "avg_batch_size": round(requests / batches, 2) if batches else 0,
+                "max_batch_size": self._max_batch_seen,
+                "batch_sizes": {str(size): count for size, count in sorted(self._batch_sizes.items())},
+                "avg_queue_wait_ms": round(self._total_wait / requests * 1000, 1) if requests else 0,
+                "max_queue_wait_ms": round(self._max_wait * 1000, 1),
+            }
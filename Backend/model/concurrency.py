@@ -0,0 +1,413 @@
+"""
+Concurrency Limits - Backpressure for the API
+Per-route caps on requests in flight, a bounded executor for LLM work and
+a priority admission queue in front of the reasoner, so slow generation
+cannot occupy every server thread and /verdict and /health keep answering
+while reasoning requests queue
+"""
+
+import itertools
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Request priorities, most urgent first (X-Priority header values)
+PRIORITIES = {"high": 0, "normal": 1, "low": 2}
+DEFAULT_PRIORITY = "normal"
+
+
+class RouteBusy(Exception):
+    """A route is already serving its maximum number of requests"""
+
+    def __init__(self, route, limit):
+        super().__init__(f"{route} is at its limit of {limit} concurrent requests")
+        self.route = route
+        self.limit = limit
+
+
+class ExecutorFull(Exception):
+    """Every LLM slot is running and the wait queue is full"""
+
+
+class AdmissionRejected(Exception):
+    """
+    A reasoning request was not admitted. ``reason`` is "queue_full" (or
+    "displaced" by a more deserving request) when the client should retry
+    later, or "wait_too_long" / "gave_up" when the expected (or actual)
+    wait overran its deadline and it should be answered without the LLM.
+    """
+
+    LATE = ("wait_too_long", "gave_up")
+
+    def __init__(self, reason, message, retry_after=None):
+        super().__init__(message)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+def parse_limits(spec):
+    """
+    Parse "route=limit,route=limit" (e.g. "verdict=16,genai_reason=8");
+    a limit of 0 means unlimited
+    """
+    limits = {}
+    for item in (spec or "").split(","):
+        route, sep, limit = item.partition("=")
+        if not sep:
+            continue
+        try:
+            limits[route.strip()] = int(limit)
+        except ValueError:
+            print(f"⚠️  Ignoring route concurrency limit {item.strip()!r}")
+    return limits
+
+
+class RouteLimiter:
+    """
+    Counts requests in flight per route and refuses new ones beyond the
+    route's limit instead of letting them wait for a server thread
+    """
+
+    def __init__(self, limits=None):
+        self.limits = {route: limit for route, limit in (limits or {}).items() if limit > 0}
+        self._lock = threading.Lock()
+        self._active = {route: 0 for route in self.limits}
+        self._rejected = {route: 0 for route in self.limits}
+
+    def enter(self, route):
+        """Take a slot for route (raises RouteBusy when it is full)"""
+        limit = self.limits.get(route)
+        if limit is None:
+            return
+        with self._lock:
+            if self._active[route] >= limit:
+                self._rejected[route] += 1
+                raise RouteBusy(route, limit)
+            self._active[route] += 1
+
+    def leave(self, route):
+        if route not in self.limits:
+            return
+        with self._lock:
+            self._active[route] -= 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                route: {
+                    "limit": limit,
+                    "active": self._active[route],
+                    "rejected": self._rejected[route],
+                }
+                for route, limit in self.limits.items()
+            }
+
+
+class BoundedExecutor:
+    """
+    Thread pool for LLM calls with a bounded backlog.
+
+    At most ``max_workers`` calls run at once (the micro-batcher groups
+    them into shared generate calls) and at most ``max_queue`` more wait
+    for a worker; submitting beyond that raises ExecutorFull. Streams
+    generate on the request thread and do not use the executor: their
+    GenAI slot is an AdmissionController ticket.
+    """
+
+    def __init__(self, max_workers=4, max_queue=4, name="genai-executor"):
+        self.max_workers = max(1, int(max_workers))
+        self.max_queue = max(0, int(max_queue))
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._running = 0
+        self._submitted = 0
+        self._completed = 0
+        self._rejected = 0
+
+    @property
+    def capacity(self):
+        return self.max_workers + self.max_queue
+
+    def _acquire(self):
+        """Reserve a slot; False when the executor is full"""
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                self._rejected += 1
+                return False
+            self._in_flight += 1
+            self._submitted += 1
+            return True
+
+    def _release(self):
+        with self._lock:
+            self._in_flight -= 1
+            self._completed += 1
+
+    def submit(self, fn, *args, **kwargs):
+        """Run fn on the pool and return its Future (raises ExecutorFull)"""
+        if not self._acquire():
+            raise ExecutorFull(
+                f"{self.max_workers} LLM calls running and {self.max_queue} queued"
+            )
+
+        def run():
+            with self._lock:
+                self._running += 1
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._running -= 1
+
+        try:
+            future = self._pool.submit(run)
+        except Exception:
+            self._release()
+            raise
+        future.add_done_callback(lambda _: self._release())
+        return future
+
+    def stats(self):
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "in_flight": self._in_flight,
+                "running": self._running,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+
+
+class _Ticket:
+    """One admitted or waiting reasoning request"""
+
+    __slots__ = ("client", "priority", "seq", "queued_at", "started_at", "granted", "rejected")
+
+    def __init__(self, client, priority, seq):
+        self.client = client
+        self.priority = priority
+        self.seq = seq
+        self.queued_at = time.monotonic()
+        self.started_at = None
+        self.granted = False
+        self.rejected = None
+
+
+class AdmissionController:
+    """
+    Bounded priority queue in front of the reasoner.
+
+    At most ``slots`` requests generate at once and at most ``max_queue``
+    more wait. A free slot goes to the waiting request with the best
+    (priority, requests the client already has running, arrival) key, so
+    one client's burst cannot starve the others; when the queue is full a
+    newcomer displaces the waiter with the worst (priority, client load)
+    key if its own is better, otherwise it is refused with "queue_full".
+
+    Completed generations feed running averages of tokens/sec and tokens
+    per request; from them and the queue ahead of it each request gets an
+    expected wait, and one that could not finish before its deadline is
+    refused with "wait_too_long" instead of timing out in the queue.
+    """
+
+    def __init__(self, slots=4, max_queue=8, smoothing=0.2, default_retry_after=10):
+        self.slots = max(1, int(slots))
+        self.max_queue = max(0, int(max_queue))
+        self.smoothing = smoothing
+        self.default_retry_after = default_retry_after
+
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._waiting = []
+        self._running = {}          # client -> requests generating
+        self._tokens_per_second = None
+        self._tokens_per_request = None
+        self._counts = dict.fromkeys(
+            ("admitted", "completed", "queue_full", "displaced", "wait_too_long", "gave_up"), 0
+        )
+        self._queued_total = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    # -- estimates ---------------------------------------------------------
+
+    def observe(self, tokens, seconds):
+        """Fold one finished generation into the running averages"""
+        if not tokens or seconds <= 0:
+            return
+        with self._cond:
+            self._tokens_per_second = self._average(self._tokens_per_second, tokens / seconds)
+            self._tokens_per_request = self._average(self._tokens_per_request, tokens)
+
+    def _average(self, current, sample):
+        if current is None:
+            return float(sample)
+        return current + self.smoothing * (sample - current)
+
+    def _service_seconds(self):
+        """Expected generation time of one request (None before any sample)"""
+        if not self._tokens_per_second:
+            return None
+        return self._tokens_per_request / self._tokens_per_second
+
+    def _expected_wait(self, ahead):
+        """Seconds until a slot frees up for a request with ``ahead`` waiters in front"""
+        if ahead == 0 and self._busy() < self.slots:
+            return 0.0
+        service = self._service_seconds()
+        if service is None:
+            return None
+        return service * (ahead + 1) / self.slots
+
+    def _retry_after(self, wait):
+        if wait is None:
+            return self.default_retry_after
+        return max(1, math.ceil(wait))
+
+    # -- admission ---------------------------------------------------------
+
+    def _busy(self):
+        return sum(self._running.values())
+
+    def _load(self, client):
+        waiting = sum(1 for ticket in self._waiting if ticket.client == client)
+        return self._running.get(client, 0) + waiting
+
+    def _pick_order(self, ticket):
+        return (ticket.priority, self._running.get(ticket.client, 0), ticket.seq)
+
+    def _start(self, ticket):
+        ticket.granted = True
+        ticket.started_at = time.monotonic()
+        self._running[ticket.client] = self._running.get(ticket.client, 0) + 1
+        self._counts["admitted"] += 1
+
+    def _grant_waiters(self):
+        woke = False
+        while self._waiting and self._busy() < self.slots:
+            ticket = min(self._waiting, key=self._pick_order)
+            self._waiting.remove(ticket)
+            self._record_wait(ticket)
+            self._start(ticket)
+            woke = True
+        if woke:
+            self._cond.notify_all()
+
+    def _record_wait(self, ticket):
+        wait = time.monotonic() - ticket.queued_at
+        self._queued_total += 1
+        self._total_wait += wait
+        self._max_wait = max(self._max_wait, wait)
+
+    def _reject(self, reason, message, wait=None):
+        self._counts[reason] += 1
+        return AdmissionRejected(reason, message, self._retry_after(wait))
+
+    def admit(self, client, priority=DEFAULT_PRIORITY, deadline=None):
+        """
+        Wait for a generation slot and return a ticket for release(), or
+        raise AdmissionRejected. deadline is a time.monotonic() value.
+        """
+        rank = PRIORITIES.get(priority, PRIORITIES[DEFAULT_PRIORITY])
+        with self._cond:
+            ticket = _Ticket(client, rank, next(self._seq))
+            if not self._waiting and self._busy() < self.slots:
+                self._start(ticket)
+                return ticket
+
+            ahead = sum(1 for waiter in self._waiting if waiter.priority <= rank)
+            wait = self._expected_wait(ahead)
+            service = self._service_seconds()
+            if deadline is not None and wait is not None and service is not None and \
+                    ticket.queued_at + wait + service > deadline:
+                raise self._reject(
+                    "wait_too_long",
+                    f"expected wait {wait:.1f}s plus {service:.1f}s of generation "
+                    f"exceeds the {max(0.0, deadline - ticket.queued_at):.1f}s budget",
+                    wait
+                )
+
+            if len(self._waiting) >= self.max_queue:
+                self._make_room(ticket, wait)
+            self._waiting.append(ticket)
+
+            # Stop waiting once the request could no longer finish in time
+            give_up_at = deadline
+            if deadline is not None and service is not None:
+                give_up_at = deadline - service
+            while not ticket.granted and ticket.rejected is None:
+                timeout = None if give_up_at is None else give_up_at - time.monotonic()
+                if timeout is not None and timeout <= 0:
+                    self._waiting.remove(ticket)
+                    raise self._reject(
+                        "gave_up", "no generation slot freed up before the deadline", wait
+                    )
+                self._cond.wait(timeout)
+
+            if ticket.rejected is not None:
+                raise ticket.rejected
+            return ticket
+
+    def _make_room(self, ticket, wait):
+        """Displace the least deserving waiter for ticket, or refuse ticket"""
+        def claim(waiter):
+            return (waiter.priority, self._load(waiter.client))
+
+        # With max_queue 0 there is never a waiter to displace
+        victim = max(self._waiting, key=lambda waiter: (claim(waiter), waiter.seq), default=None)
+        if victim is None or claim(victim) <= (ticket.priority, self._load(ticket.client) + 1):
+            raise self._reject(
+                "queue_full",
+                f"{self.slots} reasoning requests running and {self.max_queue} queued",
+                wait
+            )
+        self._waiting.remove(victim)
+        victim.rejected = self._reject(
+            "displaced", "displaced from the queue by a higher-priority request", wait
+        )
+        self._cond.notify_all()
+
+    def release(self, ticket, tokens=None):
+        """Free ticket's slot; tokens (if known) update the throughput average"""
+        seconds = time.monotonic() - ticket.started_at
+        with self._cond:
+            self._running[ticket.client] -= 1
+            if not self._running[ticket.client]:
+                del self._running[ticket.client]
+            self._counts["completed"] += 1
+            self._grant_waiters()
+        if tokens:
+            self.observe(tokens, seconds)
+
+    def stats(self):
+        """Queue depth, wait estimates and admission counters for /health"""
+        with self._cond:
+            waiting = {name: 0 for name in PRIORITIES}
+            ranks = {rank: name for name, rank in PRIORITIES.items()}
+            for ticket in self._waiting:
+                waiting[ranks[ticket.priority]] += 1
+            # For a request joining the back of the queue now
+            wait = self._expected_wait(len(self._waiting))
+            service = self._service_seconds()
+            queued = self._queued_total
+            return {
+                "slots": self.slots,
+                "max_queue": self.max_queue,
+                "running": self._busy(),
+                "queue_depth": len(self._waiting),
+                "waiting_by_priority": waiting,
+                "active_clients": len(set(self._running) | {t.client for t in self._waiting}),
+                "tokens_per_second": None if self._tokens_per_second is None
+                else round(self._tokens_per_second, 1),
+                "tokens_per_request": None if self._tokens_per_request is None
+                else round(self._tokens_per_request, 1),
+                "expected_generation_seconds": None if service is None else round(service, 2),
+                "expected_wait_seconds": None if wait is None else round(wait, 2),
+                "avg_queue_wait_ms": round(self._total_wait / queued * 1000, 1) if queued else 0,
+                "max_queue_wait_ms": round(self._max_wait * 1000, 1),
+                **self._counts,
+            }
@@ -0,0 +1,165 @@
+"""
+Dataset Loader - Chunked Reading of Case Datasets
+Streams CSV, JSON (array) and JSONL case files in fixed-size batches with
+one normalized schema: the label is always "verdict" (older files call it
+"winner"), verdicts are spelled like the classifier's classes, and the 0/1
+evidence and score columns are stored as int8. Memory is bounded by the
+batch size, not the file size
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# Verdict labels, spelled the way the classifiers and the API return them
+CLASSES = ("Defendant", "Neutral", "Plaintiff")
+
+TEXT_COLUMNS = ("plaintiff", "defendant", "evidence")
+# 0/1 flags per side
+EVIDENCE_COLUMNS = (
+    "plaintiff_evidence", "defendant_evidence", "plaintiff_witness", "defendant_witness",
+    "plaintiff_record", "defendant_record", "plaintiff_expert_support", "defendant_expert_support",
+)
+# Sums of a side's flags (0-4)
+SCORE_COLUMNS = ("plaintiff_score", "defendant_score")
+LABEL_COLUMNS = ("verdict", "winner")
+OPTIONAL_COLUMNS = ("case_id", "legal_basis")
+KNOWN_COLUMNS = frozenset(TEXT_COLUMNS + EVIDENCE_COLUMNS + SCORE_COLUMNS + LABEL_COLUMNS
+                          + OPTIONAL_COLUMNS)
+
+DEFAULT_CHUNK_SIZE = 10000
+# Bytes read at a time from a JSON array file
+JSON_READ_SIZE = 1 << 16
+
+
+def normalize_verdict(value):
+    """'plaintiff' / ' Plaintiff ' -> 'Plaintiff'; None for anything not in CLASSES"""
+    if not isinstance(value, str):
+        return None
+    value = value.strip().capitalize()
+    return value if value in CLASSES else None
+
+
+def _iter_json_array(path):
+    """Objects of a top-level JSON array, decoded one at a time"""
+    decoder = json.JSONDecoder()
+    with open(path, encoding="utf-8") as f:
+        buffer, pos, eof = "", 0, False
+        started = False
+        while True:
+            # Skip whitespace and separators, reading more when the buffer runs out
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos == len(buffer):
+                if eof:
+                    raise ValueError(f"{path}: unterminated JSON array")
+                buffer, pos = f.read(JSON_READ_SIZE), 0
+                eof = not buffer
+                continue
+            if not started:
+                if buffer[pos] != "[":
+                    raise ValueError(f"{path}: expected a JSON array of cases")
+                started, pos = True, pos + 1
+                continue
+            if buffer[pos] == "]":
+                return
+            try:
+                record, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                more = f.read(JSON_READ_SIZE)
+                if not more:
+                    raise
+                buffer, pos = buffer[pos:] + more, 0
+                continue
+            yield record
+            pos = end
+            if pos > JSON_READ_SIZE:
+                buffer, pos = buffer[pos:], 0
+
+
+def _iter_jsonl(path):
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _record_chunks(records, chunk_size):
+    chunk = []
+    for record in records:
+        chunk.append({k: v for k, v in record.items() if k in KNOWN_COLUMNS})
+        if len(chunk) >= chunk_size:
+            yield pd.DataFrame.from_records(chunk)
+            chunk = []
+    if chunk:
+        yield pd.DataFrame.from_records(chunk)
+
+
+def _raw_chunks(path, chunk_size):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return pd.read_csv(path, chunksize=chunk_size, usecols=lambda c: c in KNOWN_COLUMNS)
+    if extension == ".jsonl":
+        return _record_chunks(_iter_jsonl(path), chunk_size)
+    if extension == ".json":
+        return _record_chunks(_iter_json_array(path), chunk_size)
+    raise ValueError(f"unsupported dataset format: {path} (expected .csv, .json or .jsonl)")
+
+
+def normalize_chunk(df):
+    """
+    One raw chunk in the common schema: text columns as strings (missing
+    evidence becomes ""), "verdict" from verdict or winner with unknown
+    labels dropped, evidence/score columns as int8. Columns the source does
+    not have are left out rather than invented.
+    """
+    label = df["verdict"] if "verdict" in df.columns else df.get("winner")
+    if label is None:
+        raise ValueError("dataset has neither a 'verdict' nor a 'winner' column")
+    if "winner" in df.columns and "verdict" in df.columns:
+        label = label.fillna(df["winner"])
+
+    out = pd.DataFrame(index=df.index)
+    if "case_id" in df.columns:
+        out["case_id"] = df["case_id"]
+    for column in TEXT_COLUMNS:
+        out[column] = df[column].fillna("").astype(str) if column in df.columns else ""
+    if "legal_basis" in df.columns:
+        out["legal_basis"] = df["legal_basis"].fillna("").astype(str)
+    for column in EVIDENCE_COLUMNS + SCORE_COLUMNS:
+        if column in df.columns:
+            out[column] = pd.to_numeric(df[column], errors="coerce").fillna(0).astype(np.int8)
+    out["verdict"] = label.map(normalize_verdict)
+    return out[out["verdict"].notna()].reset_index(drop=True)
+
+
+def iter_batches(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Normalized DataFrames of at most chunk_size cases each, in file order"""
+    skipped = 0
+    for chunk in _raw_chunks(path, chunk_size):
+        batch = normalize_chunk(chunk)
+        skipped += len(chunk) - len(batch)
+        if len(batch):
+            yield batch
+    if skipped:
+        print(f"⚠️  Skipped {skipped} cases without a known verdict in {os.path.basename(path)}")
+
+
+def load_frame(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """The whole dataset as one normalized DataFrame, read chunk by chunk"""
+    batches = list(iter_batches(path, chunk_size))
+    if not batches:
+        raise ValueError(f"{path} has no cases with a known verdict")
+    df = pd.concat(batches, ignore_index=True)
+    df.attrs["source"] = os.path.basename(path)
+    return df
+
+
+def batch_text(batch, legal_basis=True):
+    """Per-case training text (plaintiff, defendant, evidence[, legal basis]) for one batch"""
+    text = batch["plaintiff"] + " " + batch["defendant"] + " " + batch["evidence"]
+    if legal_basis and "legal_basis" in batch.columns:
+        text = text + " " + batch["legal_basis"]
+    return text
@@ -0,0 +1,187 @@
+"""
+ONNX Export - Build the ONNX Runtime Reasoner Bundle
+Exports the causal LM behind LocalGenAIReasoner to a single ONNX graph with
+explicit KV-cache inputs/outputs, next to the tokenizer and the settings
+OnnxGenAIReasoner needs, so production can serve reasoning without torch
+
+Usage (from Backend/):
+    python -m model.export_onnx --model TinyLlama/TinyLlama-1.1B-Chat-v1.0 \
+        --output model/models/genai-onnx --int8
+"""
+
+import argparse
+import json
+import os
+import time
+
+from .reasoner_base import GENERATION_DEFAULTS
+
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(__file__), "models", "genai-onnx")
+
+# Files of an exported bundle
+CONFIG_FILE = "reasoner_config.json"
+MODEL_FILE = "model.onnx"
+INT8_MODEL_FILE = "model.int8.onnx"
+
+OPSET_VERSION = 17
+
+
+def _cache_names(num_layers, prefix):
+    return [f"{prefix}.{i}.{kv}" for i in range(num_layers) for kv in ("key", "value")]
+
+
+def export(model_name, output_dir=DEFAULT_OUTPUT, int8=False):
+    """
+    Export model_name to output_dir and return the path of the bundle's
+    reasoner_config.json
+    """
+    import torch
+    from transformers import AutoModelForCausalLM, AutoTokenizer, DynamicCache
+
+    start = time.time()
+    print(f"⏳ Exporting {model_name} to ONNX ({'int8' if int8 else 'float32'})")
+    os.makedirs(output_dir, exist_ok=True)
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name, trust_remote_code=True, use_fast=True)
+    if tokenizer.pad_token is None:
+        tokenizer.pad_token = tokenizer.eos_token
+    tokenizer.save_pretrained(output_dir)
+
+    # Eager attention traces to plain MatMul/Softmax nodes
+    model = AutoModelForCausalLM.from_pretrained(
+        model_name, torch_dtype=torch.float32, attn_implementation="eager",
+        trust_remote_code=True, low_cpu_mem_usage=True
+    ).eval()
+    config = model.config
+    num_layers = config.num_hidden_layers
+    num_kv_heads = getattr(config, "num_key_value_heads", None) or config.num_attention_heads
+    head_dim = getattr(config, "head_dim", None) or config.hidden_size // config.num_attention_heads
+
+    class _WithExplicitCache(torch.nn.Module):
+        """Takes and returns the KV cache as flat per-layer tensors"""
+
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, input_ids, attention_mask, position_ids, *past):
+            cache = DynamicCache()
+            for i in range(num_layers):
+                cache.update(past[2 * i], past[2 * i + 1], i)
+            out = self.model(
+                input_ids=input_ids, attention_mask=attention_mask,
+                position_ids=position_ids, past_key_values=cache, use_cache=True
+            )
+            present = []
+            for layer in out.past_key_values.layers:
+                present += [layer.keys, layer.values]
+            return (out.logits, *present)
+
+    past_names = _cache_names(num_layers, "past_key_values")
+    present_names = _cache_names(num_layers, "present")
+    input_names = ["input_ids", "attention_mask", "position_ids"] + past_names
+    dynamic_axes = {
+        "input_ids": {0: "batch", 1: "sequence"},
+        "attention_mask": {0: "batch", 1: "total_sequence"},
+        "position_ids": {0: "batch", 1: "sequence"},
+        "logits": {0: "batch", 1: "sequence"},
+    }
+    dynamic_axes.update({name: {0: "batch", 2: "past_sequence"} for name in past_names})
+    dynamic_axes.update({name: {0: "batch", 2: "total_sequence"} for name in present_names})
+
+    # Trace with a padded row and a non-empty cache so the general masking
+    # path is exported rather than an all-ones shortcut
+    batch, seq, past_len = 2, 4, 3
+    input_ids = torch.full((batch, seq), 1, dtype=torch.long)
+    attention_mask = torch.ones(batch, past_len + seq, dtype=torch.long)
+    attention_mask[1, :2] = 0
+    position_ids = torch.arange(past_len, past_len + seq).expand(batch, seq)
+    past = [torch.zeros(batch, num_kv_heads, past_len, head_dim) for _ in past_names]
+
+    model_path = os.path.join(output_dir, MODEL_FILE)
+    with torch.no_grad():
+        torch.onnx.export(
+            _WithExplicitCache(model),
+            (input_ids, attention_mask, position_ids, *past),
+            model_path,
+            input_names=input_names,
+            output_names=["logits"] + present_names,
+            dynamic_axes=dynamic_axes,
+            opset_version=OPSET_VERSION,
+            dynamo=False,
+        )
+    _consolidate_weights(model_path)
+    print(f"   📦 Graph exported ({time.time() - start:.1f}s)")
+
+    model_file = MODEL_FILE
+    if int8:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        quantize_dynamic(
+            model_path, os.path.join(output_dir, INT8_MODEL_FILE),
+            weight_type=QuantType.QInt8, use_external_data_format=True
+        )
+        model_file = INT8_MODEL_FILE
+        print(f"   🔧 Dynamic int8 quantization ({time.time() - start:.1f}s)")
+
+    settings = {
+        "model_name": model_name,
+        "model_file": model_file,
+        "precision": "int8" if int8 else "float32",
+        "num_layers": num_layers,
+        "num_kv_heads": num_kv_heads,
+        "head_dim": head_dim,
+        "pad_token_id": tokenizer.pad_token_id,
+        "eos_token_id": tokenizer.eos_token_id,
+        "clean_up_tokenization_spaces": bool(getattr(tokenizer, "clean_up_tokenization_spaces", False)),
+        "generation": dict(GENERATION_DEFAULTS),
+        "opset_version": OPSET_VERSION,
+        "exported_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    config_path = os.path.join(output_dir, CONFIG_FILE)
+    with open(config_path, "w") as f:
+        json.dump(settings, f, indent=2)
+
+    print(f"✅ ONNX reasoner bundle written to {output_dir} in {time.time() - start:.1f}s")
+    return config_path
+
+
+def _consolidate_weights(model_path):
+    """
+    Store all weights in one external data file: graphs over protobuf's
+    2GB limit (e.g. TinyLlama in float32) are otherwise split per tensor
+    """
+    import onnx
+
+    directory = os.path.dirname(model_path)
+    data_file = os.path.basename(model_path) + ".data"
+    model = onnx.load(model_path, load_external_data=False)
+    stale = {
+        entry.value
+        for tensor in model.graph.initializer
+        for entry in tensor.external_data
+        if entry.key == "location"
+    }
+    onnx.load_external_data_for_model(model, directory)
+    onnx.save_model(
+        model, model_path, save_as_external_data=True,
+        all_tensors_to_one_file=True, location=data_file, size_threshold=1024
+    )
+    for name in stale - {data_file}:
+        path = os.path.join(directory, name)
+        if os.path.isfile(path):
+            os.remove(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the GenAI reasoner model to ONNX")
+    parser.add_argument("--model", default="TinyLlama/TinyLlama-1.1B-Chat-v1.0",
+                        help="Hugging Face model name or local path")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Bundle directory")
+    parser.add_argument("--int8", action="store_true",
+                        help="Also write a dynamically quantized int8 graph and serve it")
+    args = parser.parse_args()
+    export(args.model, args.output, int8=args.int8)
+
+
+if __name__ == "__main__":
+    main()
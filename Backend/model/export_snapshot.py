@@ -0,0 +1,131 @@
+"""
+Snapshot Export - Store a Local Model Snapshot in the Load Dtype
+Rewrites the *.safetensors files of a local snapshot in the dtype
+LocalGenAIReasoner loads with, next to a copy of its config and tokenizer
+files. Hub checkpoints such as TinyLlama are stored in bfloat16 while the
+CPU default is float32: pointed at such a snapshot, GENAI_MODEL_PATH copies
+every tensor at start instead of memory-mapping it zero-copy
+
+Usage (from Backend/):
+    huggingface-cli download TinyLlama/TinyLlama-1.1B-Chat-v1.0 --local-dir /tmp/tinyllama
+    python -m model.export_snapshot --source /tmp/tinyllama \
+        --output model/models/tinyllama --dtype float32
+"""
+
+import argparse
+import json
+import os
+import shutil
+import struct
+import time
+
+DTYPES = ("float32", "bfloat16", "float16")
+
+INDEX_FILE = "model.safetensors.index.json"
+
+# safetensors pads its JSON header so tensor data starts 8-byte aligned
+HEADER_ALIGNMENT = 8
+
+
+def convert_file(source_path, output_path, dtype):
+    """
+    Write the tensors of source_path to output_path with floating point
+    tensors cast to dtype, one tensor in memory at a time; returns
+    (tensors, converted, data bytes)
+    """
+    import torch
+    from .gen_ai_reasoner import _SAFETENSORS_DTYPES, _mmap_safetensors
+
+    codes = {value: code for code, value in _SAFETENSORS_DTYPES.items()}
+    with open(source_path, "rb") as f:
+        header_length = struct.unpack("<Q", f.read(8))[0]
+        metadata = json.loads(f.read(header_length)).get("__metadata__")
+    tensors = _mmap_safetensors(source_path)
+
+    header = {"__metadata__": metadata} if metadata else {}
+    dtypes = {}
+    offset = 0
+    for name, tensor in tensors.items():
+        dtypes[name] = dtype if tensor.is_floating_point() else tensor.dtype
+        size = tensor.numel() * dtypes[name].itemsize
+        header[name] = {"dtype": codes[dtypes[name]], "shape": list(tensor.shape),
+                        "data_offsets": [offset, offset + size]}
+        offset += size
+    encoded = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    encoded += b" " * (-len(encoded) % HEADER_ALIGNMENT)
+
+    with open(output_path, "wb") as f:
+        f.write(struct.pack("<Q", len(encoded)))
+        f.write(encoded)
+        for name, tensor in tensors.items():
+            data = tensor.to(dtypes[name]).contiguous().reshape(-1)
+            f.write(data.view(torch.uint8).numpy().tobytes())
+    converted = sum(tensor.dtype != dtypes[name] for name, tensor in tensors.items())
+    return len(tensors), converted, offset
+
+
+def export(source_dir, output_dir, dtype="float32"):
+    """
+    Write a copy of the snapshot in source_dir to output_dir with its
+    weights stored in dtype; returns output_dir
+    """
+    import torch
+
+    if dtype not in DTYPES:
+        raise ValueError(f"dtype must be one of {', '.join(DTYPES)}")
+    if os.path.realpath(source_dir) == os.path.realpath(output_dir):
+        raise ValueError("output must differ from the source snapshot")
+    files = sorted(name for name in os.listdir(source_dir) if name.endswith(".safetensors"))
+    if not files:
+        raise FileNotFoundError(f"no .safetensors files in {source_dir}")
+
+    start = time.time()
+    print(f"⏳ Exporting snapshot {source_dir} in {dtype}")
+    os.makedirs(output_dir, exist_ok=True)
+    target = getattr(torch, dtype)
+    total = 0
+    for name in files:
+        tensors, converted, size = convert_file(
+            os.path.join(source_dir, name), os.path.join(output_dir, name), target
+        )
+        total += size
+        print(f"   📦 {name}: {tensors} tensors, {converted} converted")
+
+    # Config, tokenizer and generation settings are copied as they are,
+    # apart from the recorded dtype and the index's total size
+    for name in sorted(os.listdir(source_dir)):
+        path = os.path.join(source_dir, name)
+        if name.endswith(".safetensors") or not os.path.isfile(path):
+            continue
+        if name in ("config.json", INDEX_FILE):
+            with open(path) as f:
+                data = json.load(f)
+            if name == "config.json":
+                data["torch_dtype"] = dtype
+                if "dtype" in data:  # Newer transformers' spelling
+                    data["dtype"] = dtype
+            else:
+                data.setdefault("metadata", {})["total_size"] = total
+            with open(os.path.join(output_dir, name), "w") as f:
+                json.dump(data, f, indent=2)
+        else:
+            shutil.copy2(path, os.path.join(output_dir, name))
+
+    print(f"✅ Snapshot written to {output_dir} in {time.time() - start:.1f}s "
+          f"({total / 1e9:.2f} GB of weights)")
+    return output_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Store a local model snapshot in the GenAI load dtype")
+    parser.add_argument("--source", required=True, help="Local snapshot directory (config, tokenizer, *.safetensors)")
+    parser.add_argument("--output", required=True, help="Directory for the converted snapshot (GENAI_MODEL_PATH)")
+    parser.add_argument("--dtype", choices=DTYPES, default="float32",
+                        help="Load dtype: float32 (CPU default), bfloat16 (GENAI_CPU_PRECISION=bfloat16) "
+                             "or float16 (GPU)")
+    args = parser.parse_args()
+    export(args.source, args.output, args.dtype)
+
+
+if __name__ == "__main__":
+    main()
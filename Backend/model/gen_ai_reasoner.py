@@ -1,6 +1,20 @@
 try:
-    from transformers import AutoModelForCausalLM, AutoTokenizer, GenerationConfig
+    from transformers import (
+        AutoConfig,
+        AutoModelForCausalLM,
+        AutoTokenizer,
+        GenerationConfig,
+        StoppingCriteria,
+        StoppingCriteriaList,
+        TextIteratorStreamer,
+    )
     import torch
+    import contextlib
+    import copy
+    import json
+    import os
+    import struct
+    import threading
     import time
 except ImportError as e:
     raise ImportError(
@@ -8,8 +22,185 @@ except ImportError as e:
         "Please install them with: pip install transformers torch accelerate"
     ) from e
 
-class LocalGenAIReasoner:
-    def __init__(self, model_name="TinyLlama/TinyLlama-1.1B-Chat-v1.0", use_quantization=True):
+from .reasoner_base import (
+    GENERATION_DEFAULTS,
+    MAX_PROMPT_TOKENS,
+    OUTCOME_COMPLETE,
+    OUTCOME_TIMEOUT,
+    OUTCOME_TRUNCATED,
+    BaseReasoner,
+)
+
+# Load modes for CPU inference
+CPU_PRECISIONS = ("int8", "bfloat16", "float32")
+
+# Draft length for prompt-lookup speculative decoding
+PROMPT_LOOKUP_TOKENS = 10
+
+_SAFETENSORS_DTYPES = {
+    "F64": torch.float64, "F32": torch.float32, "F16": torch.float16, "BF16": torch.bfloat16,
+    "I64": torch.int64, "I32": torch.int32, "I16": torch.int16, "I8": torch.int8,
+    "U8": torch.uint8, "BOOL": torch.bool,
+}
+
+
+def _no_init_weights():
+    """Context that skips random weight init while building a model (weights are loaded after)"""
+    try:
+        from transformers.initialization import no_init_weights
+    except ImportError:
+        try:
+            from transformers.modeling_utils import no_init_weights
+        except ImportError:
+            return contextlib.nullcontext()
+    return no_init_weights()
+
+
+def _mmap_safetensors(path):
+    """
+    Tensors of a .safetensors file backed by a private (copy-on-write)
+    memory map of it: nothing is read until a tensor is used, and pages
+    are shared with the OS page cache
+    """
+    with open(path, "rb") as f:
+        header_length = struct.unpack("<Q", f.read(8))[0]
+        header = json.loads(f.read(header_length))
+    header.pop("__metadata__", None)
+    data_start = 8 + header_length
+
+    storage = torch.UntypedStorage.from_file(path, shared=False, nbytes=os.path.getsize(path))
+    raw = torch.empty(0, dtype=torch.uint8).set_(storage)
+    tensors = {}
+    for name, info in header.items():
+        dtype = _SAFETENSORS_DTYPES[info["dtype"]]
+        begin, end = info["data_offsets"]
+        chunk = raw[data_start + begin:data_start + end]
+        if (data_start + begin) % dtype.itemsize:
+            chunk = chunk.clone()  # Misaligned for a zero-copy view
+        tensors[name] = chunk.view(dtype).reshape(info["shape"])
+    return tensors
+
+
+class _StartupPhases:
+    """Times the steps of a model load for a startup breakdown"""
+
+    def __init__(self):
+        self.seconds = {}
+
+    @contextlib.contextmanager
+    def __call__(self, name):
+        start = time.time()
+        try:
+            yield
+        finally:
+            self.seconds[name] = self.seconds.get(name, 0.0) + time.time() - start
+
+    def report(self):
+        total = sum(self.seconds.values()) or 1e-9
+        print(f"   ⏱️  Startup phases:")
+        for name, seconds in self.seconds.items():
+            print(f"      {name:<18} {seconds:7.3f}s ({seconds / total:.0%})")
+
+
+def _configure_cpu_threads(num_threads=None, interop_threads=None):
+    """Apply explicit torch thread counts (None keeps torch's default)"""
+    if num_threads:
+        torch.set_num_threads(int(num_threads))
+    if interop_threads:
+        try:
+            torch.set_num_interop_threads(int(interop_threads))
+        except RuntimeError:
+            # Can only be set once per process, before any inter-op work
+            pass
+
+
+def _cpu_supports_bf16():
+    try:
+        return torch.backends.mkldnn.is_available() and torch.ops.mkldnn._is_mkldnn_bf16_supported()
+    except Exception:
+        return False
+
+
+class _CancelCriteria(StoppingCriteria):
+    """Stops generation once the given event is set (e.g. client went away)"""
+
+    def __init__(self, event):
+        self.event = event
+
+    def __call__(self, input_ids, scores, **kwargs):
+        return torch.full(
+            (input_ids.shape[0],), self.event.is_set(),
+            dtype=torch.bool, device=input_ids.device
+        )
+
+
+class _DeadlineCriteria(StoppingCriteria):
+    """
+    Stops each row before its wall-clock deadline (time.monotonic()) would
+    pass, using the duration of the previous decoding step as the estimate
+    for the next one. Rows without a deadline use None.
+
+    A row that had not produced EOS yet is marked in ``cut`` and passed to
+    ``on_cut(row, token_ids)`` right away, so its caller does not have to
+    wait for the rest of a batch.
+    """
+
+    def __init__(self, deadlines, prompt_length, eos_token_id, on_cut=None):
+        self.deadlines = [float("inf") if d is None else d for d in deadlines]
+        self.prompt_length = prompt_length
+        self.eos_token_id = eos_token_id
+        self.on_cut = on_cut
+        self.expired = [False] * len(self.deadlines)
+        self.cut = [False] * len(self.deadlines)
+        self._last = time.monotonic()
+        self._step = 0.0
+
+    def __call__(self, input_ids, scores, **kwargs):
+        now = time.monotonic()
+        self._step = now - self._last
+        self._last = now
+        for row, deadline in enumerate(self.deadlines):
+            if self.expired[row] or now + self._step < deadline:
+                continue
+            self.expired[row] = True
+            generated = input_ids[row, self.prompt_length:]
+            if not bool((generated == self.eos_token_id).any()):
+                self.cut[row] = True
+                if self.on_cut is not None:
+                    self.on_cut(row, input_ids[row])
+        return torch.tensor(self.expired, dtype=torch.bool, device=input_ids.device)
+
+
+class _ForwardCounter:
+    """
+    Records how many tokens each forward pass of a model was fed, for
+    passes made by the creating thread (other requests may share the model)
+    """
+
+    def __init__(self, model):
+        self.lengths = []
+        self._thread = threading.get_ident()
+        self._handle = model.register_forward_pre_hook(self._hook, with_kwargs=True)
+
+    def _hook(self, module, args, kwargs):
+        if threading.get_ident() != self._thread:
+            return
+        input_ids = kwargs.get("input_ids")
+        if input_ids is None and args:
+            input_ids = args[0]
+        if input_ids is not None:
+            self.lengths.append(input_ids.shape[1])
+
+    def close(self):
+        self._handle.remove()
+
+
+class LocalGenAIReasoner(BaseReasoner):
+    """PyTorch/transformers reasoning backend"""
+
+    def __init__(self, model_name="TinyLlama/TinyLlama-1.1B-Chat-v1.0", use_quantization=True,
+                 cpu_precision=None, num_threads=None, interop_threads=None,
+                 prefix_cache=True, speculative=None, snapshot_dir=None):
         """
         Initialize the Local GenAI Reasoner with optimizations for speed
         
@@ -17,26 +208,59 @@ class LocalGenAIReasoner:
             model_name: Model to use. Options:
                 - "TinyLlama/TinyLlama-1.1B-Chat-v1.0" (1.1GB, fast, recommended for CPU)
                 - "microsoft/phi-3-mini-4k-instruct" (7.6GB, slower on CPU)
-            use_quantization: If True, use 8-bit quantization to reduce memory (requires bitsandbytes)
+            use_quantization: If True, use 8-bit quantization on GPU to
+                reduce memory (requires bitsandbytes)
+            cpu_precision: "float32" (default), "bfloat16" or "int8" on CPU;
+                int8 (dynamic quantization of Linear layers) is opt-in since
+                it changes the generated text
+            num_threads: Torch intra-op threads on CPU (default: torch's choice)
+            interop_threads: Torch inter-op threads on CPU (default: torch's choice)
+            prefix_cache: If True, precompute the KV cache of PROMPT_PREFIX so
+                requests only encode their case-specific suffix
+            speculative: Opt-in speculative decoding for single requests:
+                "prompt_lookup" (or "prompt_lookup:N") drafts tokens by
+                matching n-grams from the prompt, which reasoning quotes
+                heavily (switches to greedy decoding); any other value is
+                loaded as a small draft model sharing the main tokenizer
+            snapshot_dir: Local copy of model_name (config, tokenizer and
+                *.safetensors files). Loaded without contacting the hub, with
+                weights memory-mapped straight into the model's tensors
         """
+        self.model_name = model_name
+        self.cpu_precision = None
+        self._prefix_ids = None
+        self._prefix_cache = None
+        self.speculative = None
+        self._speculative_kwargs = {}
+        self.startup_phases = _StartupPhases()
+        phase = self.startup_phases
+        source = snapshot_dir or model_name
+        # A configured snapshot never falls back to the network
+        local_kwargs = {"local_files_only": True} if snapshot_dir else {}
         try:
             print(f"\n{'='*60}")
             print(f"⚡ OPTIMIZED GenAI REASONER - FAST MODE")
             print(f"{'='*60}")
             print(f"⏳ Loading model: {model_name}")
+            if snapshot_dir:
+                print(f"   📁 Local snapshot: {snapshot_dir}")
             print(f"   💾 Optimized for maximum speed")
             
             start_time = time.time()
             
-            self.tokenizer = AutoTokenizer.from_pretrained(
-                model_name, 
-                trust_remote_code=True,
-                use_fast=True  # Use fast tokenizer
-            )
-            
-            # Ensure pad token is set
-            if self.tokenizer.pad_token is None:
-                self.tokenizer.pad_token = self.tokenizer.eos_token
+            with phase("tokenizer"):
+                self.tokenizer = AutoTokenizer.from_pretrained(
+                    source, 
+                    trust_remote_code=True,
+                    use_fast=True,  # Use fast tokenizer
+                    **local_kwargs
+                )
+                
+                # Ensure pad token is set
+                if self.tokenizer.pad_token is None:
+                    self.tokenizer.pad_token = self.tokenizer.eos_token
+                # Batched generation needs prompts right-aligned (left padding)
+                self.tokenizer.padding_side = "left"
             
             # Check if we can use CUDA
             self.device = "cuda" if torch.cuda.is_available() else "cpu"
@@ -57,8 +281,13 @@ class LocalGenAIReasoner:
             
             # Optimize for device
             if self.device == "cpu":
-                model_kwargs["torch_dtype"] = torch.float32
-                print("   🖥️  Using CPU (optimized for speed)")
+                self.cpu_precision = self._resolve_cpu_precision(cpu_precision)
+                _configure_cpu_threads(num_threads, interop_threads)
+                model_kwargs["torch_dtype"] = (
+                    torch.bfloat16 if self.cpu_precision == "bfloat16" else torch.float32
+                )
+                print(f"   🖥️  Using CPU (optimized for speed, {self.cpu_precision}, "
+                      f"{torch.get_num_threads()} threads)")
             else:
                 model_kwargs["torch_dtype"] = torch.float16
                 print("   🚀 Using GPU (CUDA)")
@@ -67,17 +296,32 @@ class LocalGenAIReasoner:
             if "phi-3" in model_name.lower():
                 model_kwargs["attn_implementation"] = "eager"
             
-            self.model = AutoModelForCausalLM.from_pretrained(
-                model_name,
-                **model_kwargs
-            )
+            self.model = None
+            if snapshot_dir and "load_in_8bit" not in model_kwargs:
+                try:
+                    self.model = self._load_snapshot(snapshot_dir, model_kwargs)
+                except Exception as e:
+                    print(f"   ⚠️  Memory-mapped load failed, using from_pretrained: {e}")
+            if self.model is None:
+                with phase("from_pretrained"):
+                    self.model = AutoModelForCausalLM.from_pretrained(
+                        source,
+                        **model_kwargs,
+                        **local_kwargs
+                    )
             
             # Move to device if not using quantization
             if not (use_quantization and self.device == "cuda"):
-                self.model = self.model.to(self.device)
+                with phase("device move"):
+                    self.model = self.model.to(self.device)
             
             # Set model to evaluation mode for faster inference
-            self.model.eval()
+            with phase("eval"):
+                self.model.eval()
+            
+            if self.device == "cpu" and self.cpu_precision == "int8":
+                with phase("int8 quantization"):
+                    self._quantize_dynamic_int8()
             
             # Enable inference optimizations
             if hasattr(torch, 'inference_mode'):
@@ -85,21 +329,25 @@ class LocalGenAIReasoner:
             
             # Pre-configure generation settings for speed
             self.fast_generation_config = GenerationConfig(
-                max_new_tokens=250,  # Reduced from 400 for speed
-                temperature=0.7,
-                do_sample=True,
-                top_p=0.9,
-                top_k=40,  # Reduced from 50
-                repetition_penalty=1.1,
+                **GENERATION_DEFAULTS,
                 pad_token_id=self.tokenizer.pad_token_id,
                 eos_token_id=self.tokenizer.eos_token_id,
                 early_stopping=True,
                 num_beams=1,  # Greedy decoding for speed
             )
             
+            if prefix_cache:
+                with phase("prefix cache"):
+                    self._prepare_prefix_cache()
+            
+            if speculative:
+                with phase("speculative"):
+                    self._prepare_speculative(speculative, model_kwargs["torch_dtype"])
+            
             load_time = time.time() - start_time
             print(f"✅ Model loaded successfully in {load_time:.2f}s")
             print(f"   📊 Model size: ~{self._estimate_model_size()}")
+            phase.report()
             print(f"   🎯 Optimized for <30s responses")
             print(f"{'='*60}\n")
             
@@ -107,11 +355,167 @@ class LocalGenAIReasoner:
             print(f"❌ Failed to load GenAI model: {e}")
             raise
 
+    def _load_snapshot(self, snapshot_dir, model_kwargs):
+        """
+        Build the model from a local snapshot without from_pretrained: an
+        uninitialized skeleton from config.json whose parameters are then
+        replaced by memory-mapped safetensors tensors (copied only when the
+        file's dtype differs from the load dtype; model.export_snapshot
+        rewrites a snapshot in the load dtype)
+        """
+        phase = self.startup_phases
+        dtype = model_kwargs["torch_dtype"]
+        with phase("model skeleton"):
+            config = AutoConfig.from_pretrained(
+                snapshot_dir, trust_remote_code=True, local_files_only=True
+            )
+            extra = {}
+            if "attn_implementation" in model_kwargs:
+                extra["attn_implementation"] = model_kwargs["attn_implementation"]
+            with _no_init_weights():
+                model = AutoModelForCausalLM.from_config(
+                    config, torch_dtype=dtype, trust_remote_code=True, **extra
+                )
+            try:
+                model.generation_config = GenerationConfig.from_pretrained(
+                    snapshot_dir, local_files_only=True
+                )
+            except (OSError, ValueError):
+                pass
+        
+        with phase("weight map"):
+            index_path = os.path.join(snapshot_dir, "model.safetensors.index.json")
+            if os.path.exists(index_path):
+                with open(index_path) as f:
+                    files = sorted(set(json.load(f)["weight_map"].values()))
+            else:
+                files = sorted(name for name in os.listdir(snapshot_dir) if name.endswith(".safetensors"))
+            if not files:
+                raise FileNotFoundError(f"no .safetensors files in {snapshot_dir}")
+            
+            state = {}
+            for name in files:
+                state.update(_mmap_safetensors(os.path.join(snapshot_dir, name)))
+            converted = 0
+            for name, tensor in state.items():
+                if tensor.is_floating_point() and tensor.dtype != dtype:
+                    state[name] = tensor.to(dtype)
+                    converted += 1
+            
+            missing, _ = model.load_state_dict(state, strict=False, assign=True)
+            model.tie_weights()
+            # Tied weights (e.g. lm_head sharing the embeddings) are not
+            # stored twice; anything else missing would stay uninitialized
+            current = model.state_dict()
+            stored = {tensor.data_ptr() for tensor in state.values()}
+            untouched = [name for name in missing if current[name].data_ptr() not in stored]
+            if untouched:
+                raise ValueError(f"weights missing from snapshot: {untouched[:5]}")
+        
+        dtype_name = str(dtype).replace('torch.', '')
+        print(f"   🗺️  Memory-mapped {len(state)} tensors from {len(files)} safetensors file(s)"
+              + (f", {converted} converted to {dtype_name}" if converted else ""))
+        if converted:
+            print(f"   ⚠️  Snapshot is not stored in {dtype_name}: converted tensors are copied into "
+                  f"memory, not zero-copy. Convert it once with: python -m model.export_snapshot "
+                  f"--source {snapshot_dir} --output <dir> --dtype {dtype_name}")
+        return model
+
+    def _resolve_cpu_precision(self, cpu_precision):
+        precision = (cpu_precision or "float32").lower()
+        precision = {"bf16": "bfloat16", "fp32": "float32", "qint8": "int8"}.get(precision, precision)
+        if precision not in CPU_PRECISIONS:
+            print(f"   ⚠️  Unknown CPU precision {cpu_precision!r}, using float32")
+            return "float32"
+        if precision == "bfloat16" and not _cpu_supports_bf16():
+            print("   ⚠️  bfloat16 not supported on this CPU, using float32")
+            return "float32"
+        return precision
+
+    def _quantize_dynamic_int8(self):
+        """Swap Linear layers for dynamically quantized int8 versions (CPU only)"""
+        before = self._estimate_model_size()
+        start = time.time()
+        try:
+            self.model = torch.ao.quantization.quantize_dynamic(
+                self.model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+        except Exception as e:
+            self.cpu_precision = "float32"
+            print(f"   ⚠️  int8 quantization not available: {e}")
+            return
+        print(f"   🔧 Dynamic int8 quantization: ~{before} → ~{self._estimate_model_size()} "
+              f"({time.time() - start:.1f}s)")
+
+    def _prepare_prefix_cache(self):
+        """Run PROMPT_PREFIX through the model once and keep its past_key_values"""
+        try:
+            start = time.time()
+            inputs = self._tokenize(self.PROMPT_PREFIX)
+            with torch.inference_mode():
+                outputs = self.model(**inputs, use_cache=True)
+            self._prefix_ids = inputs["input_ids"][0]
+            self._prefix_cache = outputs.past_key_values
+            print(f"   🧩 Prompt prefix cached: {len(self._prefix_ids)} tokens "
+                  f"({time.time() - start:.2f}s)")
+        except Exception as e:
+            self._prefix_ids = None
+            self._prefix_cache = None
+            print(f"   ⚠️  Prompt prefix cache not available: {e}")
+
+    def _prepare_speculative(self, speculative, torch_dtype):
+        """Set up the generate() arguments for speculative decoding"""
+        try:
+            if speculative.startswith("prompt_lookup"):
+                _, _, tokens = speculative.partition(":")
+                self._speculative_kwargs = {
+                    "prompt_lookup_num_tokens": int(tokens or PROMPT_LOOKUP_TOKENS)
+                }
+                # Prompt-lookup drafts are only verified under greedy decoding
+                self.fast_generation_config.do_sample = False
+                print(f"   🔮 Speculative decoding: prompt lookup "
+                      f"({self._speculative_kwargs['prompt_lookup_num_tokens']} tokens, greedy)")
+            else:
+                draft = AutoModelForCausalLM.from_pretrained(
+                    speculative, torch_dtype=torch_dtype, low_cpu_mem_usage=True
+                ).to(self.device)
+                draft.eval()
+                self._speculative_kwargs = {"assistant_model": draft}
+                print(f"   🔮 Speculative decoding: draft model {speculative}")
+            self.speculative = speculative
+        except Exception as e:
+            self._speculative_kwargs = {}
+            print(f"   ⚠️  Speculative decoding not available: {e}")
+
+    def _prefix_cache_for(self, inputs):
+        """
+        A private copy of the prefix KV cache if these (single-prompt)
+        inputs start with exactly the cached prefix tokens, else None so
+        generate encodes the whole prompt
+        """
+        if self._prefix_cache is None:
+            return None
+        input_ids = inputs["input_ids"]
+        n = len(self._prefix_ids)
+        if input_ids.shape[0] != 1 or input_ids.shape[1] <= n:
+            return None
+        if not torch.equal(input_ids[0, :n], self._prefix_ids):
+            return None
+        # generate() appends to the cache it is given
+        return copy.deepcopy(self._prefix_cache)
+
     def _estimate_model_size(self):
         """Estimate model size in memory"""
         try:
             param_size = sum(p.numel() * p.element_size() for p in self.model.parameters())
             buffer_size = sum(b.numel() * b.element_size() for b in self.model.buffers())
+            # Dynamically quantized layers keep packed weights outside parameters()
+            for module in self.model.modules():
+                packed = getattr(module, "_packed_params", None)
+                if packed is not None and not isinstance(packed, torch.nn.Module):
+                    for tensor in module._weight_bias():
+                        if tensor is not None:
+                            param_size += tensor.numel() * tensor.element_size()
             size_mb = (param_size + buffer_size) / (1024**2)
             if size_mb < 1024:
                 return f"{size_mb:.0f}MB"
@@ -120,72 +524,74 @@ class LocalGenAIReasoner:
         except:
             return "unknown"
 
-    def generate_reasoning(self, plaintiff, defendant, evidence, verdict):
-        """
-        Generate reasoning with optimized speed (<30s target)
-        """
+    def generate_reasoning_detailed(self, plaintiff, defendant, evidence, verdict, deadline=None):
+        if deadline is not None and time.monotonic() >= deadline:
+            print("⚠️  Deadline passed before generation started")
+            return {"reasoning": None, "outcome": OUTCOME_TIMEOUT}
+        
         start_time = time.time()
         print(f"\n{'='*60}")
         print(f"⚡ GENERATING REASONING - FAST MODE")
         print(f"{'='*60}")
         
-        # Optimized prompt - shorter and more direct
-        prompt = f"""You are an AI Judge. Analyze this case and explain the verdict.
-
-Case Details:
-- Plaintiff claims: {plaintiff[:300]}...
-- Defendant argues: {defendant[:300]}...
-- Evidence: {evidence[:200] if evidence else "None"}
-- Verdict: {verdict}
-
-Provide a concise legal reasoning (2-3 paragraphs):"""
+        prompt = self._build_prompt(plaintiff, defendant, evidence, verdict)
 
         # Tokenize with optimizations
         tokenize_start = time.time()
-        inputs = self.tokenizer(
-            prompt, 
-            return_tensors="pt", 
-            truncation=True, 
-            max_length=800,  # Reduced from 1024
-            padding=False,
-            return_attention_mask=True
-        )
+        inputs = self._tokenize(prompt)
         tokenize_time = time.time() - tokenize_start
         print(f"⏱️  Tokenization: {tokenize_time:.3f}s")
         
-        # Move inputs to device
-        if self.device == "cuda":
-            inputs = {k: v.to(self.device) for k, v in inputs.items()}
-        
         # Generate with optimizations
         gen_start = time.time()
         print(f"🚀 Generating text (target: <25s)...")
         
-        with torch.inference_mode():  # Faster than no_grad
-            outputs = self.model.generate(
-                **inputs,
-                generation_config=self.fast_generation_config,
-                use_cache=True,  # Enable KV cache
-            )
+        deadline_criteria = _DeadlineCriteria(
+            [deadline], inputs["input_ids"].shape[1], self.tokenizer.eos_token_id
+        )
+        # Assisted generation manages its own cache, so the prefix cache
+        # only applies to plain decoding
+        counter = _ForwardCounter(self.model) if self._speculative_kwargs else None
+        try:
+            with torch.inference_mode():  # Faster than no_grad
+                outputs = self.model.generate(
+                    **inputs,
+                    generation_config=self.fast_generation_config,
+                    use_cache=True,  # Enable KV cache
+                    past_key_values=None if counter else self._prefix_cache_for(inputs),
+                    stopping_criteria=StoppingCriteriaList([deadline_criteria]),
+                    **self._speculative_kwargs,
+                )
+        finally:
+            if counter:
+                counter.close()
         
         gen_time = time.time() - gen_start
-        print(f"⏱️  Generation: {gen_time:.3f}s")
-        
-        # Decode
-        decode_start = time.time()
-        full_response = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
-        decode_time = time.time() - decode_start
-        print(f"⏱️  Decoding: {decode_time:.3f}s")
+        new_tokens = outputs.shape[1] - inputs["input_ids"].shape[1]
+        stats = {
+            "new_tokens": int(new_tokens),
+            "tokens_per_second": round(new_tokens / max(gen_time, 1e-6), 1),
+        }
+        print(f"⏱️  Generation: {gen_time:.3f}s ({stats['tokens_per_second']} tokens/s)")
+        if counter:
+            stats.update(self._speculative_stats(counter.lengths, inputs["input_ids"].shape[1], new_tokens))
+            print(f"🔮 Speculative: {new_tokens} tokens in {stats['forward_passes']} forward passes, "
+                  f"{stats['accepted_tokens']}/{stats['drafted_tokens']} drafted tokens accepted "
+                  f"({stats['acceptance_rate']:.0%})")
         
-        # Extract reasoning
+        # Decode and extract reasoning
         extract_start = time.time()
-        reasoning = self._extract_reasoning_fast(prompt, full_response)
+        result = self._reasoning_result(
+            prompt, outputs[0], inputs["input_ids"].shape[1], deadline_criteria.cut[0]
+        )
+        result["stats"] = stats
+        reasoning = result["reasoning"] or ""
         extract_time = time.time() - extract_start
-        print(f"⏱️  Extraction: {extract_time:.3f}s")
+        print(f"⏱️  Decoding + extraction: {extract_time:.3f}s")
         
         total_time = time.time() - start_time
         print(f"\n{'='*60}")
-        print(f"✅ COMPLETE - Total time: {total_time:.2f}s")
+        print(f"✅ {result['outcome'].upper()} - Total time: {total_time:.2f}s")
         print(f"   📊 Reasoning length: {len(reasoning)} chars")
         if total_time < 30:
             print(f"   🎯 SUCCESS: Under 30s target!")
@@ -193,74 +599,152 @@ Provide a concise legal reasoning (2-3 paragraphs):"""
             print(f"   ⚠️  Over 30s target by {total_time-30:.1f}s")
         print(f"{'='*60}\n")
         
-        return reasoning.strip()
+        return result
 
-    def _extract_reasoning_fast(self, prompt, full_response):
-        """Fast reasoning extraction"""
+    @staticmethod
+    def _speculative_stats(lengths, prompt_length, new_tokens):
+        """
+        Acceptance estimate from the token counts fed to each forward pass:
+        every pass after the first feeds its last token plus the drafted
+        candidates, and yields the accepted candidates plus one token
+        """
+        passes = len(lengths)
+        drafted = 0
+        if lengths:
+            drafted = max(0, lengths[0] - prompt_length) + sum(length - 1 for length in lengths[1:])
+        accepted = max(0, min(drafted, new_tokens - passes))
+        return {
+            "forward_passes": passes,
+            "drafted_tokens": drafted,
+            "accepted_tokens": accepted,
+            "acceptance_rate": round(accepted / drafted, 3) if drafted else 0.0,
+        }
+
+    def _reasoning_result(self, prompt, output_ids, input_length, cut_short):
+        """Turn one generated sequence into {"reasoning", "outcome", "tokens"}"""
+        full_response = new_text = None
+        if cut_short:
+            new_text = self.tokenizer.decode(output_ids[input_length:], skip_special_tokens=True)
+        else:
+            full_response = self.tokenizer.decode(output_ids, skip_special_tokens=True)
+        result = self._result_from_text(prompt, full_response, new_text, cut_short)
+        # Batch rows are padded to the longest one; padding is not generated text
+        result["tokens"] = int((output_ids[input_length:] != self.tokenizer.pad_token_id).sum())
+        return result
+
+    def _tokenize(self, prompt):
+        """Tokenize a prompt (or a list of prompts, left-padded) and move it to the model's device"""
+        inputs = self.tokenizer(
+            prompt, 
+            return_tensors="pt", 
+            truncation=True, 
+            max_length=MAX_PROMPT_TOKENS,
+            padding=not isinstance(prompt, str),
+            return_attention_mask=True
+        )
         
-        # Method 1: Remove the exact prompt
-        if full_response.startswith(prompt.strip()):
-            reasoning = full_response[len(prompt.strip()):].strip()
-            if reasoning and len(reasoning) > 20:
-                return self._clean_reasoning(reasoning)
+        # Move inputs to device
+        if self.device == "cuda":
+            inputs = {k: v.to(self.device) for k, v in inputs.items()}
+        return inputs
+
+    def generate_reasoning_batch(self, cases, deadlines=None, on_result=None):
+        start_time = time.time()
+        print(f"\n⚡ GENERATING REASONING - BATCH OF {len(cases)}")
         
-        # Method 2: Split after key phrases
-        key_phrases = [
-            "Provide a concise legal reasoning (2-3 paragraphs):",
-            "Provide a concise legal reasoning",
-            "legal reasoning",
-            "reasoning:"
-        ]
+        prompts = [self._build_prompt(*case) for case in cases]
+        inputs = self._tokenize(prompts)
+        input_length = inputs["input_ids"].shape[1]
         
-        for phrase in key_phrases:
-            if phrase in full_response:
-                parts = full_response.split(phrase, 1)
-                if len(parts) > 1 and parts[1].strip():
-                    return self._clean_reasoning(parts[1].strip())
-        
-        # Method 3: Take the last meaningful part
-        if len(full_response) > 300:
-            reasoning = full_response[-500:].strip()
-            return self._clean_reasoning(reasoning)
-        
-        # Fallback: Return cleaned full response
-        return self._clean_reasoning(full_response)
-
-    def _clean_reasoning(self, reasoning):
-        """Clean and format reasoning quickly"""
-        
-        # Remove common prompt fragments
-        fragments = [
-            "or this verdict, including",
-            "this verdict, including",
-            "including logical",
-            "and emotional empathy.",
-            "emotional empathy.",
-            "concise legal reasoning",
-            "(2-3 paragraphs):",
-        ]
+        def report_cut(row, output_ids):
+            on_result(row, self._reasoning_result(prompts[row], output_ids, input_length, True))
         
-        for fragment in fragments:
-            if reasoning.lower().startswith(fragment.lower()):
-                reasoning = reasoning[len(fragment):].strip()
+        # Each row stops at its own deadline; the others keep decoding
+        deadline_criteria = _DeadlineCriteria(
+            deadlines or [None] * len(cases), input_length, self.tokenizer.eos_token_id,
+            on_cut=report_cut if on_result else None
+        )
         
-        # Strip leading punctuation/whitespace only
-        reasoning = reasoning.lstrip(':-•*\n\r\t ')
-        reasoning = reasoning.strip()
+        with torch.inference_mode():
+            outputs = self.model.generate(
+                **inputs,
+                generation_config=self.fast_generation_config,
+                use_cache=True,
+                stopping_criteria=StoppingCriteriaList([deadline_criteria]),
+            )
+        gen_time = time.time() - start_time
         
-        # Ensure minimum quality
-        if not reasoning or len(reasoning) < 20:
-            return self._generate_fallback_reasoning()
+        # Left padding decodes away (pad is a special token), so each row
+        # goes through the same extraction as a single request
+        results = [
+            self._reasoning_result(prompt, output_ids, input_length, cut)
+            for prompt, output_ids, cut in zip(prompts, outputs, deadline_criteria.cut)
+        ]
         
-        return reasoning
-
-    def _generate_fallback_reasoning(self):
-        """Quick fallback reasoning"""
-        return """The court has carefully analyzed the evidence and arguments presented by both parties. 
-
-Based on the plaintiff's claims and the defendant's defense, the verdict is supported by the preponderance of evidence and applicable legal principles. The decision takes into account both the factual circumstances and the equitable considerations of the case.
+        generated = outputs[:, input_length:]
+        new_tokens = int((generated != self.tokenizer.pad_token_id).sum())
+        print(f"✅ Batch complete - Generation: {gen_time:.2f}s "
+              f"(~{new_tokens / max(gen_time, 1e-6):.1f} tokens/s across {len(cases)} prompts)\n")
+        return results
 
-This judgment seeks to provide a fair resolution that serves the interests of justice while considering the rights and positions of all parties involved."""
+    def generate_reasoning_stream(self, plaintiff, defendant, evidence, verdict, deadline=None):
+        if deadline is not None and time.monotonic() >= deadline:
+            print("⚠️  Deadline passed before streaming started")
+            return {"outcome": OUTCOME_TIMEOUT}
+        
+        start_time = time.time()
+        print(f"\n⚡ STREAMING REASONING")
+        
+        prompt = self._build_prompt(plaintiff, defendant, evidence, verdict)
+        inputs = self._tokenize(prompt)
+        deadline_criteria = _DeadlineCriteria(
+            [deadline], inputs["input_ids"].shape[1], self.tokenizer.eos_token_id
+        )
+        
+        # skip_prompt means only new text arrives, so the prompt never
+        # needs to be stripped from the stream
+        streamer = TextIteratorStreamer(
+            self.tokenizer, skip_prompt=True, skip_special_tokens=True
+        )
+        cancel = threading.Event()
+        failure = []
+        new_tokens = []
+        
+        def run():
+            try:
+                with torch.inference_mode():
+                    outputs = self.model.generate(
+                        **inputs,
+                        generation_config=self.fast_generation_config,
+                        use_cache=True,
+                        streamer=streamer,
+                        past_key_values=self._prefix_cache_for(inputs),
+                        stopping_criteria=StoppingCriteriaList(
+                            [_CancelCriteria(cancel), deadline_criteria]
+                        ),
+                    )
+                new_tokens.append(int(outputs.shape[1] - inputs["input_ids"].shape[1]))
+            except Exception as e:
+                failure.append(e)
+                streamer.end()
+        
+        worker = threading.Thread(target=run, name="genai-stream", daemon=True)
+        worker.start()
+        
+        def pieces():
+            yield from streamer
+            worker.join()
+            if failure:
+                raise failure[0]
+        
+        try:
+            yield from self._clean_stream(pieces(), start_time)
+        finally:
+            cancel.set()
+        
+        outcome = OUTCOME_TRUNCATED if deadline_criteria.cut[0] else OUTCOME_COMPLETE
+        print(f"✅ Stream {outcome} - Total time: {time.time() - start_time:.2f}s\n")
+        return {"outcome": outcome, "tokens": new_tokens[0] if new_tokens else None}
 
     def generate_reasoning_ultra_fast(self, plaintiff, defendant, evidence, verdict):
         """
@@ -0,0 +1,111 @@
+"""
+GenAI Loader - Background Loading for the Local Reasoner
+Builds the LLM reasoner in a daemon thread so the API can serve requests
+(and pass health checks) while the model is still downloading/loading
+"""
+
+import threading
+import time
+
+# Readiness states reported on /health
+IDLE = "idle"
+LOADING = "loading"
+WARMING = "warming"
+READY = "ready"
+FAILED = "failed"
+DISABLED = "disabled"
+
+
+class ReasonerLoader:
+    """
+    Lazily builds a reasoner with ``factory`` on a background thread.
+
+    Callers use get(timeout) to wait a bounded time for the reasoner and
+    receive None if it is not ready yet (or failed), so they can fall back
+    to rule-based reasoning instead of blocking. An optional ``warm_up``
+    callable is run on the built reasoner before it is reported ready, so
+    the first real request does not pay the cold-start cost.
+    """
+
+    def __init__(self, factory, enabled=True, warm_up=None):
+        self._factory = factory
+        self._warm_up = warm_up
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._thread = None
+
+        self.state = IDLE if enabled else DISABLED
+        self.reasoner = None
+        self.error = None
+        self.started_at = None
+        self.loaded_at = None
+        self.ready_at = None
+        self.warmup = None
+
+        if not enabled:
+            self._done.set()
+
+    def start(self):
+        """Start loading in the background (no-op if already started)"""
+        with self._lock:
+            if self.state != IDLE:
+                return
+            self.state = LOADING
+            self.started_at = time.time()
+            self._thread = threading.Thread(
+                target=self._load, name="genai-loader", daemon=True
+            )
+            self._thread.start()
+
+    def _load(self):
+        try:
+            reasoner = self._factory()
+            self.loaded_at = time.time()
+            if self._warm_up is not None:
+                self.state = WARMING
+                try:
+                    self.warmup = self._warm_up(reasoner)
+                except Exception as e:
+                    # A failed warm-up only costs the first request its speed
+                    print(f"⚠️  GenAI warm-up failed: {e}")
+            self.reasoner = reasoner
+            self.ready_at = time.time()
+            self.state = READY
+            print(f"🧠 Local GenAI Reasoner ready after {self.ready_at - self.started_at:.1f}s")
+        except Exception as e:
+            self.error = str(e)
+            self.state = FAILED
+            print(f"⚠️  Local GenAI Reasoner not available: {e}")
+        finally:
+            self._done.set()
+
+    @property
+    def ready(self):
+        return self.state == READY
+
+    def get(self, timeout=0):
+        """
+        Return the reasoner, waiting at most ``timeout`` seconds for it to
+        finish loading. Returns None while loading, on failure or if disabled.
+        """
+        if self.state == IDLE:
+            self.start()
+        if timeout and not self._done.is_set():
+            self._done.wait(timeout)
+        return self.reasoner if self.state == READY else None
+
+    def status(self):
+        """Readiness summary for health endpoints"""
+        status = {"state": self.state}
+        if self.state == LOADING:
+            status["loading_seconds"] = round(time.time() - self.started_at, 1)
+        elif self.state == WARMING:
+            status["load_seconds"] = round(self.loaded_at - self.started_at, 1)
+            status["warming_seconds"] = round(time.time() - self.loaded_at, 1)
+        elif self.state == READY:
+            status["load_seconds"] = round(self.ready_at - self.started_at, 1)
+            if self.warmup:
+                status["warmup"] = self.warmup
+        elif self.state == FAILED:
+            status["error"] = self.error
+        return status
@@ -0,0 +1,130 @@
+"""
+Hashing TF-IDF Vectorizer - Constant-Memory Text Features
+Feature hashing (no vocabulary) followed by IDF weights learned at training
+time, so the serving side only needs the hashing settings and one fixed-size
+IDF vector, whatever the size of the training corpus
+"""
+
+import numpy as np
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+
+# 2**18 buckets keep collisions rare for a legal-text bigram vocabulary
+# while the IDF vector stays at 2 MB
+DEFAULT_N_FEATURES = 2 ** 18
+
+
+class HashingTfidfVectorizer(TransformerMixin, BaseEstimator):
+    """
+    Drop-in alternative to TfidfVectorizer: token and n-gram counts are
+    hashed into ``n_features`` buckets, then weighted with an IDF vector
+    fitted on the training texts and normalized like TfidfVectorizer.
+
+    min_df / max_df work like TfidfVectorizer's, per bucket: buckets seen
+    in too few or too many training documents (and buckets never seen,
+    like out-of-vocabulary terms) get an IDF weight of 0.
+
+    With use_idf=False there is nothing to fit: the vectorizer is fully
+    stateless (normalized hashed counts), as incremental training needs.
+    """
+
+    def __init__(self, n_features=DEFAULT_N_FEATURES, ngram_range=(1, 1), stop_words=None,
+                 lowercase=True, token_pattern=r"(?u)\b\w\w+\b", strip_accents=None,
+                 norm="l2", smooth_idf=True, sublinear_tf=False, binary=False,
+                 min_df=1, max_df=1.0, use_idf=True):
+        self.n_features = n_features
+        self.ngram_range = ngram_range
+        self.stop_words = stop_words
+        self.lowercase = lowercase
+        self.token_pattern = token_pattern
+        self.strip_accents = strip_accents
+        self.norm = norm
+        self.smooth_idf = smooth_idf
+        self.sublinear_tf = sublinear_tf
+        self.binary = binary
+        self.min_df = min_df
+        self.max_df = max_df
+        self.use_idf = use_idf
+
+    def _hasher(self):
+        # Unsigned raw counts: signs and normalization come after IDF weighting
+        return HashingVectorizer(
+            n_features=self.n_features,
+            ngram_range=tuple(self.ngram_range),
+            stop_words=self.stop_words,
+            lowercase=self.lowercase,
+            token_pattern=self.token_pattern,
+            strip_accents=self.strip_accents,
+            binary=self.binary,
+            alternate_sign=False,
+            norm=None,
+            dtype=np.float64,
+        )
+
+    def _transformer(self):
+        return TfidfTransformer(
+            norm=self.norm, use_idf=self.use_idf, smooth_idf=self.smooth_idf,
+            sublinear_tf=self.sublinear_tf
+        )
+
+    def count(self, raw_documents):
+        """
+        Raw hashed term counts. Stateless, so a corpus can be counted in
+        chunks and the stacked counts passed to fit_counts / weigh without
+        holding all the texts at once.
+        """
+        return self._hasher().transform(raw_documents)
+
+    def fit_counts(self, counts):
+        """Fit the IDF weights from count()'s output"""
+        if not self.use_idf:
+            self._tfidf = self._transformer().fit(counts)
+            return self
+        documents = counts.shape[0]
+        tfidf = self._transformer().fit(counts)
+        # Each row of the CSR matrix lists a bucket at most once
+        df = np.bincount(counts.indices, minlength=self.n_features)
+        min_df = self.min_df if isinstance(self.min_df, int) else self.min_df * documents
+        max_df = self.max_df if isinstance(self.max_df, int) else self.max_df * documents
+        idf = tfidf.idf_.copy()
+        idf[(df < max(min_df, 1)) | (df > max_df)] = 0.0
+        tfidf.idf_ = idf
+        self._tfidf = tfidf
+        return self
+
+    def weigh(self, counts):
+        """TF-IDF weighted, normalized features from count()'s output"""
+        X = self._tfidf.transform(counts, copy=False)
+        X.eliminate_zeros()
+        return X
+
+    def fit(self, raw_documents, y=None):
+        return self.fit_counts(self.count(raw_documents))
+
+    def fit_transform(self, raw_documents, y=None):
+        counts = self.count(raw_documents)
+        self.fit_counts(counts)
+        return self.weigh(counts)
+
+    def transform(self, raw_documents):
+        counts = self.count(raw_documents)
+        if not self.use_idf and not hasattr(self, "_tfidf"):
+            self.fit_counts(counts)
+        return self.weigh(counts)
+
+    @property
+    def idf_(self):
+        return self._tfidf.idf_
+
+    @idf_.setter
+    def idf_(self, value):
+        """Restore a fitted IDF vector (e.g. from a model bundle)"""
+        value = np.asarray(value, dtype=np.float64)
+        if value.shape != (self.n_features,):
+            raise ValueError(f"IDF vector has shape {value.shape}, expected ({self.n_features},)")
+        self._tfidf = self._transformer()
+        self._tfidf.idf_ = value
+
+    @property
+    def n_features_out_(self):
+        return self.n_features
@@ -0,0 +1,153 @@
+"""
+Hybrid Verdict Features - Text Plus Structured Evidence Columns
+One sparse design matrix per batch of cases: the TF-IDF (or hashing)
+columns of the case text, then the dataset's evidence flags and scores,
+then the preprocessing.extract_features heuristics. A linear model over it
+costs no more to serve than the text-only one
+"""
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.base import BaseEstimator, TransformerMixin
+
+from .dataset_loader import EVIDENCE_COLUMNS, SCORE_COLUMNS, TEXT_COLUMNS, batch_text
+from .preprocessing import FEATURE_NAMES, extract_features_batch
+
+STRUCTURED_COLUMNS = EVIDENCE_COLUMNS + SCORE_COLUMNS
+HEURISTIC_NAMES = FEATURE_NAMES
+
+
+def case_frame(cases):
+    """
+    DataFrame of cases given as a DataFrame, dicts, or (plaintiff,
+    defendant, evidence[, structured]) tuples where structured is a dict of
+    STRUCTURED_COLUMNS values
+    """
+    if isinstance(cases, pd.DataFrame):
+        return cases
+    records = []
+    for case in cases:
+        if isinstance(case, dict):
+            records.append(case)
+        else:
+            record = dict(zip(TEXT_COLUMNS, case[:3]))
+            if len(case) > 3 and case[3]:
+                record.update(case[3])
+            records.append(record)
+    frame = pd.DataFrame.from_records(records)
+    for column in TEXT_COLUMNS:
+        frame[column] = frame[column].fillna("").astype(str) if column in frame else ""
+    return frame
+
+
+def heuristic_matrix(frame):
+    """(n_cases, len(HEURISTIC_NAMES)) extract_features values on normalized text"""
+    return extract_features_batch(frame["plaintiff"], frame["defendant"], frame["evidence"])
+
+
+def _nonzero(scale):
+    """Per-column scale with 1 where a column is all zero"""
+    return np.where(scale > 0, scale, 1.0)
+
+
+class HybridVectorizer(TransformerMixin, BaseEstimator):
+    """
+    Stacks text_vectorizer's output with STRUCTURED_COLUMNS and the
+    extract_features heuristics, each scaled into [0, 1] by its training
+    maximum so no column dwarfs the TF-IDF weights.
+
+    Input is anything case_frame accepts. Structured columns a case does
+    not have (API requests usually send text only) are filled with the
+    training mean, so a missing value pushes the verdict neither way.
+    """
+
+    def __init__(self, text_vectorizer=None, structured_columns=STRUCTURED_COLUMNS,
+                 heuristics=True):
+        self.text_vectorizer = text_vectorizer
+        self.structured_columns = structured_columns
+        self.heuristics = heuristics
+
+    def _structured(self, frame):
+        values = np.full((len(frame), len(self.structured_columns)), np.nan)
+        for i, column in enumerate(self.structured_columns):
+            if column in frame:
+                values[:, i] = pd.to_numeric(frame[column], errors="coerce")
+        return values
+
+    def _dense_columns(self, frame, heuristics=None):
+        values = self._structured(frame)
+        missing = np.isnan(values)
+        values[missing] = np.take(self.structured_fill_, np.nonzero(missing)[1])
+        blocks = [values / self.structured_scale_]
+        if self.heuristics:
+            if heuristics is None:
+                heuristics = heuristic_matrix(frame)
+            blocks.append(heuristics / self.heuristic_scale_)
+        return np.hstack(blocks)
+
+    def fit(self, cases, y=None):
+        return self.fit_batches([cases])
+
+    def fit_batches(self, batches):
+        """
+        Fit on an iterable of case batches (anything case_frame accepts)
+        holding one batch at a time: the text vectorizer is fitted on a
+        generator of the batches' texts, and the structured means and
+        column maxima are accumulated as it consumes them
+        """
+        n_structured = len(self.structured_columns)
+        totals, counts = np.zeros(n_structured), np.zeros(n_structured)
+        observed_max = np.zeros(n_structured)
+        missing = np.zeros(n_structured, dtype=bool)
+        heuristic_max = np.zeros(len(HEURISTIC_NAMES))
+
+        def texts():
+            nonlocal totals, counts, observed_max, missing, heuristic_max
+            for batch in batches:
+                frame = case_frame(batch)
+                values = self._structured(frame)
+                present = ~np.isnan(values)
+                known = np.where(present, values, 0.0)
+                totals = totals + known.sum(axis=0)
+                counts = counts + present.sum(axis=0)
+                observed_max = np.maximum(observed_max, np.abs(known).max(axis=0, initial=0))
+                missing = missing | ~present.all(axis=0)
+                if self.heuristics:
+                    heuristics = np.abs(heuristic_matrix(frame))
+                    heuristic_max = np.maximum(heuristic_max, heuristics.max(axis=0, initial=0))
+                yield from batch_text(frame)
+
+        self.text_vectorizer.fit(texts())
+        with np.errstate(invalid="ignore", divide="ignore"):
+            self.structured_fill_ = np.nan_to_num(totals / counts)
+        # Maxima of the values transform sees, i.e. with missing ones filled
+        scale = np.where(missing, np.maximum(observed_max, np.abs(self.structured_fill_)),
+                         observed_max)
+        self.structured_scale_ = _nonzero(scale)
+        if self.heuristics:
+            self.heuristic_scale_ = _nonzero(heuristic_max)
+        return self
+
+    def fit_transform(self, cases, y=None):
+        frame = case_frame(cases)
+        return self.fit_batches([frame]).transform(frame)
+
+    def transform(self, cases):
+        frame = case_frame(cases)
+        text = self.text_vectorizer.transform(batch_text(frame))
+        return sp.hstack([text, sp.csr_matrix(self._dense_columns(frame))], format="csr")
+
+    @property
+    def dense_names(self):
+        """Names of the columns after the text features"""
+        names = list(self.structured_columns)
+        if self.heuristics:
+            names += list(HEURISTIC_NAMES)
+        return names
+
+    @property
+    def n_features_out_(self):
+        vocabulary = getattr(self.text_vectorizer, "vocabulary_", None)
+        text = len(vocabulary) if vocabulary else self.text_vectorizer.n_features_out_
+        return text + len(self.dense_names)
@@ -0,0 +1,269 @@
+"""
+Inference Server - One Model Process Shared by Many HTTP Workers
+Runs the reasoner (and its micro-batcher) in a single dedicated process
+and serves it over a local socket, so gunicorn can run several HTTP
+workers without each loading its own copy of the LLM.
+
+Messages are pickled, so whoever can connect can run code in either
+process: the transport is a Unix socket (owner-only permissions) by
+default, TCP is accepted on loopback addresses only, and every connection
+must pass the shared-authkey handshake
+"""
+
+import ipaddress
+import os
+import stat
+import threading
+import time
+from multiprocessing.connection import Client, Listener
+
+from .batching import DEADLINE_GRACE
+from .genai_loader import DISABLED, FAILED, READY
+
+# Seconds between readiness checks while the server is still loading
+POLL_INTERVAL = 1.0
+
+
+def _is_loopback(host):
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def parse_address(address):
+    """
+    A Unix socket path, or ("host", port) for "host:port". TCP is only
+    allowed on loopback hosts (127.0.0.1, ::1, localhost); anything else
+    raises ValueError.
+    """
+    host, sep, port = address.rpartition(":")
+    if sep and port.isdigit() and "/" not in address:
+        host = host.strip("[]") or "127.0.0.1"
+        if not _is_loopback(host):
+            raise ValueError(f"inference server address {address!r} is not a loopback host; "
+                             f"use a Unix socket path or 127.0.0.1:<port>")
+        return (host, int(port))
+    return address
+
+
+def _authkey(authkey):
+    if isinstance(authkey, str):
+        authkey = authkey.encode("utf-8")
+    if not authkey:
+        raise ValueError("the inference server needs an authkey (GENAI_INFERENCE_AUTHKEY)")
+    return authkey
+
+
+class InferenceServer:
+    """
+    Serves the reasoner behind a ReasonerLoader on ``address``.
+
+    Every request is one connection carrying one (op, args) message:
+    "status" (loader readiness and model info), "generate" (a
+    generate_reasoning_detailed result), "stream" (a sequence of text
+    chunks) and "stats" (batching metrics). Requests from all HTTP workers
+    go through the same MicroBatcher, so they are batched together too.
+    """
+
+    def __init__(self, loader, address, authkey):
+        self.loader = loader
+        self.address = parse_address(address)
+        self.authkey = _authkey(authkey)
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._active = 0
+        self._served = 0
+
+    def serve_forever(self):
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            # Stale socket from a previous run
+            if stat.S_ISSOCK(os.stat(self.address).st_mode):
+                os.remove(self.address)
+        listener = Listener(self.address, authkey=self.authkey)
+        if isinstance(self.address, str):
+            os.chmod(self.address, stat.S_IRUSR | stat.S_IWUSR)
+        print(f"🔌 GenAI inference server listening on {self.address} (pid {os.getpid()})")
+        try:
+            while True:
+                try:
+                    conn = listener.accept()
+                except Exception as e:
+                    # Failed handshake (e.g. wrong authkey); keep serving
+                    print(f"⚠️  Rejected inference connection: {e}")
+                    continue
+                threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+        finally:
+            listener.close()
+
+    def _handle(self, conn):
+        with self._lock:
+            self._active += 1
+        try:
+            op, args = conn.recv()
+            if op == "status":
+                conn.send(("ok", self._status()))
+                return
+
+            batcher = self.loader.get()
+            if batcher is None:
+                conn.send(("error", f"reasoner is {self.loader.state}"))
+                return
+            if op == "generate":
+                case, budget = args
+                deadline = None if budget is None else time.monotonic() + budget
+                conn.send(("ok", batcher.generate_reasoning_detailed(*case, deadline=deadline)))
+            elif op == "stream":
+                self._stream(conn, batcher, args)
+            elif op == "stats":
+                stats = batcher.stats()
+                stats["server"] = self._server_stats()
+                conn.send(("ok", stats))
+            else:
+                conn.send(("error", f"unknown op {op!r}"))
+        except (EOFError, OSError):
+            pass
+        except Exception as e:
+            print(f"⚠️  Inference request failed: {e}")
+            try:
+                conn.send(("error", str(e)))
+            except OSError:
+                pass
+        finally:
+            conn.close()
+            with self._lock:
+                self._active -= 1
+                self._served += 1
+
+    def _stream(self, conn, batcher, args):
+        case, budget = args
+        deadline = None if budget is None else time.monotonic() + budget
+        stream = batcher.generate_reasoning_stream(*case, deadline=deadline)
+        try:
+            while True:
+                try:
+                    text = next(stream)
+                except StopIteration as done:
+                    conn.send(("done", done.value))
+                    return
+                # Raises once the client has gone away, which stops generation
+                conn.send(("token", text))
+        finally:
+            stream.close()
+
+    def _status(self):
+        status = self.loader.status()
+        if self.loader.ready:
+            reasoner = self.loader.reasoner.reasoner
+            config = reasoner.fast_generation_config
+            status["model_name"] = reasoner.model_name
+            status["generation_config"] = config.to_dict() if hasattr(config, "to_dict") else dict(config)
+            status["speculative"] = reasoner.speculative
+        return status
+
+    def _server_stats(self):
+        with self._lock:
+            return {
+                "pid": os.getpid(),
+                "uptime_seconds": round(time.time() - self.started_at, 1),
+                "active_requests": self._active,
+                "requests_served": self._served,
+            }
+
+
+class InferenceClient:
+    """
+    Stand-in for a MicroBatcher in an HTTP worker that forwards reasoning
+    calls to an InferenceServer. Creating it waits (up to
+    ``connect_timeout`` seconds) for the server to finish loading.
+    """
+
+    def __init__(self, address, authkey, connect_timeout=300):
+        self.address = parse_address(address)
+        self.authkey = _authkey(authkey)
+
+        give_up_at = time.monotonic() + connect_timeout
+        while True:
+            try:
+                status = self._call("status")
+            except OSError as e:
+                status = {"state": "unreachable", "error": str(e)}
+            if status["state"] == READY:
+                break
+            if status["state"] in (FAILED, DISABLED):
+                raise RuntimeError(f"inference server reasoner is {status['state']}: "
+                                   f"{status.get('error', '')}")
+            if time.monotonic() >= give_up_at:
+                raise TimeoutError(f"inference server at {address} not ready "
+                                   f"after {connect_timeout}s ({status['state']})")
+            time.sleep(POLL_INTERVAL)
+
+        self.model_name = status["model_name"]
+        self.fast_generation_config = status["generation_config"]
+        self.speculative = status["speculative"]
+        self.warmup = status.get("warmup")
+        print(f"🔌 Connected to GenAI inference server at {address} ({self.model_name})")
+
+    @property
+    def reasoner(self):
+        # Model name and generation settings live on the client itself
+        # (MicroBatcher exposes them as batcher.reasoner.*)
+        return self
+
+    def _connect(self):
+        return Client(self.address, authkey=self.authkey)
+
+    def _call(self, op, args=None, timeout=None):
+        conn = self._connect()
+        try:
+            conn.send((op, args))
+            if timeout is not None and not conn.poll(timeout):
+                raise TimeoutError(f"inference server did not answer within {timeout:.1f}s")
+            kind, payload = conn.recv()
+        finally:
+            conn.close()
+        if kind == "error":
+            raise RuntimeError(f"inference server: {payload}")
+        return payload
+
+    def generate_reasoning(self, plaintiff, defendant, evidence, verdict):
+        return self.generate_reasoning_detailed(plaintiff, defendant, evidence, verdict)["reasoning"]
+
+    def generate_reasoning_detailed(self, plaintiff, defendant, evidence, verdict, deadline=None):
+        """Same contract as MicroBatcher.generate_reasoning_detailed"""
+        case = (plaintiff, defendant, evidence, verdict)
+        if deadline is None:
+            return self._call("generate", (case, None))
+        # Deadlines travel as a remaining budget; monotonic clocks are per process
+        budget = max(0.0, deadline - time.monotonic())
+        try:
+            return self._call("generate", (case, budget), timeout=budget + DEADLINE_GRACE)
+        except TimeoutError:
+            return {"reasoning": None, "outcome": "timeout"}
+
+    def generate_reasoning_stream(self, plaintiff, defendant, evidence, verdict, deadline=None):
+        case = (plaintiff, defendant, evidence, verdict)
+        budget = None if deadline is None else max(0.0, deadline - time.monotonic())
+        conn = self._connect()
+        try:
+            conn.send(("stream", (case, budget)))
+            while True:
+                kind, payload = conn.recv()
+                if kind == "token":
+                    yield payload
+                elif kind == "done":
+                    return payload
+                else:
+                    raise RuntimeError(f"inference server: {payload}")
+        finally:
+            # Closing early makes the server stop generating
+            conn.close()
+
+    def stats(self):
+        """Batching metrics of the shared server (for health endpoints)"""
+        try:
+            return self._call("stats", timeout=5)
+        except Exception as e:
+            return {"error": str(e)}
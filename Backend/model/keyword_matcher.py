@@ -0,0 +1,84 @@
+"""
+Keyword Matcher - Single-Pass Multi-Keyword Scanner
+Precompiles a keyword vocabulary once so each text is tokenized a single
+time instead of being rescanned once per keyword
+"""
+
+_NO_HITS = (frozenset(), frozenset(), frozenset())
+
+
+class KeywordMatcher:
+    """
+    Finds every keyword of a fixed vocabulary occurring in a text.
+
+    Matching uses plain substring semantics (same as ``keyword in text``),
+    so "legal" still matches inside "illegal". The text is split on single
+    spaces once and only its unique tokens are examined:
+
+    - a one-word keyword occurs in the text exactly when it occurs in a token
+    - a phrase must end a token with its first word, start a token with its
+      last word and have its middle words as whole tokens; only phrases that
+      pass this check are confirmed against the full text
+
+    What each token contains is memoized, so vocabulary shared across cases
+    is only examined once.
+    """
+
+    def __init__(self, keywords, memo_size=50000):
+        self.keywords = frozenset(keyword for keyword in keywords if keyword)
+        self.memo_size = memo_size
+
+        self._words = tuple(sorted(k for k in self.keywords if ' ' not in k))
+
+        # Phrases grouped by first word, checked only when a token ends with it
+        self._phrases = {}
+        for phrase in sorted(k for k in self.keywords if ' ' in k):
+            parts = phrase.split(' ')
+            self._phrases.setdefault(parts[0], []).append(
+                (phrase, parts[-1], frozenset(parts[1:-1]))
+            )
+        self._tails = frozenset(
+            tail for group in self._phrases.values() for _, tail, _ in group
+        )
+
+        self._memo = {}
+
+    def _token_hits(self, token):
+        """(words inside, phrase heads it ends with, phrase tails it starts with)"""
+        hits = (
+            frozenset(filter(token.__contains__, self._words)),
+            frozenset(head for head in self._phrases if token.endswith(head)),
+            frozenset(tail for tail in self._tails if token.startswith(tail)),
+        )
+        if not any(hits):
+            hits = _NO_HITS
+
+        if len(self._memo) >= self.memo_size:
+            self._memo.clear()
+        self._memo[token] = hits
+        return hits
+
+    def scan(self, text):
+        """Return the frozenset of keywords found anywhere in text"""
+        if not text:
+            return frozenset()
+
+        tokens = set(text.split(' '))
+        memo_get = self._memo.get
+
+        words = set()
+        heads = set()
+        tails = set()
+        for token in tokens:
+            token_hits = memo_get(token) or self._token_hits(token)
+            if token_hits is not _NO_HITS:
+                words |= token_hits[0]
+                heads |= token_hits[1]
+                tails |= token_hits[2]
+
+        for head in heads:
+            for phrase, tail, middle in self._phrases[head]:
+                if tail in tails and middle <= tokens and phrase in text:
+                    words.add(phrase)
+
+        return frozenset(words)
@@ -0,0 +1,273 @@
+"""
+Online Verdict Training - Incremental Updates From Adjudicated Cases
+Keeps the verdict classifier current without retraining from scratch: newly
+adjudicated cases are appended to a JSONL log, and each run feeds only the
+cases added since the last run to an SGD logistic-regression model through
+partial_fit. Features come from a stateless hashing vectorizer (no
+vocabulary or IDF to refit), so an update costs time proportional to the
+new cases, not to the archive. Every update is published with
+artifacts.publish_bundle; the API picks it up through the "current" symlink.
+
+Cases reach the log through the API (POST /cases/adjudicated) or --append.
+
+Usage (from Backend/):
+    python -m model.online_training --bootstrap     # first model, from the dataset CSV
+    python -m model.online_training                 # learn newly logged cases, publish
+    python -m model.online_training --append decided.jsonl   # log cases, then learn them
+    python -m model.online_training --watch 60      # ...every 60 seconds
+Serve it with VERDICT_BUNDLE_PATH=model/models/online/current.
+"""
+
+import argparse
+import fcntl
+import json
+import os
+import time
+
+import numpy as np
+from sklearn.linear_model import SGDClassifier
+
+from .artifacts import CURRENT_LINK, load_bundle, load_checkpoint, publish_bundle
+from .dataset_loader import CLASSES, load_frame, normalize_verdict
+from .hashing_vectorizer import DEFAULT_N_FEATURES, HashingTfidfVectorizer
+from .predictor import case_text
+
+DEFAULT_ROOT = os.path.join(os.path.dirname(__file__), "models", "online")
+DEFAULT_LOG = os.path.join(os.path.dirname(__file__), "..", "data", "adjudicated_cases.jsonl")
+DEFAULT_DATASET = os.path.join(os.path.dirname(__file__), "..", "data",
+                               "indian_constitution_legal_dataset.csv")
+
+# Log lines per partial_fit call
+BATCH_SIZE = 1000
+
+
+def make_vectorizer(n_features=DEFAULT_N_FEATURES):
+    """Stateless features: hashed unigrams + bigrams, sublinear tf, l2 norm, no IDF"""
+    return HashingTfidfVectorizer(n_features=n_features, ngram_range=(1, 2),
+                                  stop_words="english", sublinear_tf=True, use_idf=False)
+
+
+def make_model():
+    return SGDClassifier(loss="log_loss", alpha=1e-4, random_state=42)
+
+
+def append_cases(cases, log_path=DEFAULT_LOG):
+    """
+    Append adjudicated cases ({"plaintiff", "defendant", "evidence",
+    "verdict"} dicts) to the log. One locked write per call, so concurrent
+    writers never interleave lines and the trainer never sees half a batch.
+    """
+    lines = "".join(json.dumps(case, ensure_ascii=False) + "\n" for case in cases)
+    if not lines:
+        return
+    os.makedirs(os.path.dirname(os.path.abspath(log_path)), exist_ok=True)
+    with open(log_path, "a", encoding="utf-8") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            f.write(lines)
+            f.flush()
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def append_dataset(path, log_path=DEFAULT_LOG):
+    """Append the cases of a dataset file (any format dataset_loader reads); returns how many"""
+    df = load_frame(path)
+    columns = [column for column in ("case_id", "plaintiff", "defendant", "evidence", "verdict")
+               if column in df.columns]
+    append_cases(df[columns].to_dict("records"), log_path)
+    print(f"✅ Logged {len(df)} adjudicated cases from {os.path.basename(path)}")
+    return len(df)
+
+
+def read_log(log_path, offset=0, batch_size=BATCH_SIZE):
+    """
+    Yield (texts, labels, end_offset) batches of the cases logged after
+    byte ``offset``. A trailing line without a newline is still being
+    written and is left for the next run; malformed lines are skipped.
+    """
+    texts, labels, skipped = [], [], 0
+    with open(log_path, "rb") as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            offset += len(line)
+            try:
+                record = json.loads(line)
+                label = normalize_verdict(record.get("verdict") or record.get("winner"))
+                text = case_text(record["plaintiff"], record["defendant"], record.get("evidence", ""))
+            except (ValueError, KeyError, AttributeError):
+                label = None
+            if label is None:
+                skipped += 1
+                continue
+            texts.append(text)
+            labels.append(label)
+            if len(texts) >= batch_size:
+                yield texts, labels, offset
+                texts, labels = [], []
+    if skipped:
+        print(f"⚠️  Skipped {skipped} malformed log lines in {log_path}")
+    if texts or skipped:
+        yield texts, labels, offset
+
+
+class OnlineTrainer:
+    """
+    SGD model + stateless vectorizer and how far into the log they have
+    learned. ``seen`` counts cases learned so far and ``progressive_*``
+    tracks test-then-train accuracy: each logged case is predicted before
+    the model learns from it, an honest running estimate that needs no
+    held-out split.
+    """
+
+    def __init__(self, model=None, vectorizer=None, log_offset=0, seen=0,
+                 progressive_correct=0, progressive_total=0):
+        self.model = model if model is not None else make_model()
+        self.vectorizer = vectorizer if vectorizer is not None else make_vectorizer()
+        self.log_offset = log_offset
+        self.seen = seen
+        self.progressive_correct = progressive_correct
+        self.progressive_total = progressive_total
+
+    @classmethod
+    def resume(cls, root=DEFAULT_ROOT):
+        """Trainer state from the current published bundle, or None if there is none"""
+        current = os.path.join(root, CURRENT_LINK)
+        if not os.path.exists(current):
+            return None
+        _, vectorizer, _ = load_bundle(current)
+        state = load_checkpoint(current)
+        if state is None:
+            raise ValueError(f"{current} has no training checkpoint")
+        return cls(vectorizer=vectorizer, **state)
+
+    def checkpoint(self):
+        return {
+            "model": self.model,
+            "log_offset": self.log_offset,
+            "seen": self.seen,
+            "progressive_correct": self.progressive_correct,
+            "progressive_total": self.progressive_total,
+        }
+
+    @property
+    def progressive_accuracy(self):
+        if not self.progressive_total:
+            return None
+        return round(self.progressive_correct / self.progressive_total, 4)
+
+    def learn(self, texts, labels, score=True):
+        """One partial_fit step; with score, predict the batch first"""
+        X = self.vectorizer.transform(texts)
+        y = np.asarray(labels)
+        if score and self.seen:
+            self.progressive_correct += int((self.model.predict(X) == y).sum())
+            self.progressive_total += len(y)
+        self.model.partial_fit(X, y, classes=np.asarray(CLASSES))
+        self.seen += len(y)
+
+    def bootstrap(self, texts, labels, epochs=5, seed=42):
+        """Several shuffled passes over an initial labelled set"""
+        texts, labels = list(texts), np.asarray(labels)
+        rng = np.random.default_rng(seed)
+        for _ in range(epochs):
+            order = rng.permutation(len(texts))
+            for start in range(0, len(order), BATCH_SIZE):
+                rows = order[start:start + BATCH_SIZE]
+                self.learn([texts[i] for i in rows], labels[rows], score=False)
+        # The seen counter is about distinct cases, not passes
+        self.seen = len(texts)
+
+    def consume(self, log_path=DEFAULT_LOG):
+        """Learn every case logged since the last run; returns how many"""
+        if not os.path.exists(log_path):
+            return 0
+        if os.path.getsize(log_path) < self.log_offset:
+            print(f"⚠️  {log_path} is shorter than the last read position; reading it from the start")
+            self.log_offset = 0
+        learned = 0
+        for texts, labels, offset in read_log(log_path, self.log_offset):
+            if texts:
+                self.learn(texts, labels)
+                learned += len(texts)
+            self.log_offset = offset
+        return learned
+
+    def publish(self, root=DEFAULT_ROOT, keep=3, **metadata):
+        return publish_bundle(
+            self.model, self.vectorizer, root,
+            metadata={
+                "model_name": "Online SGD Logistic Regression",
+                "features": "hashing",
+                "samples": self.seen,
+                "log_offset": self.log_offset,
+                "progressive_accuracy": self.progressive_accuracy,
+                "progressive_samples": self.progressive_total,
+                **metadata,
+            },
+            checkpoint=self.checkpoint(), keep=keep,
+        )
+
+
+def bootstrap_from_dataset(path=DEFAULT_DATASET, epochs=5, n_features=DEFAULT_N_FEATURES):
+    """A trainer fitted on a dataset file (any format dataset_loader reads)"""
+    df = load_frame(path)
+    texts = [case_text(p, d, e) for p, d, e in zip(df["plaintiff"], df["defendant"], df["evidence"])]
+    trainer = OnlineTrainer(vectorizer=make_vectorizer(n_features))
+    trainer.bootstrap(texts, df["verdict"].tolist(), epochs=epochs)
+    print(f"✅ Bootstrapped from {os.path.basename(path)}: {len(texts)} cases, {epochs} epochs")
+    return trainer
+
+
+def update(root=DEFAULT_ROOT, log_path=DEFAULT_LOG, keep=3):
+    """Learn newly logged cases and publish if there were any; returns the count"""
+    trainer = OnlineTrainer.resume(root)
+    if trainer is None:
+        raise FileNotFoundError(f"no published model in {root}; run with --bootstrap first")
+    start = time.perf_counter()
+    offset = trainer.log_offset
+    learned = trainer.consume(log_path)
+    if trainer.log_offset == offset:
+        return 0
+    trainer.publish(root, keep)
+    print(f"✅ Learned {learned} new cases in {time.perf_counter() - start:.2f}s "
+          f"(progressive accuracy {trainer.progressive_accuracy})")
+    return learned
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incrementally train the verdict model")
+    parser.add_argument("--root", default=DEFAULT_ROOT,
+                        help="Directory holding versions/ and the current symlink")
+    parser.add_argument("--log", default=DEFAULT_LOG, help="JSONL log of adjudicated cases")
+    parser.add_argument("--append", metavar="FILE",
+                        help="Log the decided cases in FILE (.csv, .json or .jsonl) before learning")
+    parser.add_argument("--bootstrap", action="store_true",
+                        help="Start a new model from --dataset (replaces the current one)")
+    parser.add_argument("--dataset", default=DEFAULT_DATASET)
+    parser.add_argument("--epochs", type=int, default=5, help="Passes over --dataset when bootstrapping")
+    parser.add_argument("--hash-features", type=int, default=DEFAULT_N_FEATURES)
+    parser.add_argument("--keep", type=int, default=3, help="Published versions to keep")
+    parser.add_argument("--watch", type=float, default=0,
+                        help="Check the log again every N seconds (0: run once)")
+    args = parser.parse_args()
+
+    if args.append:
+        append_dataset(args.append, args.log)
+    if args.bootstrap:
+        trainer = bootstrap_from_dataset(args.dataset, args.epochs, args.hash_features)
+        # Cases already in the log are learned on top, test-then-train
+        trainer.consume(args.log)
+        trainer.publish(args.root, args.keep, dataset=os.path.basename(args.dataset))
+
+    while True:
+        update(args.root, args.log, args.keep)
+        if not args.watch:
+            break
+        time.sleep(args.watch)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,408 @@
+"""
+ONNX GenAI Reasoner - ONNX Runtime Backend for Legal Reasoning
+Serves a bundle written by model.export_onnx with onnxruntime, the
+tokenizers library and numpy only (no torch/transformers at runtime),
+keeping the LocalGenAIReasoner interface
+"""
+
+try:
+    import json
+    import os
+    import time
+
+    import numpy as np
+    import onnxruntime as ort
+    from tokenizers import Tokenizer
+except ImportError as e:
+    raise ImportError(
+        "Missing required libraries for the ONNX GenAI Reasoner. "
+        "Please install them with: pip install onnxruntime tokenizers numpy"
+    ) from e
+
+from .export_onnx import CONFIG_FILE, DEFAULT_OUTPUT
+from .reasoner_base import (
+    GENERATION_DEFAULTS,
+    MAX_PROMPT_TOKENS,
+    OUTCOME_COMPLETE,
+    OUTCOME_TIMEOUT,
+    OUTCOME_TRUNCATED,
+    BaseReasoner,
+)
+
+
+class OnnxGenerationConfig:
+    """
+    Sampling settings of the ONNX backend (the GenerationConfig fields the
+    reasoner uses); attributes can be changed like GenerationConfig's
+    """
+
+    def __init__(self, pad_token_id, eos_token_id, precision, **settings):
+        for name, value in {**GENERATION_DEFAULTS, **settings}.items():
+            setattr(self, name, value)
+        self.pad_token_id = pad_token_id
+        self.eos_token_id = eos_token_id
+        self.precision = precision
+
+    def to_dict(self):
+        settings = {name: getattr(self, name) for name in GENERATION_DEFAULTS}
+        settings.update(pad_token_id=self.pad_token_id, eos_token_id=self.eos_token_id,
+                        backend=f"onnx-{self.precision}")
+        return settings
+
+
+def _clean_up_tokenization(text):
+    """Same spacing cleanup as transformers' clean_up_tokenization_spaces"""
+    for before, after in ((" .", "."), (" ?", "?"), (" !", "!"), (" ,", ","),
+                          (" ' ", "'"), (" n't", "n't"), (" 'm", "'m"),
+                          (" 's", "'s"), (" 've", "'ve"), (" 're", "'re")):
+        text = text.replace(before, after)
+    return text
+
+
+class OnnxGenAIReasoner(BaseReasoner):
+    """ONNX Runtime reasoning backend (greedy or sampled decoding with a KV cache)"""
+
+    def __init__(self, model_dir=DEFAULT_OUTPUT, num_threads=None, interop_threads=None,
+                 prefix_cache=True, speculative=None):
+        """
+        Load an exported reasoner bundle
+
+        Args:
+            model_dir: Directory written by python -m model.export_onnx
+            num_threads: ONNX Runtime intra-op threads (default: runtime's choice)
+            interop_threads: ONNX Runtime inter-op threads (default: runtime's choice)
+            prefix_cache: If True, precompute the KV cache of PROMPT_PREFIX so
+                requests only encode their case-specific suffix
+            speculative: Not supported by this backend (ignored with a warning)
+        """
+        self._prefix_ids = None
+        self._prefix_cache = None
+        try:
+            print(f"\n{'='*60}")
+            print(f"⚡ ONNX GenAI REASONER - FAST MODE")
+            print(f"{'='*60}")
+            print(f"⏳ Loading ONNX bundle: {model_dir}")
+
+            start_time = time.time()
+
+            with open(os.path.join(model_dir, CONFIG_FILE)) as f:
+                self.settings = json.load(f)
+            self.model_name = self.settings["model_name"]
+            self.cpu_precision = self.settings["precision"]
+            self.model_path = os.path.join(model_dir, self.settings["model_file"])
+
+            self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, "tokenizer.json"))
+            self.tokenizer.no_padding()
+            self.tokenizer.enable_truncation(MAX_PROMPT_TOKENS)
+
+            options = ort.SessionOptions()
+            options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            if num_threads:
+                options.intra_op_num_threads = int(num_threads)
+            if interop_threads:
+                options.inter_op_num_threads = int(interop_threads)
+            self.session = ort.InferenceSession(
+                self.model_path, sess_options=options, providers=["CPUExecutionProvider"]
+            )
+            self._past_names = [
+                f"past_key_values.{i}.{kv}"
+                for i in range(self.settings["num_layers"]) for kv in ("key", "value")
+            ]
+            print(f"   🖥️  Using ONNX Runtime {ort.__version__} "
+                  f"({self.cpu_precision}, {num_threads or 'default'} threads)")
+
+            self.fast_generation_config = OnnxGenerationConfig(
+                pad_token_id=self.settings["pad_token_id"],
+                eos_token_id=self.settings["eos_token_id"],
+                precision=self.cpu_precision,
+                **self.settings.get("generation", {}),
+            )
+            self._rng = np.random.default_rng()
+
+            if prefix_cache:
+                self._prepare_prefix_cache()
+
+            if speculative:
+                print(f"   ⚠️  Speculative decoding is not supported by the ONNX backend")
+
+            load_time = time.time() - start_time
+            print(f"✅ Model loaded successfully in {load_time:.2f}s")
+            print(f"   📊 Model size: ~{self._estimate_model_size()}")
+            print(f"{'='*60}\n")
+
+        except Exception as e:
+            print(f"❌ Failed to load ONNX GenAI model: {e}")
+            raise
+
+    def _prepare_prefix_cache(self):
+        """Run PROMPT_PREFIX through the graph once and keep its KV cache"""
+        try:
+            start = time.time()
+            ids = self._encode(self.PROMPT_PREFIX)
+            _, past = self._forward(
+                np.array([ids], dtype=np.int64), np.ones((1, len(ids)), dtype=np.int64),
+                np.arange(len(ids), dtype=np.int64)[None], self._empty_past(1)
+            )
+            self._prefix_ids = ids
+            self._prefix_cache = past
+            print(f"   🧩 Prompt prefix cached: {len(ids)} tokens ({time.time() - start:.2f}s)")
+        except Exception as e:
+            self._prefix_ids = None
+            self._prefix_cache = None
+            print(f"   ⚠️  Prompt prefix cache not available: {e}")
+
+    def _estimate_model_size(self):
+        """Size of the graph and its weights on disk"""
+        try:
+            size = os.path.getsize(self.model_path)
+            if os.path.exists(self.model_path + ".data"):
+                size += os.path.getsize(self.model_path + ".data")
+            size_mb = size / (1024**2)
+            if size_mb < 1024:
+                return f"{size_mb:.0f}MB"
+            return f"{size_mb/1024:.1f}GB"
+        except OSError:
+            return "unknown"
+
+    def _encode(self, prompt):
+        return self.tokenizer.encode(prompt).ids
+
+    def _decode(self, ids):
+        text = self.tokenizer.decode(list(ids), skip_special_tokens=True)
+        if self.settings.get("clean_up_tokenization_spaces"):
+            text = _clean_up_tokenization(text)
+        return text
+
+    def _empty_past(self, batch):
+        shape = (batch, self.settings["num_kv_heads"], 0, self.settings["head_dim"])
+        return [np.zeros(shape, dtype=np.float32) for _ in self._past_names]
+
+    def _forward(self, input_ids, attention_mask, position_ids, past):
+        feeds = {
+            "input_ids": input_ids,
+            "attention_mask": attention_mask,
+            "position_ids": position_ids,
+        }
+        feeds.update(zip(self._past_names, past))
+        outputs = self.session.run(None, feeds)
+        return outputs[0][:, -1, :], outputs[1:]
+
+    def _next_tokens(self, logits, sequences):
+        """Pick each row's next token, applying the processors in transformers' order"""
+        config = self.fast_generation_config
+        logits = logits.astype(np.float32)
+
+        if config.repetition_penalty and config.repetition_penalty != 1.0:
+            for row, tokens in enumerate(sequences):
+                seen = np.unique(tokens)
+                scores = logits[row, seen]
+                logits[row, seen] = np.where(
+                    scores < 0, scores * config.repetition_penalty, scores / config.repetition_penalty
+                )
+
+        if not config.do_sample:
+            return logits.argmax(axis=-1)
+
+        if config.temperature and config.temperature != 1.0:
+            logits = logits / config.temperature
+        if config.top_k and config.top_k < logits.shape[-1]:
+            kth = np.partition(logits, -config.top_k, axis=-1)[:, -config.top_k][:, None]
+            logits = np.where(logits < kth, -np.inf, logits)
+        if config.top_p is not None and config.top_p < 1.0:
+            order = np.argsort(logits, axis=-1)
+            ordered = np.take_along_axis(logits, order, axis=-1)
+            probs = np.exp(ordered - ordered[:, -1:])
+            cumulative = np.cumsum(probs / probs.sum(axis=-1, keepdims=True), axis=-1)
+            remove = cumulative <= 1 - config.top_p
+            remove[:, -1] = False
+            np.put_along_axis(logits, order, np.where(remove, -np.inf, ordered), axis=-1)
+
+        probs = np.exp(logits - logits.max(axis=-1, keepdims=True))
+        probs /= probs.sum(axis=-1, keepdims=True)
+        return np.array([self._rng.choice(len(p), p=p) for p in probs])
+
+    def _decode_steps(self, prompt_ids, finished):
+        """
+        Left-pad a batch of tokenized prompts into one graph input and yield
+        each row's next token once per forward pass (at most max_new_tokens
+        times). Rows the caller marks in ``finished`` get pad tokens from
+        then on, as in transformers' generate loop.
+        """
+        config = self.fast_generation_config
+        pad = config.pad_token_id
+        batch = len(prompt_ids)
+        width = max(len(ids) for ids in prompt_ids)
+
+        input_ids = np.full((batch, width), pad, dtype=np.int64)
+        attention_mask = np.zeros((batch, width), dtype=np.int64)
+        for row, ids in enumerate(prompt_ids):
+            input_ids[row, width - len(ids):] = ids
+            attention_mask[row, width - len(ids):] = 1
+        position_ids = np.where(attention_mask == 0, 1, attention_mask.cumsum(-1) - 1)
+        sequences = [list(row) for row in input_ids]
+
+        # A single prompt starting with PROMPT_PREFIX only encodes its suffix
+        past = self._empty_past(batch)
+        n = len(self._prefix_ids) if self._prefix_cache is not None else 0
+        if n and batch == 1 and width > n and list(prompt_ids[0][:n]) == self._prefix_ids:
+            past = self._prefix_cache
+            input_ids, position_ids = input_ids[:, n:], position_ids[:, n:]
+
+        for _ in range(config.max_new_tokens):
+            logits, past = self._forward(input_ids, attention_mask, position_ids, past)
+            tokens = self._next_tokens(logits, sequences)
+            tokens = [pad if done else int(token) for token, done in zip(tokens, finished)]
+            for sequence, token in zip(sequences, tokens):
+                sequence.append(token)
+            yield tokens
+
+            input_ids = np.array([[token] for token in tokens], dtype=np.int64)
+            attention_mask = np.concatenate(
+                [attention_mask, np.ones((batch, 1), dtype=np.int64)], axis=-1
+            )
+            position_ids = position_ids[:, -1:] + 1
+
+    def _generate(self, prompt_ids, deadlines=None, on_cut=None):
+        """
+        Decode a batch of tokenized prompts. Rows stop at EOS, max_new_tokens
+        or, like _DeadlineCriteria, when the next step would overrun their
+        deadline; a row stopped before producing EOS is reported as cut
+        (and through on_cut). Returns (new token lists, cut flags).
+        """
+        eos = self.fast_generation_config.eos_token_id
+        batch = len(prompt_ids)
+        deadlines = deadlines or [None] * batch
+        generated = [[] for _ in range(batch)]
+        finished = [False] * batch
+        cut = [False] * batch
+
+        last = time.monotonic()
+        for tokens in self._decode_steps(prompt_ids, finished):
+            now = time.monotonic()
+            step, last = now - last, now
+            for row, token in enumerate(tokens):
+                if finished[row]:
+                    continue
+                generated[row].append(token)
+                if token == eos:
+                    finished[row] = True
+                elif deadlines[row] is not None and now + step >= deadlines[row]:
+                    finished[row] = cut[row] = True
+                    if on_cut is not None:
+                        on_cut(row, generated[row])
+            if all(finished):
+                break
+        return generated, cut
+
+    def _reasoning_result(self, prompt, prompt_ids, new_ids, cut_short):
+        """Turn one generated sequence into {"reasoning", "outcome", "tokens"}"""
+        full_response = new_text = None
+        if cut_short:
+            new_text = self._decode(new_ids)
+        else:
+            full_response = self._decode(list(prompt_ids) + list(new_ids))
+        result = self._result_from_text(prompt, full_response, new_text, cut_short)
+        result["tokens"] = len(new_ids)
+        return result
+
+    def generate_reasoning_detailed(self, plaintiff, defendant, evidence, verdict, deadline=None):
+        if deadline is not None and time.monotonic() >= deadline:
+            print("⚠️  Deadline passed before generation started")
+            return {"reasoning": None, "outcome": OUTCOME_TIMEOUT}
+
+        start_time = time.time()
+        print(f"\n⚡ GENERATING REASONING - ONNX RUNTIME")
+
+        prompt = self._build_prompt(plaintiff, defendant, evidence, verdict)
+        prompt_ids = self._encode(prompt)
+
+        gen_start = time.time()
+        generated, cut = self._generate([prompt_ids], [deadline])
+        gen_time = time.time() - gen_start
+        new_tokens = len(generated[0])
+        stats = {
+            "new_tokens": new_tokens,
+            "tokens_per_second": round(new_tokens / max(gen_time, 1e-6), 1),
+        }
+        print(f"⏱️  Generation: {gen_time:.3f}s ({stats['tokens_per_second']} tokens/s)")
+
+        result = self._reasoning_result(prompt, prompt_ids, generated[0], cut[0])
+        result["stats"] = stats
+        print(f"✅ {result['outcome'].upper()} - Total time: {time.time() - start_time:.2f}s\n")
+        return result
+
+    def generate_reasoning_batch(self, cases, deadlines=None, on_result=None):
+        start_time = time.time()
+        print(f"\n⚡ GENERATING REASONING - ONNX BATCH OF {len(cases)}")
+
+        prompts = [self._build_prompt(*case) for case in cases]
+        prompt_ids = [self._encode(prompt) for prompt in prompts]
+
+        def report_cut(row, new_ids):
+            on_result(row, self._reasoning_result(prompts[row], prompt_ids[row], new_ids, True))
+
+        generated, cut = self._generate(
+            prompt_ids, deadlines, on_cut=report_cut if on_result else None
+        )
+        gen_time = time.time() - start_time
+
+        results = [
+            self._reasoning_result(*row)
+            for row in zip(prompts, prompt_ids, generated, cut)
+        ]
+        new_tokens = sum(len(ids) for ids in generated)
+        print(f"✅ Batch complete - Generation: {gen_time:.2f}s "
+              f"(~{new_tokens / max(gen_time, 1e-6):.1f} tokens/s across {len(cases)} prompts)\n")
+        return results
+
+    def generate_reasoning_stream(self, plaintiff, defendant, evidence, verdict, deadline=None):
+        if deadline is not None and time.monotonic() >= deadline:
+            print("⚠️  Deadline passed before streaming started")
+            return {"outcome": OUTCOME_TIMEOUT}
+
+        start_time = time.time()
+        print(f"\n⚡ STREAMING REASONING - ONNX RUNTIME")
+
+        prompt_ids = self._encode(self._build_prompt(plaintiff, defendant, evidence, verdict))
+        result = {"outcome": OUTCOME_COMPLETE}
+        yield from self._clean_stream(self._stream_text(prompt_ids, deadline, result), start_time)
+
+        print(f"✅ Stream {result['outcome']} - Total time: {time.time() - start_time:.2f}s\n")
+        return result
+
+    def _stream_text(self, prompt_ids, deadline=None, result=None):
+        """
+        Yield decoded text as tokens are generated, held back to the last
+        space (like TextIteratorStreamer) so words are not split mid-token.
+        One forward pass runs per resumed iteration, so closing the
+        consumer stops generation; like _generate, decoding also stops when
+        the next step would overrun the deadline. The outcome and number of
+        tokens generated are recorded in result
+        """
+        eos = self.fast_generation_config.eos_token_id
+        tokens = []
+        printed = 0
+        last = time.monotonic()
+        for (token,) in self._decode_steps([prompt_ids], [False]):
+            if token == eos:
+                break
+            tokens.append(token)
+            now = time.monotonic()
+            step, last = now - last, now
+            if deadline is not None and now + step >= deadline:
+                if result is not None:
+                    result["outcome"] = OUTCOME_TRUNCATED
+                break
+            text = self._decode(tokens)
+            if text.endswith("\ufffd"):
+                continue
+            end = len(text) if text.endswith("\n") else text.rfind(" ") + 1
+            if end > printed:
+                yield text[printed:end]
+                printed = end
+
+        if result is not None:
+            result["tokens"] = len(tokens)
+        text = self._decode(tokens)
+        if len(text) > printed:
+            yield text[printed:]
@@ -1,10 +1,244 @@
+"""
+Verdict Predictor - Batched TF-IDF Inference
+Loads the vectorizer and classifier once (from a verdict bundle, or legacy
+pickles) and scores many cases with a single sparse transform and a single
+predict_proba call, so verdicts come with the classifier's probability as
+their confidence. Bundles published by online training are picked up
+without a restart
+"""
+
+import os
+import threading
+import time
+
 import joblib
+import numpy as np
+
+from .artifacts import DEFAULT_BUNDLE, MANIFEST_FILE, is_hybrid, load_bundle, vectorizer_features
+
+# Legacy pickles written by older train_indian_legal_model.py runs "for API access"
+DEFAULT_MODEL_PATH = os.path.join(os.path.dirname(__file__), '..', 'model.pkl')
+DEFAULT_VECTORIZER_PATH = os.path.join(os.path.dirname(__file__), '..', 'vectorizer.pkl')
+
+
+def case_text(plaintiff, defendant, evidence):
+    """The text a case is vectorized from (same as the training scripts)"""
+    return f"{plaintiff} {defendant} {evidence}"
+
+
+class VerdictPredictor:
+    """
+    TF-IDF vectorizer + classifier pair loaded from disk.
+
+    Cases are (plaintiff, defendant, evidence) tuples, like
+    ai_judge.ml_predict_verdicts takes, optionally followed by a dict of
+    structured evidence columns (used by hybrid models, ignored otherwise).
+    ``source`` says where the pair was loaded from and ``manifest`` is the
+    bundle manifest (None for pickles).
+    """
+
+    def __init__(self, model, vectorizer, source=None, manifest=None):
+        self.model = model
+        self.vectorizer = vectorizer
+        self.source = source
+        self.manifest = manifest
+        self.classes = [str(label) for label in self.model.classes_]
+
+        features = getattr(self.model, "n_features_in_", None)
+        produced = vectorizer_features(self.vectorizer)
+        if features is not None and produced and features != produced:
+            raise ValueError(
+                f"{source}: model expects {features} features but the vectorizer produces {produced}"
+            )
+        if self.structured_columns:
+            print(f"⚠️  Verdict model {source} leans on structured evidence columns "
+                  f"({', '.join(self.structured_columns)}); cases without them get training "
+                  f"means, which pushes most of them to the same verdict")
+
+    @classmethod
+    def from_bundle(cls, bundle_dir=DEFAULT_BUNDLE, verify=True):
+        """Load a bundle written by model.artifacts.save_bundle"""
+        model, vectorizer, manifest = load_bundle(bundle_dir, verify=verify)
+        return cls(model, vectorizer, os.path.abspath(bundle_dir), manifest)
+
+    @classmethod
+    def from_pickles(cls, model_path=DEFAULT_MODEL_PATH, vectorizer_path=DEFAULT_VECTORIZER_PATH):
+        """Load a joblib/pickle classifier and vectorizer pair"""
+        model_path = os.path.abspath(model_path)
+        return cls(joblib.load(model_path), joblib.load(vectorizer_path), model_path)
+
+    @property
+    def version(self):
+        """Content hash of the bundle (None for pickles)"""
+        return self.manifest["content_hash"] if self.manifest else None
+
+    def info(self):
+        """Where the model came from, for health endpoints"""
+        info = {"source": self.source, "classes": self.classes, "version": self.version}
+        if self.manifest:
+            info["created_at"] = self.manifest["created_at"]
+            info["model_type"] = self.manifest["model"]["type"]
+            info["training"] = self.manifest["training"]
+        return info
+
+    @property
+    def structured_columns(self):
+        """Structured evidence columns the model was trained on (empty for text-only models)"""
+        if is_hybrid(self.vectorizer):
+            return tuple(self.vectorizer.structured_columns)
+        return ()
+
+    def missing_structured(self, structured):
+        """structured_columns not given in a case's structured dict (None counts as missing)"""
+        structured = structured or {}
+        return [column for column in self.structured_columns if structured.get(column) is None]
+
+    def transform(self, cases):
+        """One sparse TF-IDF (or hybrid) matrix for all cases"""
+        if is_hybrid(self.vectorizer):
+            # Takes the case tuples as they are (see hybrid_features.case_frame)
+            return self.vectorizer.transform(cases)
+        return self.vectorizer.transform([case_text(*case[:3]) for case in cases])
+
+    def predict_proba(self, cases):
+        """(n_cases, n_classes) probabilities, columns ordered like self.classes"""
+        X = self.transform(cases)
+        if hasattr(self.model, "predict_proba"):
+            return self.model.predict_proba(X)
+        # Classifiers without probabilities get all the mass on their prediction
+        predictions = self.model.predict(X)
+        return (predictions[:, None] == self.model.classes_[None, :]).astype(float)
+
+    def predict_batch(self, cases):
+        """
+        Score many cases at once. Returns one {"winner", "confidence",
+        "probabilities"} dict per case in input order; confidence is the
+        winner's probability. For a hybrid model, a case missing structured
+        columns also gets "imputed": the columns filled with training means.
+        """
+        if not cases:
+            return []
+        probabilities = self.predict_proba(cases)
+        best = np.argmax(probabilities, axis=1)
+        results = [
+            {
+                "winner": self.classes[index],
+                "confidence": round(float(row[index]), 4),
+                "probabilities": {
+                    label: round(float(p), 4) for label, p in zip(self.classes, row)
+                },
+            }
+            for row, index in zip(probabilities, best)
+        ]
+        if self.structured_columns:
+            for case, result in zip(cases, results):
+                if not isinstance(case, dict):
+                    case = case[3] if len(case) > 3 else None
+                imputed = self.missing_structured(case)
+                if imputed:
+                    result["imputed"] = imputed
+        return results
+
+    def predict(self, plaintiff, defendant, evidence, structured=None):
+        """predict_batch for a single case"""
+        return self.predict_batch([(plaintiff, defendant, evidence, structured)])[0]
+
+
+class PredictorBook:
+    """
+    Holds the current VerdictPredictor for a bundle path and swaps in a
+    freshly loaded one when the path resolves somewhere else, i.e. when
+    publish_bundle repoints a "current" symlink. Bundles are never
+    rewritten in place, so a plain directory is loaded once. Like
+    rule_engine.RuleBook, readers always get a complete predictor and a
+    bundle that fails to load is reported while the previous predictor
+    keeps serving.
+    """
+
+    def __init__(self, bundle_dir, check_interval=5.0):
+        self.bundle_dir = bundle_dir
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._stamp = self._bundle_stamp()
+        # Load the resolved directory, so a publish racing with startup is
+        # picked up by the next check instead of being mistaken for this one
+        self._predictor = load_predictor(self._stamp or bundle_dir)
+        self._next_check = time.monotonic() + check_interval
+        self.loaded_at = time.time()
+        self.reloads = 0
+
+    def _bundle_stamp(self):
+        """Resolved bundle directory, or None without a bundle"""
+        resolved = os.path.realpath(self.bundle_dir)
+        return resolved if os.path.exists(os.path.join(resolved, MANIFEST_FILE)) else None
+
+    def predictor(self):
+        """Return the current predictor, reloading first if the bundle changed"""
+        if self.check_interval >= 0 and time.monotonic() >= self._next_check:
+            self._maybe_reload()
+        return self._predictor
+
+    def _maybe_reload(self):
+        # Only one thread checks; the rest keep using the current predictor
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            self._next_check = time.monotonic() + self.check_interval
+            stamp = self._bundle_stamp()
+            if stamp is not None and stamp != self._stamp:
+                # Remember the stamp even if loading fails so a broken
+                # bundle is reported once, not on every check
+                self._stamp = stamp
+                predictor = VerdictPredictor.from_bundle(stamp)
+                self._predictor = predictor
+                self.loaded_at = time.time()
+                self.reloads += 1
+                print(f"🔄 Verdict model reloaded: {stamp} (version {predictor.version[:12]})")
+        except Exception as e:
+            print(f"⚠️  Could not reload verdict bundle {self.bundle_dir}: {e}")
+        finally:
+            self._lock.release()
+
+
+_predictor_book = None
+_predictor_lock = threading.Lock()
+
+
+def load_predictor(bundle_dir=None):
+    """
+    VerdictPredictor for bundle_dir (default VERDICT_BUNDLE_PATH, else
+    model/models/verdict/current), or for the VERDICT_MODEL_PATH /
+    VERDICT_VECTORIZER_PATH pickles when no bundle has been written. A
+    bundle that fails validation is never replaced by the pickles: serving
+    a mismatched pair is worse than serving none.
+    """
+    bundle_dir = bundle_dir or os.environ.get('VERDICT_BUNDLE_PATH') or DEFAULT_BUNDLE
+    if os.path.exists(os.path.join(bundle_dir, MANIFEST_FILE)):
+        return VerdictPredictor.from_bundle(bundle_dir)
+    print(f"⚠️  No verdict bundle in {bundle_dir}; loading pickled model files")
+    return VerdictPredictor.from_pickles(
+        os.environ.get('VERDICT_MODEL_PATH') or DEFAULT_MODEL_PATH,
+        os.environ.get('VERDICT_VECTORIZER_PATH') or DEFAULT_VECTORIZER_PATH,
+    )
+
+
+def get_predictor_book():
+    """Process-wide PredictorBook for VERDICT_BUNDLE_PATH"""
+    global _predictor_book
+    if _predictor_book is None:
+        with _predictor_lock:
+            if _predictor_book is None:
+                _predictor_book = PredictorBook(
+                    os.environ.get('VERDICT_BUNDLE_PATH') or DEFAULT_BUNDLE,
+                    check_interval=float(os.environ.get('VERDICT_BUNDLE_RELOAD_INTERVAL', 5.0)),
+                )
+    return _predictor_book
+
+
+def get_predictor():
+    """Current process-wide VerdictPredictor (see load_predictor, PredictorBook)"""
+    return get_predictor_book().predictor()
 
-model = joblib.load('model.pkl')
-vectorizer = joblib.load('vectorizer.pkl')
 
 def predict_winner(plaintiff, defendant, evidence):
-    text = f"{plaintiff} {defendant} {evidence}"
-    X = vectorizer.transform([text])
-    pred = model.predict(X)[0]
-    return pred
+    return get_predictor().predict(plaintiff, defendant, evidence)["winner"]
@@ -0,0 +1,308 @@
+"""
+Reasoner Base - Backend-Independent Prompting and Cleanup
+Prompt building, answer extraction and outcome handling shared by the
+reasoner backends (PyTorch in gen_ai_reasoner, ONNX Runtime in
+onnx_reasoner); importing it does not pull in torch or transformers
+"""
+
+import re
+import time
+
+# Minimum characters of cleaned reasoning before it is used (or streamed)
+MIN_REASONING_CHARS = 20
+
+# How a generation ended (see generate_reasoning_detailed)
+OUTCOME_COMPLETE = "complete"     # model finished on its own
+OUTCOME_TRUNCATED = "truncated"   # stopped at the deadline, cut to the last sentence
+OUTCOME_TIMEOUT = "timeout"       # deadline hit before enough text was produced
+
+# Shortest partial answer worth returning when the deadline cuts generation
+MIN_PARTIAL_REASONING_CHARS = 80
+
+# Sampling settings every backend starts from
+GENERATION_DEFAULTS = {
+    "max_new_tokens": 250,  # Reduced from 400 for speed
+    "temperature": 0.7,
+    "do_sample": True,
+    "top_p": 0.9,
+    "top_k": 40,  # Reduced from 50
+    "repetition_penalty": 1.1,
+}
+
+# Longest tokenized prompt (longer prompts are truncated)
+MAX_PROMPT_TOKENS = 800  # Reduced from 1024
+
+# Synthetic cases of typical length run through the model by warm_up
+WARMUP_CASES = [
+    ("I paid the seller $500 in advance for a used laptop listed online. After payment "
+     "the seller stopped replying to messages and the laptop was never delivered. I "
+     "have asked for a refund several times over the last two months without any answer.",
+     "I shipped the laptop on time through a local courier and gave the buyer the "
+     "tracking number. The courier confirmed the delivery, so the buyer must have "
+     "received the laptop and is now trying to get the money back as well.",
+     "Bank statement showing the payment, screenshots of unanswered messages",
+     "Plaintiff"),
+    ("My neighbor's tree fell on my car during the night and smashed the windshield "
+     "and roof. I had warned them in writing last year that the tree was rotten and "
+     "leaning over my driveway, but they did nothing about it.",
+     "The tree fell during a severe storm that also damaged other houses on the street. "
+     "It was an accident caused by the weather and I could not have prevented it.",
+     "Photos of the damage, copy of the written warning letter",
+     "Defendant"),
+    ("The landlord refused to return my security deposit of two months' rent after I "
+     "moved out, even though I left the apartment clean and in the same condition as "
+     "when I moved in.",
+     "The tenant damaged the walls and the kitchen floor. The repairs cost more than the "
+     "deposit, and I have photos taken on the day the tenant moved out.",
+     "",
+     "Neutral"),
+]
+
+# New tokens decoded per warm-up call (enough to exercise the decode loop)
+WARMUP_TOKENS = 16
+
+_SENTENCE_END = re.compile(r'[.!?]["\')\]]*(?=\s|$)')
+
+
+def _trim_to_sentence(text):
+    """Cut text after its last complete sentence ("" if there is none)"""
+    ends = [match.end() for match in _SENTENCE_END.finditer(text)]
+    return text[:ends[-1]] if ends else ""
+
+
+class BaseReasoner:
+    """
+    Interface of a reasoning backend. Subclasses load a model and implement
+    generate_reasoning_detailed, generate_reasoning_batch and
+    generate_reasoning_stream on top of the helpers here.
+    """
+
+    # Prompt text the model tends to echo at the start of its answer
+    PROMPT_FRAGMENTS = [
+        "or this verdict, including",
+        "this verdict, including",
+        "including logical",
+        "and emotional empathy.",
+        "emotional empathy.",
+        "concise legal reasoning",
+        "(2-3 paragraphs):",
+    ]
+
+    # Constant start of every _build_prompt prompt; its KV cache is
+    # computed once at load time and reused by each request
+    PROMPT_PREFIX = """You are an AI Judge. Analyze this case and explain the verdict.
+
+Case Details:
+- Plaintiff claims:"""
+
+    model_name = None
+    speculative = None
+
+    def generate_reasoning(self, plaintiff, defendant, evidence, verdict):
+        """
+        Generate reasoning with optimized speed (<30s target)
+        """
+        return self.generate_reasoning_detailed(plaintiff, defendant, evidence, verdict)["reasoning"]
+
+    def generate_reasoning_detailed(self, plaintiff, defendant, evidence, verdict, deadline=None):
+        """
+        generate_reasoning with an optional wall-clock deadline
+        (time.monotonic() value). Returns {"reasoning": ..., "outcome": ...}
+        where outcome is OUTCOME_COMPLETE, OUTCOME_TRUNCATED (partial text
+        cut to its last complete sentence) or OUTCOME_TIMEOUT (reasoning is
+        None; the caller should fall back). Generated results also carry
+        "tokens" (new tokens decoded) and "stats": tokens/sec and, with
+        speculative decoding, the acceptance rate of drafted tokens.
+        """
+        raise NotImplementedError
+
+    def generate_reasoning_batch(self, cases, deadlines=None, on_result=None):
+        """
+        Generate reasoning for several cases with one batched generate call.
+        cases is a list of (plaintiff, defendant, evidence, verdict) tuples
+        and deadlines an optional per-case list like generate_reasoning_detailed's;
+        returns a {"reasoning", "outcome"} result for each case in the same order.
+        Cases cut short by their deadline are also reported early through
+        on_result(index, result) while the rest of the batch keeps going.
+        """
+        raise NotImplementedError
+
+    def generate_reasoning_stream(self, plaintiff, defendant, evidence, verdict, deadline=None):
+        """
+        Streaming version of generate_reasoning: yields reasoning text as
+        tokens are produced, with the same prompt/fragment cleanup applied
+        incrementally. Closing the generator stops generation, and so does
+        an optional deadline (like generate_reasoning_detailed's). The
+        generator returns {"outcome": ..., "tokens": ...}: OUTCOME_COMPLETE,
+        OUTCOME_TRUNCATED when the deadline cut it short, or OUTCOME_TIMEOUT
+        (nothing yielded) when the deadline had already passed; "tokens"
+        counts the new tokens decoded, as in generate_reasoning_detailed.
+        """
+        raise NotImplementedError
+
+    def warm_up(self, rounds=len(WARMUP_CASES), max_new_tokens=WARMUP_TOKENS):
+        """
+        Run synthetic cases through tokenization, prefill and a short decode
+        (one at a time, then as a batch) so allocators, kernel selection and
+        tokenizer caches are primed before real requests arrive. Returns
+        first-call vs steady-state latency.
+        """
+        if rounds <= 0:
+            return None
+        cases = [WARMUP_CASES[i % len(WARMUP_CASES)] for i in range(rounds)]
+        config = self.fast_generation_config
+        saved_tokens = config.max_new_tokens
+        config.max_new_tokens = max(1, int(max_new_tokens))
+        start = time.time()
+        print(f"🔥 Warming up reasoner ({rounds} rounds, {config.max_new_tokens} tokens each)")
+        try:
+            latencies = []
+            for case in cases:
+                call_start = time.time()
+                self.generate_reasoning_detailed(*case)
+                latencies.append(time.time() - call_start)
+            if len(cases) > 1:
+                self.generate_reasoning_batch(cases)
+        finally:
+            config.max_new_tokens = saved_tokens
+
+        steady = sorted(latencies[1:])[(len(latencies) - 1) // 2] if len(latencies) > 1 else None
+        stats = {
+            "rounds": rounds,
+            "first_call_ms": round(latencies[0] * 1000, 1),
+            "steady_state_ms": round(steady * 1000, 1) if steady is not None else None,
+            "seconds": round(time.time() - start, 2),
+        }
+        message = f"🔥 Warm-up done in {stats['seconds']:.2f}s - first call {stats['first_call_ms']:.0f}ms"
+        if steady is not None:
+            stats["cold_start_factor"] = round(latencies[0] / max(steady, 1e-6), 2)
+            message += (f", steady state {stats['steady_state_ms']:.0f}ms "
+                        f"({stats['cold_start_factor']}x)")
+        print(message)
+        return stats
+
+    def _build_prompt(self, plaintiff, defendant, evidence, verdict):
+        """Optimized prompt - shorter and more direct"""
+        return self.PROMPT_PREFIX + f""" {plaintiff[:300]}...
+- Defendant argues: {defendant[:300]}...
+- Evidence: {evidence[:200] if evidence else "None"}
+- Verdict: {verdict}
+
+Provide a concise legal reasoning (2-3 paragraphs):"""
+
+    def _result_from_text(self, prompt, full_response, new_text, cut_short):
+        """
+        Turn one generated sequence into {"reasoning", "outcome"} given its
+        decoded text with and without the prompt
+        """
+        if not cut_short:
+            reasoning = self._extract_reasoning_fast(prompt, full_response).strip()
+            return {"reasoning": reasoning, "outcome": OUTCOME_COMPLETE}
+
+        # Only new tokens were cut short; the prompt never needs stripping
+        partial, _ = self._strip_leading(new_text)
+        partial = _trim_to_sentence(partial.strip())
+        if len(partial) < MIN_PARTIAL_REASONING_CHARS:
+            return {"reasoning": None, "outcome": OUTCOME_TIMEOUT}
+        return {"reasoning": partial, "outcome": OUTCOME_TRUNCATED}
+
+    def _clean_stream(self, pieces, start_time):
+        """
+        Apply _clean_reasoning incrementally to generated text pieces,
+        yielding cleaned chunks once the start of the answer is settled
+        """
+        raw = ""        # Everything generated so far
+        pending = ""    # Trailing whitespace held back until more text arrives
+        emitted = False
+        for text in pieces:
+            if emitted:
+                text = pending + text
+                chunk = text.rstrip()
+                pending = text[len(chunk):]
+                if chunk:
+                    yield chunk
+                continue
+
+            raw += text
+            head, settled = self._strip_leading(raw)
+            if settled and len(head.strip()) >= MIN_REASONING_CHARS:
+                chunk = head.rstrip()
+                pending = head[len(chunk):]
+                emitted = True
+                print(f"⏱️  First text after {time.time() - start_time:.3f}s")
+                yield chunk
+
+        # Too little (or only prompt echo) was generated
+        if not emitted:
+            yield self._clean_reasoning(raw)
+
+    def _extract_reasoning_fast(self, prompt, full_response):
+        """Fast reasoning extraction"""
+
+        # Method 1: Remove the exact prompt
+        if full_response.startswith(prompt.strip()):
+            reasoning = full_response[len(prompt.strip()):].strip()
+            if reasoning and len(reasoning) > 20:
+                return self._clean_reasoning(reasoning)
+
+        # Method 2: Split after key phrases
+        key_phrases = [
+            "Provide a concise legal reasoning (2-3 paragraphs):",
+            "Provide a concise legal reasoning",
+            "legal reasoning",
+            "reasoning:"
+        ]
+
+        for phrase in key_phrases:
+            if phrase in full_response:
+                parts = full_response.split(phrase, 1)
+                if len(parts) > 1 and parts[1].strip():
+                    return self._clean_reasoning(parts[1].strip())
+
+        # Method 3: Take the last meaningful part
+        if len(full_response) > 300:
+            reasoning = full_response[-500:].strip()
+            return self._clean_reasoning(reasoning)
+
+        # Fallback: Return cleaned full response
+        return self._clean_reasoning(full_response)
+
+    def _clean_reasoning(self, reasoning):
+        """Clean and format reasoning quickly"""
+        reasoning, _ = self._strip_leading(reasoning)
+        reasoning = reasoning.strip()
+
+        # Ensure minimum quality
+        if not reasoning or len(reasoning) < MIN_REASONING_CHARS:
+            return self._generate_fallback_reasoning()
+
+        return reasoning
+
+    def _strip_leading(self, reasoning):
+        """
+        Remove echoed prompt fragments and leading punctuation/whitespace.
+        Also returns whether the result is settled, i.e. more text appended
+        later could not make another fragment match (used when streaming).
+        """
+        settled = True
+
+        # Remove common prompt fragments
+        for fragment in self.PROMPT_FRAGMENTS:
+            lowered = reasoning.lower()
+            if lowered.startswith(fragment.lower()):
+                reasoning = reasoning[len(fragment):].lstrip()
+            elif len(lowered) < len(fragment) and fragment.lower().startswith(lowered):
+                settled = False
+
+        # Strip leading punctuation/whitespace only
+        reasoning = reasoning.lstrip(':-•*\n\r\t ').lstrip()
+
+        return reasoning, settled and bool(reasoning)
+
+    def _generate_fallback_reasoning(self):
+        """Quick fallback reasoning"""
+        return """The court has carefully analyzed the evidence and arguments presented by both parties.
+
+Based on the plaintiff's claims and the defendant's defense, the verdict is supported by the preponderance of evidence and applicable legal principles. The decision takes into account both the factual circumstances and the equitable considerations of the case.
+
+This judgment seeks to provide a fair resolution that serves the interests of justice while considering the rights and positions of all parties involved."""
@@ -0,0 +1,197 @@
+"""
+Reasoning Cache - Content-Addressed Store for Generated Reasoning
+Keys reasoning by a hash of the normalized case, model name and generation
+config, with a bounded in-memory LRU in front of an optional SQLite file
+that survives restarts
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+def _normalize(text):
+    """Collapse whitespace so trivially different submissions share a key"""
+    return " ".join((text or "").split())
+
+
+def reasoning_key(plaintiff, defendant, evidence, verdict, model_name, generation_config=None):
+    """
+    SHA-256 over the normalized case fields, the model name and the
+    generation settings (a GenerationConfig or plain dict)
+    """
+    if hasattr(generation_config, "to_dict"):
+        generation_config = generation_config.to_dict()
+    payload = json.dumps(
+        {
+            "case": [_normalize(plaintiff), _normalize(defendant),
+                     _normalize(evidence), _normalize(verdict)],
+            "model": model_name,
+            "generation": generation_config or {},
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ReasoningCache:
+    """
+    Two-tier reasoning cache.
+
+    The memory tier keeps the ``max_entries`` most recently used results.
+    When ``db_path`` is set, results are also written to SQLite (at most
+    ``max_disk_entries`` rows, least recently used dropped first) and a
+    memory miss falls through to disk. Entries older than ``ttl`` seconds
+    are treated as misses in both tiers (ttl=0 keeps entries forever).
+    """
+
+    def __init__(self, max_entries=256, ttl=7 * 24 * 3600, db_path=None, max_disk_entries=10000):
+        self.max_entries = max(1, int(max_entries))
+        self.ttl = float(ttl)
+        self.db_path = db_path
+        self.max_disk_entries = int(max_disk_entries)
+
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()   # key -> (reasoning, created_at)
+        self._db = None
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+        if db_path:
+            try:
+                self._db = sqlite3.connect(db_path, check_same_thread=False)
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS reasoning ("
+                    " key TEXT PRIMARY KEY, reasoning TEXT NOT NULL,"
+                    " created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+                )
+                self._db.execute(
+                    "CREATE INDEX IF NOT EXISTS reasoning_accessed ON reasoning (accessed_at)"
+                )
+                self._db.commit()
+            except sqlite3.Error as e:
+                print(f"⚠️  Reasoning cache disk tier disabled ({db_path}): {e}")
+                self._db = None
+
+    def _expired(self, created_at, now):
+        return self.ttl > 0 and now - created_at > self.ttl
+
+    def get(self, key):
+        """Return cached reasoning for key, or None"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if not self._expired(entry[1], now):
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return entry[0]
+                del self._memory[key]
+                self.evictions += 1
+
+            if self._db is not None:
+                reasoning = self._disk_get(key, now)
+                if reasoning is not None:
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return reasoning
+
+            self.misses += 1
+            return None
+
+    def put(self, key, reasoning):
+        """Store reasoning under key in both tiers"""
+        if not reasoning:
+            return
+        now = time.time()
+        with self._lock:
+            self._remember(key, reasoning, now)
+            self.stores += 1
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO reasoning VALUES (?, ?, ?, ?)",
+                        (key, reasoning, now, now),
+                    )
+                    self._trim_disk(now)
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    print(f"⚠️  Could not write reasoning cache: {e}")
+
+    def _remember(self, key, reasoning, created_at):
+        self._memory[key] = (reasoning, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def _disk_get(self, key, now):
+        try:
+            row = self._db.execute(
+                "SELECT reasoning, created_at FROM reasoning WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            reasoning, created_at = row
+            if self._expired(created_at, now):
+                self._db.execute("DELETE FROM reasoning WHERE key = ?", (key,))
+                self._db.commit()
+                self.evictions += 1
+                return None
+            self._db.execute(
+                "UPDATE reasoning SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._db.commit()
+        except sqlite3.Error as e:
+            print(f"⚠️  Could not read reasoning cache: {e}")
+            return None
+
+        # Promote to the memory tier
+        self._remember(key, reasoning, created_at)
+        return reasoning
+
+    def _trim_disk(self, now):
+        if self.ttl > 0:
+            removed = self._db.execute(
+                "DELETE FROM reasoning WHERE created_at < ?", (now - self.ttl,)
+            ).rowcount
+            self.evictions += max(removed, 0)
+        if self.max_disk_entries > 0:
+            removed = self._db.execute(
+                "DELETE FROM reasoning WHERE key IN ("
+                " SELECT key FROM reasoning ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_disk_entries,),
+            ).rowcount
+            self.evictions += max(removed, 0)
+
+    def stats(self):
+        """Hit/miss counters for health endpoints"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats = {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0,
+                "stores": self.stores,
+                "evictions": self.evictions,
+                "memory_entries": len(self._memory),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+            }
+            if self._db is not None:
+                stats["disk_hits"] = self.disk_hits
+                try:
+                    stats["disk_entries"] = self._db.execute(
+                        "SELECT COUNT(*) FROM reasoning"
+                    ).fetchone()[0]
+                except sqlite3.Error:
+                    pass
+            return stats
@@ -0,0 +1,213 @@
+"""
+Rule Engine - Declarative Keyword Scoring
+Compiles the verdict rule table (data/verdict_rules.json) into an in-memory
+scoring engine shared by ai_judge.ml_predict_verdict and
+app.get_fallback_verdict, and hot-reloads it when the file changes
+"""
+
+import json
+import os
+import threading
+import time
+from collections import namedtuple
+
+from .keyword_matcher import KeywordMatcher
+
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'verdict_rules.json')
+
+# Texts a rule can scan, in the order they are passed to score()
+PARTIES = ('plaintiff', 'defendant', 'evidence')
+# Scores a rule can change
+AWARDS = ('plaintiff', 'defendant')
+
+_Rule = namedtuple('_Rule', 'category scan keywords award weight each requires unless floor')
+Profile = namedtuple('Profile', 'name rules matcher neutral_margin high_confidence_margin')
+
+
+def _party_index(value, allowed, where):
+    if value not in allowed:
+        raise ValueError(f"{where}: expected one of {allowed}, got {value!r}")
+    return allowed.index(value)
+
+
+def _compile_conditions(conditions, where):
+    compiled = []
+    for condition in conditions or []:
+        compiled.append((
+            _party_index(condition.get('scan'), PARTIES, where),
+            frozenset(keyword.lower() for keyword in condition['keywords']),
+        ))
+    return tuple(compiled)
+
+
+def _compile_profile(name, spec):
+    rules = []
+    vocabulary = set()
+
+    for i, rule in enumerate(spec.get('rules', [])):
+        where = f"profile {name!r} rule {i} ({rule.get('category', '?')})"
+        mode = rule.get('mode', 'any')
+        if mode not in ('any', 'each'):
+            raise ValueError(f"{where}: mode must be 'any' or 'each', got {mode!r}")
+
+        compiled = _Rule(
+            category=rule.get('category', f'rule_{i}'),
+            scan=_party_index(rule.get('scan'), PARTIES, where),
+            keywords=frozenset(keyword.lower() for keyword in rule['keywords']),
+            award=_party_index(rule.get('award'), AWARDS, where),
+            weight=int(rule['weight']),
+            each=mode == 'each',
+            requires=_compile_conditions(rule.get('requires'), where),
+            unless=_compile_conditions(rule.get('unless'), where),
+            floor=rule.get('floor'),
+        )
+        rules.append(compiled)
+
+        vocabulary |= compiled.keywords
+        for _, keywords in compiled.requires + compiled.unless:
+            vocabulary |= keywords
+
+    return Profile(
+        name=name,
+        rules=tuple(rules),
+        matcher=KeywordMatcher(vocabulary),
+        neutral_margin=int(spec.get('neutral_margin', 1)),
+        high_confidence_margin=int(spec.get('high_confidence_margin', 4)),
+    )
+
+
+class RuleEngine:
+    """Compiled, immutable form of one rule table"""
+
+    def __init__(self, table, source=None):
+        self.version = table.get('version')
+        self.source = source
+        self.profiles = {
+            name: _compile_profile(name, spec)
+            for name, spec in table.get('profiles', {}).items()
+        }
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f), source=path)
+
+    def profile(self, name):
+        try:
+            return self.profiles[name]
+        except KeyError:
+            raise KeyError(f"Rule profile {name!r} not found in {self.source or 'rule table'}")
+
+    def scan(self, name, plaintiff, defendant, evidence=''):
+        """Return the keyword hit sets for each party under a profile"""
+        matcher = self.profile(name).matcher
+        return tuple(
+            matcher.scan(text.lower() if text else '')
+            for text in (plaintiff, defendant, evidence)
+        )
+
+    def score_hits(self, name, hits):
+        """Apply a profile's rules, in table order, to precomputed hit sets"""
+        scores = [0, 0]
+
+        for rule in self.profile(name).rules:
+            found = hits[rule.scan] & rule.keywords
+            if not found:
+                continue
+            if any(not (hits[party] & keywords) for party, keywords in rule.requires):
+                continue
+            if any(hits[party] & keywords for party, keywords in rule.unless):
+                continue
+
+            scores[rule.award] += rule.weight * (len(found) if rule.each else 1)
+            if rule.floor is not None:
+                scores[rule.award] = max(rule.floor, scores[rule.award])
+
+        return scores[0], scores[1]
+
+    def score(self, name, plaintiff, defendant, evidence=''):
+        """Return (plaintiff_score, defendant_score) for a case"""
+        return self.score_hits(name, self.scan(name, plaintiff, defendant, evidence))
+
+    def winner(self, name, plaintiff_score, defendant_score):
+        """Plaintiff/Defendant/Neutral using the profile's neutral margin"""
+        if abs(plaintiff_score - defendant_score) < self.profile(name).neutral_margin:
+            return "Neutral"
+        return "Plaintiff" if plaintiff_score > defendant_score else "Defendant"
+
+
+class RuleBook:
+    """
+    Holds the current RuleEngine for a rule file and swaps in a freshly
+    compiled one when the file's mtime changes. Readers always get a
+    complete engine; a table that fails to compile is reported and the
+    previous engine keeps serving.
+    """
+
+    def __init__(self, path, check_interval=2.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._mtime = os.path.getmtime(path)
+        self._engine = RuleEngine.from_file(path)
+        self._next_check = time.monotonic() + check_interval
+        self.loaded_at = time.time()
+        self.reloads = 0
+
+    def engine(self):
+        """Return the current engine, reloading first if the file changed"""
+        if time.monotonic() >= self._next_check:
+            self._maybe_reload()
+        return self._engine
+
+    def reload(self):
+        """Recompile the rule table now, regardless of mtime"""
+        with self._lock:
+            self._reload_locked(os.path.getmtime(self.path))
+
+    def _maybe_reload(self):
+        # Only one thread checks; the rest keep using the current engine
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            self._next_check = time.monotonic() + self.check_interval
+            mtime = os.path.getmtime(self.path)
+            if mtime != self._mtime:
+                # Remember the mtime even if compiling fails so a broken
+                # table is reported once, not on every check
+                self._mtime = mtime
+                self._reload_locked(mtime)
+        except Exception as e:
+            print(f"⚠️  Could not reload rule table {self.path}: {e}")
+        finally:
+            self._lock.release()
+
+    def _reload_locked(self, mtime):
+        engine = RuleEngine.from_file(self.path)
+        self._engine = engine
+        self._mtime = mtime
+        self.loaded_at = time.time()
+        self.reloads += 1
+        print(f"🔄 Rule table reloaded: {self.path} (version {engine.version})")
+
+
+_rule_book = None
+_rule_book_lock = threading.Lock()
+
+
+def get_rule_book():
+    """Process-wide RuleBook for VERDICT_RULES_PATH (or the bundled table)"""
+    global _rule_book
+    if _rule_book is None:
+        with _rule_book_lock:
+            if _rule_book is None:
+                _rule_book = RuleBook(
+                    os.environ.get('VERDICT_RULES_PATH', DEFAULT_RULES_PATH),
+                    check_interval=float(os.environ.get('VERDICT_RULES_RELOAD_INTERVAL', 2.0)),
+                )
+    return _rule_book
+
+
+def get_rule_engine():
+    """Current compiled RuleEngine"""
+    return get_rule_book().engine()
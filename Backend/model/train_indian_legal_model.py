@@ -9,11 +9,16 @@ Author: Code Vibers Team
 Purpose: AI Court System
 """
 
+import argparse
+import json
 import os
-import pickle
+import sys
+import time
 import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split, cross_val_score
+import scipy.sparse as sp
+from joblib import Parallel, delayed
+from sklearn.model_selection import ParameterGrid, StratifiedKFold, train_test_split
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.linear_model import LogisticRegression
@@ -21,6 +26,26 @@ from sklearn.metrics import classification_report, accuracy_score, confusion_mat
 import warnings
 warnings.filterwarnings('ignore')
 
+try:
+    from .artifacts import CURRENT_LINK, DEFAULT_ROOT, publish_bundle
+    from .dataset_loader import DEFAULT_CHUNK_SIZE, batch_text, iter_batches
+    from .hashing_vectorizer import DEFAULT_N_FEATURES, HashingTfidfVectorizer
+    from .hybrid_features import HybridVectorizer
+except ImportError:  # run as a script: import through the model package
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+    from model.artifacts import CURRENT_LINK, DEFAULT_ROOT, publish_bundle
+    from model.dataset_loader import DEFAULT_CHUNK_SIZE, batch_text, iter_batches
+    from model.hashing_vectorizer import DEFAULT_N_FEATURES, HashingTfidfVectorizer
+    from model.hybrid_features import HybridVectorizer
+
+# Feature pipelines: "tfidf" keeps a vocabulary of the top terms, "hashing"
+# hashes terms into a fixed number of buckets and only stores IDF weights.
+# Either way the dataset is streamed in chunks (see stream_and_vectorize)
+FEATURE_MODES = ('tfidf', 'hashing')
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+DEFAULT_DATASET = os.path.join(DATA_DIR, 'indian_constitution_legal_dataset.csv')
+
 # Color codes for terminal output
 class Colors:
     HEADER = '\033[95m'
@@ -48,157 +73,308 @@ def print_warning(text):
     print(f"{Colors.WARNING}⚠ {text}{Colors.ENDC}")
 
 # -----------------------------
-# Step 1: Load Indian Legal Dataset
+# Step 1: Scan Indian Legal Dataset
 # -----------------------------
-def load_dataset():
+# The dataset is never held in memory as a whole: every step reads it
+# again in chunks of --chunk-size cases (see model/dataset_loader.py), and
+# only the labels, running statistics and the sparse feature matrix are kept
+def resolve_dataset(data_path=DEFAULT_DATASET):
+    """data_path, or the original dataset when the default one is missing"""
+    if os.path.exists(data_path) or data_path != DEFAULT_DATASET:
+        return data_path
+    print_warning("Indian legal dataset not found. Using fallback dataset...")
+    return os.path.join(DATA_DIR, 'ai_judge_dataset_clean.csv')
+
+
+def scan_dataset(data_path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    One pass over the dataset: the verdict of every case (in file order)
+    and the statistics analyze_dataset prints
+    """
     print_header("INDIAN CONSTITUTIONAL LEGAL DATASET - MODEL TRAINING")
-    print_info("Loading Indian Constitutional Legal Dataset...")
+    print_info(f"Scanning {os.path.basename(data_path)} in chunks of {chunk_size}...")
     
-    # Get the correct path
-    data_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'indian_constitution_legal_dataset.csv')
+    labels = []
+    legal_basis = pd.Series(dtype='int64')
+    score_totals = {}
+    for batch in iter_batches(data_path, chunk_size):
+        labels.append(batch['verdict'].to_numpy())
+        if 'legal_basis' in batch.columns:
+            legal_basis = legal_basis.add(batch['legal_basis'].value_counts(), fill_value=0)
+        for column in ('plaintiff_score', 'defendant_score'):
+            if column in batch.columns:
+                score_totals[column] = score_totals.get(column, 0) + int(batch[column].sum())
+    if not labels:
+        raise ValueError(f"{data_path} has no cases with a known verdict")
     
-    try:
-        df = pd.read_csv(data_path)
-        print_success(f"Dataset loaded successfully!")
-        print_info(f"Total cases: {len(df)}")
-        return df
-    except FileNotFoundError:
-        print_warning("Indian legal dataset not found. Using fallback dataset...")
-        # Fallback to original dataset if new one doesn't exist
-        fallback_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'ai_judge_dataset_clean.csv')
-        df = pd.read_csv(fallback_path)
-        print_success(f"Fallback dataset loaded: {len(df)} cases")
-        return df
+    y = np.concatenate(labels)
+    print_success(f"Dataset scanned successfully!")
+    print_info(f"Total cases: {len(y)}")
+    return y, {
+        'legal_basis': legal_basis.astype('int64').sort_values(ascending=False),
+        'average_scores': {column: total / len(y) for column, total in score_totals.items()},
+    }
 
 # -----------------------------
 # Step 2: Analyze Dataset
 # -----------------------------
-def analyze_dataset(df):
+def analyze_dataset(y, stats):
     print_header("DATASET ANALYSIS")
     
     # Verdict distribution
     print(f"{Colors.BOLD}Verdict Distribution:{Colors.ENDC}")
-    verdict_counts = df['verdict'].value_counts()
-    for verdict, count in verdict_counts.items():
-        percentage = (count / len(df)) * 100
+    verdicts, counts = np.unique(y, return_counts=True)
+    for verdict, count in sorted(zip(verdicts, counts), key=lambda item: -item[1]):
+        percentage = (count / len(y)) * 100
         print(f"  {verdict}: {count} ({percentage:.1f}%)")
     
     # Legal basis categories (if available)
-    if 'legal_basis' in df.columns:
+    if len(stats['legal_basis']):
         print(f"\n{Colors.BOLD}Top 10 Legal Provisions:{Colors.ENDC}")
-        legal_basis_counts = df['legal_basis'].value_counts().head(10)
+        legal_basis_counts = stats['legal_basis'].head(10)
         for i, (basis, count) in enumerate(legal_basis_counts.items(), 1):
             print(f"  {i}. {basis}: {count} cases")
     
     # Evidence statistics
     print(f"\n{Colors.BOLD}Evidence Statistics:{Colors.ENDC}")
-    if 'plaintiff_score' in df.columns and 'defendant_score' in df.columns:
-        print(f"  Average Plaintiff Score: {df['plaintiff_score'].mean():.2f}")
-        print(f"  Average Defendant Score: {df['defendant_score'].mean():.2f}")
+    scores = stats['average_scores']
+    if 'plaintiff_score' in scores and 'defendant_score' in scores:
+        print(f"  Average Plaintiff Score: {scores['plaintiff_score']:.2f}")
+        print(f"  Average Defendant Score: {scores['defendant_score']:.2f}")
     
     print()
 
 # -----------------------------
-# Step 3: Prepare Data
+# Step 3: Split
 # -----------------------------
-def prepare_data(df):
-    print_header("DATA PREPARATION")
-    print_info("Preparing features for training...")
-    
-    # Combine text columns
-    if 'legal_basis' in df.columns:
-        df['combined_text'] = (
-            df['plaintiff'] + ' ' + 
-            df['defendant'] + ' ' + 
-            df['evidence'] + ' ' + 
-            df['legal_basis']
+TEST_SIZE = 0.2
+# Cross-validation folds on the training set (see train_models)
+CV_FOLDS = 5
+# Each verdict needs a case for the test set plus one per CV fold
+MIN_CASES_PER_CLASS = CV_FOLDS + 1
+
+
+class DatasetTooSmall(ValueError):
+    """The dataset has too few cases of some verdict to split and cross-validate"""
+
+
+def check_class_counts(y, source="dataset"):
+    """
+    Raise DatasetTooSmall unless y has at least two verdicts and
+    MIN_CASES_PER_CLASS cases of each, which the stratified train/test
+    split and the stratified CV folds need
+    """
+    verdicts, counts = np.unique(np.asarray(y), return_counts=True)
+    found = ", ".join(f"{verdict}: {count}" for verdict, count in zip(verdicts, counts))
+    if len(verdicts) < 2:
+        raise DatasetTooSmall(f"{source} has a single verdict ({found or 'no cases'}); "
+                              f"a classifier needs at least two")
+    if counts.min() < MIN_CASES_PER_CLASS:
+        raise DatasetTooSmall(
+            f"{source} is too small to train on: each verdict needs at least "
+            f"{MIN_CASES_PER_CLASS} cases (a test case plus {CV_FOLDS} cross-validation folds), "
+            f"found {found}"
         )
-        print_success("Combined text with legal basis")
-    else:
-        df['combined_text'] = df['plaintiff'] + ' ' + df['defendant'] + ' ' + df['evidence']
-        print_success("Combined text without legal basis")
-    
-    X = df['combined_text']
-    y = df['verdict']
-    
-    print_success(f"Features prepared: {len(X)} samples")
-    print_success(f"Labels prepared: {y.nunique()} unique classes")
+
+
+def split_rows(y, source="dataset"):
+    """Stratified train/test row indices (into the dataset's file order)"""
+    print_header("DATA SPLITTING")
+    check_class_counts(y, source)
     
-    return X, y
+    train_rows, test_rows = train_test_split(
+        np.arange(len(y)), test_size=TEST_SIZE, random_state=42, stratify=y
+    )
+    print_success(f"Train set: {len(train_rows)} samples ({len(train_rows)/len(y)*100:.1f}%)")
+    print_success(f"Test set: {len(test_rows)} samples ({len(test_rows)/len(y)*100:.1f}%)")
+    return train_rows, test_rows
 
 # -----------------------------
-# Step 4: Split and Vectorize
+# Step 4: Vectorize
 # -----------------------------
-def split_and_vectorize(X, y):
-    print_header("DATA SPLITTING & VECTORIZATION")
+# Shared by both text vectorizers
+TEXT_SETTINGS = dict(
+    stop_words='english',
+    ngram_range=(1, 2),  # Unigrams and bigrams
+    min_df=2,
+    max_df=0.95
+)
+
+
+def make_vectorizer(features='tfidf', hash_features=DEFAULT_N_FEATURES, structured=False):
+    """
+    The text vectorizer for a feature mode; with structured, wrapped in a
+    HybridVectorizer that appends the evidence columns and
+    extract_features heuristics
+    """
+    if features == 'hashing':
+        print_info(f"Creating hashing TF-IDF vectorizer ({hash_features} buckets)...")
+        vectorizer = HashingTfidfVectorizer(n_features=hash_features, **TEXT_SETTINGS)
+    else:
+        print_info("Creating TF-IDF vectorizer...")
+        vectorizer = TfidfVectorizer(max_features=5000, **TEXT_SETTINGS)
+    return HybridVectorizer(vectorizer) if structured else vectorizer
+
+
+def stream_and_vectorize(data_path, train_rows, test_rows, chunk_size=DEFAULT_CHUNK_SIZE,
+                         features='tfidf', hash_features=DEFAULT_N_FEATURES, structured=False):
+    """
+    Fit the vectorizer on the training rows and vectorize every case,
+    reading the dataset in chunks: one pass feeds the training rows' texts
+    (and, with structured, their evidence columns) to fit as a generator,
+    a second transforms chunk by chunk into one sparse matrix
+    """
+    print_header("VECTORIZATION")
+    vectorizer = make_vectorizer(features, hash_features, structured)
+    text_vectorizer = vectorizer.text_vectorizer if structured else vectorizer
+    is_train = np.zeros(len(train_rows) + len(test_rows), dtype=bool)
+    is_train[train_rows] = True
     
-    # Split data
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.2, random_state=42, stratify=y
-    )
-    print_success(f"Train set: {len(X_train)} samples ({(len(X_train)/len(X))*100:.1f}%)")
-    print_success(f"Test set: {len(X_test)} samples ({(len(X_test)/len(X))*100:.1f}%)")
+    def training_batches():
+        offset = 0
+        for batch in iter_batches(data_path, chunk_size):
+            rows = is_train[offset:offset + len(batch)]
+            offset += len(batch)
+            if rows.any():
+                yield batch[rows]
     
-    # Vectorize with enhanced parameters
-    print_info("Creating TF-IDF vectorizer...")
-    vectorizer = TfidfVectorizer(
-        stop_words='english',
-        max_features=5000,
-        ngram_range=(1, 2),  # Unigrams and bigrams
-        min_df=2,
-        max_df=0.95
-    )
+    if structured:
+        vectorizer.fit_batches(training_batches())
+    else:
+        vectorizer.fit(text for batch in training_batches() for text in batch_text(batch))
     
-    X_train_tfidf = vectorizer.fit_transform(X_train)
-    X_test_tfidf = vectorizer.transform(X_test)
+    X = sp.vstack([
+        vectorizer.transform(batch if structured else batch_text(batch))
+        for batch in iter_batches(data_path, chunk_size)
+    ], format='csr')
+    X_train, X_test = X[train_rows], X[test_rows]
+    del X
     
-    print_success(f"Vectorization complete: {X_train_tfidf.shape[1]} features")
-    print_info(f"Vocabulary size: {len(vectorizer.vocabulary_)}")
+    print_success(f"Vectorization complete: {X_train.shape[1]} features")
+    if features == 'hashing':
+        print_info(f"Hash buckets used: {len(set(X_train.indices))}")
+    else:
+        print_info(f"Vocabulary size: {len(text_vectorizer.vocabulary_)}")
+    if structured:
+        print_info(f"Structured columns: {len(vectorizer.dense_names)} "
+                   f"({', '.join(vectorizer.dense_names[:4])}, ...)")
     
-    return X_train_tfidf, X_test_tfidf, y_train, y_test, vectorizer
+    return X_train, X_test, vectorizer
 
 # -----------------------------
 # Step 5: Train Multiple Models
 # -----------------------------
-def train_models(X_train, X_test, y_train, y_test):
+# Candidate models and the hyperparameter values tried for each (every
+# combination is one candidate); override with --grid grid.json, e.g.
+# {"Logistic Regression": {"C": [0.1, 1, 10]}, "Random Forest": {"max_depth": [10, 20]}}
+DEFAULT_GRID = {
+    'Random Forest': {'n_estimators': [200], 'max_depth': [20]},
+    'Logistic Regression': {'C': [1.0]},
+}
+# Parallelism comes from fanning out whole fits, so each fit is single-threaded
+ESTIMATORS = {
+    'Random Forest': lambda **params: RandomForestClassifier(random_state=42, n_jobs=1, **params),
+    'Logistic Regression': lambda **params: LogisticRegression(max_iter=1000, random_state=42, **params),
+}
+
+
+def load_grid(path):
+    with open(path) as f:
+        grid = json.load(f)
+    unknown = set(grid) - set(ESTIMATORS)
+    if unknown:
+        raise ValueError(f"Unknown models in {path}: {', '.join(sorted(unknown))} "
+                         f"(choose from {', '.join(ESTIMATORS)})")
+    return {name: {param: values if isinstance(values, list) else [values]
+                   for param, values in params.items()}
+            for name, params in grid.items()}
+
+
+def expand_grid(grid):
+    """[(candidate label, model name, params)] for every combination in grid"""
+    candidates = []
+    for name, param_grid in grid.items():
+        combinations = list(ParameterGrid(param_grid))
+        for params in combinations:
+            label = name
+            if len(combinations) > 1:
+                label += " (" + ", ".join(f"{k}={v}" for k, v in sorted(params.items())) + ")"
+            candidates.append((label, name, params))
+    return candidates
+
+
+def _fit_and_score(name, params, X, y, fit_rows, X_eval, y_eval, keep_model):
+    """One fit on X[fit_rows] scored on (X_eval, y_eval); runs in a worker"""
+    start = time.perf_counter()
+    model = ESTIMATORS[name](**params).fit(X[fit_rows], y[fit_rows])
+    fit_seconds = time.perf_counter() - start
+    predictions = model.predict(X_eval)
+    return {
+        'model': model if keep_model else None,
+        'predictions': predictions,
+        'accuracy': accuracy_score(y_eval, predictions),
+        'fit_seconds': fit_seconds,
+    }
+
+
+def train_models(X_train, X_test, y_train, y_test, grid=None, n_jobs=-1):
     print_header("MODEL TRAINING")
     
-    models = {
-        'Random Forest': RandomForestClassifier(n_estimators=200, random_state=42, max_depth=20),
-        'Logistic Regression': LogisticRegression(max_iter=1000, random_state=42, C=1.0)
-    }
+    candidates = expand_grid(grid or DEFAULT_GRID)
+    y_train = np.asarray(y_train)
+    folds = list(StratifiedKFold(n_splits=CV_FOLDS).split(X_train, y_train))
+    every_row = np.arange(X_train.shape[0])
+    
+    # Every candidate's CV folds and final fit are independent tasks. The
+    # vectorized matrix is shared by all of them: tasks get row indices,
+    # and joblib memory-maps the matrix once instead of copying it per task
+    tasks = []
+    for label, name, params in candidates:
+        for fit_rows, eval_rows in folds:
+            tasks.append((label, delayed(_fit_and_score)(
+                name, params, X_train, y_train, fit_rows,
+                X_train[eval_rows], y_train[eval_rows], False
+            )))
+        tasks.append((label, delayed(_fit_and_score)(
+            name, params, X_train, y_train, every_row, X_test, y_test, True
+        )))
+    
+    print_info(f"Training {len(candidates)} candidates x ({CV_FOLDS} folds + final fit) "
+               f"= {len(tasks)} fits with n_jobs={n_jobs}...")
+    start = time.perf_counter()
+    outputs = Parallel(n_jobs=n_jobs, backend='loky', max_nbytes='1M')(task for _, task in tasks)
+    wall_seconds = time.perf_counter() - start
     
     trained_models = {}
     results = {}
+    for (label, _), output in zip(tasks, outputs):
+        result = results.setdefault(label, {'cv_scores': [], 'fit_seconds': 0.0})
+        result['fit_seconds'] += output['fit_seconds']
+        if output['model'] is None:
+            result['cv_scores'].append(output['accuracy'])
+        else:
+            trained_models[label] = output['model']
+            result['accuracy'] = output['accuracy']
+            result['predictions'] = output['predictions']
+    for (label, _, params) in candidates:
+        results[label]['cv_scores'] = np.array(results[label]['cv_scores'])
+        results[label]['params'] = params
     
-    for model_name, model in models.items():
-        print_info(f"Training {model_name}...")
-        
-        # Train
-        model.fit(X_train, y_train)
-        
-        # Cross-validation
-        cv_scores = cross_val_score(model, X_train, y_train, cv=5)
-        
-        # Test prediction
-        y_pred = model.predict(X_test)
-        
-        # Metrics
-        accuracy = accuracy_score(y_test, y_pred)
-        
-        trained_models[model_name] = model
-        results[model_name] = {
-            'accuracy': accuracy,
-            'cv_scores': cv_scores,
-            'predictions': y_pred
-        }
-        
-        print_success(f"{model_name} trained!")
-        print(f"  Accuracy: {accuracy*100:.2f}%")
-        print(f"  Cross-validation Score: {cv_scores.mean()*100:.2f}% (+/- {cv_scores.std()*2*100:.2f}%)")
-    
+    print_timing_table(results, wall_seconds)
     return trained_models, results, y_test
 
+
+def print_timing_table(results, wall_seconds):
+    width = max(len(label) for label in results)
+    print(f"\n{Colors.BOLD}{'Candidate':<{width}}  {'CV accuracy':>16}  {'Test':>7}  {'Fit time':>9}{Colors.ENDC}")
+    for label, result in results.items():
+        cv = result['cv_scores']
+        print(f"{label:<{width}}  {cv.mean()*100:>7.2f}% +/- {cv.std()*2*100:>4.1f}  "
+              f"{result['accuracy']*100:>6.2f}%  {result['fit_seconds']:>8.2f}s")
+    fit_seconds = sum(result['fit_seconds'] for result in results.values())
+    print(f"\n  {fit_seconds:.2f}s of fitting in {wall_seconds:.2f}s wall time "
+          f"({fit_seconds / max(wall_seconds, 1e-9):.1f}x)\n")
+
 # -----------------------------
 # Step 6: Evaluate and Compare
 # -----------------------------
@@ -224,35 +400,21 @@ def evaluate_models(results, y_test):
 # -----------------------------
 # Step 7: Save Model
 # -----------------------------
-def save_model(model, vectorizer, model_name):
+def save_model(model, vectorizer, model_name, metadata=None, root=DEFAULT_ROOT):
     print_header("MODEL SAVING")
     
-    # Create models directory if it doesn't exist
-    models_dir = os.path.join(os.path.dirname(__file__), 'models')
-    os.makedirs(models_dir, exist_ok=True)
-    
-    # Save model
-    model_path = os.path.join(models_dir, 'indian_legal_judge_model.pkl')
-    with open(model_path, 'wb') as f:
-        pickle.dump(model, f)
-    print_success(f"Model saved: {model_path}")
-    
-    # Save vectorizer
-    vectorizer_path = os.path.join(models_dir, 'indian_legal_vectorizer.pkl')
-    with open(vectorizer_path, 'wb') as f:
-        pickle.dump(vectorizer, f)
-    print_success(f"Vectorizer saved: {vectorizer_path}")
-    
-    # Also save to parent directory for compatibility
-    parent_model_path = os.path.join(os.path.dirname(__file__), '..', 'model.pkl')
-    with open(parent_model_path, 'wb') as f:
-        pickle.dump(model, f)
-    
-    parent_vectorizer_path = os.path.join(os.path.dirname(__file__), '..', 'vectorizer.pkl')
-    with open(parent_vectorizer_path, 'wb') as f:
-        pickle.dump(vectorizer, f)
+    # One versioned bundle (manifest + .npy arrays) that the API loads
+    # with mmap and validates against its hashes; published as a new
+    # version behind the "current" symlink, never over the served files
+    manifest = publish_bundle(
+        model, vectorizer, root,
+        metadata={"model_name": model_name, **(metadata or {})}
+    )
+    print_success(f"Model bundle saved: {os.path.join(root, CURRENT_LINK)}")
+    print_info(f"Version: {manifest['content_hash'][:12]} ({manifest['model']['format']} model, "
+               f"{manifest['n_features']} features)")
     
-    print_success("Model files copied to Backend directory for API access")
+    return manifest
 
 # -----------------------------
 # Step 8: Test Model with Sample Cases
@@ -279,8 +441,11 @@ def test_sample_cases(model, vectorizer):
     ]
     
     for i, case in enumerate(sample_cases, 1):
-        combined = f"{case['plaintiff']} {case['defendant']} {case['evidence']}"
-        vectorized = vectorizer.transform([combined])
+        if isinstance(vectorizer, HybridVectorizer):
+            vectorized = vectorizer.transform([case])
+        else:
+            combined = f"{case['plaintiff']} {case['defendant']} {case['evidence']}"
+            vectorized = vectorizer.transform([combined])
         prediction = model.predict(vectorized)[0]
         
         print(f"\n{Colors.BOLD}Sample Case {i}:{Colors.ENDC}")
@@ -292,28 +457,65 @@ def test_sample_cases(model, vectorizer):
 # Main Execution
 # -----------------------------
 def main():
+    parser = argparse.ArgumentParser(description="Train the verdict model on the Indian legal dataset")
+    parser.add_argument("--features", choices=FEATURE_MODES, default='tfidf',
+                        help="Feature pipeline (hashing: fixed-size, no vocabulary)")
+    parser.add_argument("--hash-features", type=int, default=DEFAULT_N_FEATURES,
+                        help="Hash buckets for --features hashing")
+    parser.add_argument("--dataset", default=DEFAULT_DATASET,
+                        help="Training cases (.csv, .json or .jsonl)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="Cases read and vectorized at a time (bounds memory in every mode)")
+    parser.add_argument("--structured", action="store_true",
+                        help="Add the evidence/score columns and text heuristics to the text features")
+    parser.add_argument("--grid", help="JSON file of hyperparameter values per model")
+    parser.add_argument("--jobs", type=int, default=-1,
+                        help="Parallel fits (-1: one per core)")
+    parser.add_argument("--root", default=DEFAULT_ROOT,
+                        help="Directory holding versions/ and the current symlink")
+    args = parser.parse_args()
+    
     try:
-        # Step 1: Load dataset
-        df = load_dataset()
+        # Step 1: Scan dataset (labels and statistics, one chunk at a time)
+        data_path = resolve_dataset(args.dataset)
+        dataset = os.path.basename(data_path)
+        y, stats = scan_dataset(data_path, args.chunk_size)
+        samples = len(y)
         
         # Step 2: Analyze dataset
-        analyze_dataset(df)
+        analyze_dataset(y, stats)
         
-        # Step 3: Prepare data
-        X, y = prepare_data(df)
+        # Step 3: Split
+        train_rows, test_rows = split_rows(y, dataset)
+        y_train, y_test = y[train_rows], y[test_rows]
         
-        # Step 4: Split and vectorize
-        X_train, X_test, y_train, y_test, vectorizer = split_and_vectorize(X, y)
+        # Step 4: Vectorize
+        X_train, X_test, vectorizer = stream_and_vectorize(
+            data_path, train_rows, test_rows, args.chunk_size,
+            args.features, args.hash_features, args.structured
+        )
         
         # Step 5: Train models
-        trained_models, results, y_test = train_models(X_train, X_test, y_train, y_test)
+        grid = load_grid(args.grid) if args.grid else None
+        trained_models, results, y_test = train_models(
+            X_train, X_test, y_train, y_test, grid, args.jobs
+        )
         
         # Step 6: Evaluate and compare
         best_model_name = evaluate_models(results, y_test)
         
         # Step 7: Save the best model
         best_model = trained_models[best_model_name]
-        save_model(best_model, vectorizer, best_model_name)
+        save_model(best_model, vectorizer, best_model_name, metadata={
+            "dataset": dataset,
+            "features": args.features + ("+structured" if args.structured else ""),
+            "params": results[best_model_name]['params'],
+            "samples": samples,
+            "train_samples": X_train.shape[0],
+            "test_samples": X_test.shape[0],
+            "accuracy": round(float(results[best_model_name]['accuracy']), 4),
+            "cv_accuracy": round(float(results[best_model_name]['cv_scores'].mean()), 4),
+        }, root=args.root)
         
         # Step 8: Test with sample cases
         test_sample_cases(best_model, vectorizer)
@@ -322,10 +524,13 @@ def main():
         print_header("TRAINING COMPLETE")
         print_success("Indian Legal Model is ready for deployment!")
         print_info("Model can now be used via the AI Court API")
-        print_info(f"Total training samples: {len(X)}")
+        print_info(f"Total training samples: {samples}")
         print_info(f"Model accuracy: {results[best_model_name]['accuracy']*100:.2f}%")
         print()
         
+    except DatasetTooSmall as e:
+        print(f"\n{Colors.FAIL}Cannot train: {e}{Colors.ENDC}")
+        sys.exit(1)
     except Exception as e:
         print(f"\n{Colors.FAIL}Error during training: {str(e)}{Colors.ENDC}")
         raise
@@ -0,0 +1,70 @@
+"""
+Checks that the GenAI admission controller refuses a request with
+"queue_full" when every slot is busy and there is no queue to wait in
+(GENAI_QUEUE_SIZE=0), and that a freed slot is handed out again.
+
+Usage: python test_admission.py
+"""
+
+import sys
+import os
+
+# Add model directory to path
+sys.path.append(os.path.dirname(__file__))
+
+from model.concurrency import AdmissionController, AdmissionRejected
+
+
+def check(label, ok, detail=""):
+    print(f"   {'✅' if ok else '❌'} {label}{f': {detail}' if detail else ''}")
+    return ok
+
+
+def admit_or_reject(admission, client, priority="normal"):
+    try:
+        return admission.admit(client, priority), None
+    except AdmissionRejected as e:
+        return None, e
+
+
+def main():
+    print("=" * 50)
+    print("🧪 GENAI ADMISSION TEST")
+    print("=" * 50)
+    failures = 0
+
+    print("\n1️⃣ One slot, no queue")
+    admission = AdmissionController(1, 0, default_retry_after=7)
+    first, error = admit_or_reject(admission, "a")
+    failures += not check("first request admitted", first is not None and error is None)
+
+    for priority in ("normal", "high"):
+        _, error = admit_or_reject(admission, "b", priority)
+        failures += not check(
+            f"second ({priority} priority) request refused with queue_full",
+            error is not None and error.reason == "queue_full",
+            repr(error.reason if error else None)
+        )
+        failures += not check("refusal carries a Retry-After",
+                              error is not None and error.retry_after == 7,
+                              repr(error.retry_after if error else None))
+
+    stats = admission.stats()
+    failures += not check("refusals counted", stats["queue_full"] == 2, repr(stats["queue_full"]))
+    failures += not check("nothing left queued", stats["queue_depth"] == 0)
+
+    print("\n2️⃣ Slot released")
+    admission.release(first)
+    ticket, error = admit_or_reject(admission, "b")
+    failures += not check("next request admitted", ticket is not None and error is None)
+    admission.release(ticket)
+
+    print("\n" + "=" * 50)
+    if failures:
+        print(f"❌ {failures} check(s) failed")
+        sys.exit(1)
+    print("✅ All admission checks passed")
+
+
+if __name__ == "__main__":
+    main()
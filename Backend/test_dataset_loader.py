@@ -0,0 +1,144 @@
+"""
+Checks that model/dataset_loader.py reads CSV, JSON and JSONL case files
+into the same normalized schema: "winner" becomes "verdict", verdicts are
+spelled like the classifier's classes (unknown ones dropped), missing text
+becomes "", evidence/score columns are int8 and unknown columns are left
+out. Uses small fixture files in a temporary directory.
+
+Usage: python test_dataset_loader.py
+"""
+
+import sys
+import os
+import json
+import tempfile
+
+# Add model directory to path
+sys.path.append(os.path.dirname(__file__))
+
+CASES = [
+    {"case_id": "C1", "plaintiff": "Tenant paid the deposit", "defendant": "Landlord kept it",
+     "evidence": "Receipt", "winner": "plaintiff", "plaintiff_evidence": 1, "defendant_evidence": 0,
+     "plaintiff_score": 3, "defendant_score": 1, "court": "District"},
+    {"case_id": "C2", "plaintiff": "Buyer claims defects", "defendant": "Seller shipped on time",
+     "evidence": None, "winner": " Defendant ", "plaintiff_evidence": 0, "defendant_evidence": 1,
+     "plaintiff_score": 1, "defendant_score": 2, "court": "High"},
+    {"case_id": "C3", "plaintiff": "Both sides blame the storm", "defendant": "Nobody was at fault",
+     "evidence": "Weather report", "winner": "NEUTRAL", "plaintiff_evidence": 0, "defendant_evidence": 0,
+     "plaintiff_score": 0, "defendant_score": 0, "court": "District"},
+    {"case_id": "C4", "plaintiff": "Unclear claim", "defendant": "Unclear defence",
+     "evidence": "", "winner": "settled", "plaintiff_evidence": 1, "defendant_evidence": 1,
+     "plaintiff_score": 2, "defendant_score": 2, "court": "District"},
+]
+EXPECTED_VERDICTS = ["Plaintiff", "Defendant", "Neutral"]
+
+
+def check(label, ok, detail=""):
+    print(f"   {'✅' if ok else '❌'} {label}{f': {detail}' if detail else ''}")
+    return ok
+
+
+def write_fixtures(directory):
+    import pandas as pd
+
+    paths = {}
+    paths["csv"] = os.path.join(directory, "cases.csv")
+    pd.DataFrame(CASES).to_csv(paths["csv"], index=False)
+    paths["json"] = os.path.join(directory, "cases.json")
+    with open(paths["json"], "w", encoding="utf-8") as f:
+        json.dump(CASES, f, indent=2)
+    paths["jsonl"] = os.path.join(directory, "cases.jsonl")
+    with open(paths["jsonl"], "w", encoding="utf-8") as f:
+        for case in CASES:
+            f.write(json.dumps(case) + "\n")
+        f.write("\n")
+    return paths
+
+
+def check_frame(df):
+    """Schema checks shared by every format; returns the number of failures"""
+    import numpy as np
+
+    failures = 0
+    failures += not check("unknown verdict dropped", len(df) == 3, f"{len(df)} cases")
+    failures += not check("verdicts normalized", df["verdict"].tolist() == EXPECTED_VERDICTS,
+                          str(df["verdict"].tolist()))
+    failures += not check("'winner' renamed to 'verdict'", "winner" not in df.columns)
+    failures += not check("unknown columns left out", "court" not in df.columns)
+    failures += not check("missing evidence becomes ''", df["evidence"].tolist()[1] == "",
+                          repr(df["evidence"].tolist()[1]))
+    int8 = [c for c in ("plaintiff_evidence", "defendant_evidence", "plaintiff_score",
+                        "defendant_score") if df[c].dtype == np.int8]
+    failures += not check("evidence and score columns are int8", len(int8) == 4, str(int8))
+    failures += not check("columns the source lacks are not invented",
+                          "plaintiff_witness" not in df.columns)
+    return failures
+
+
+def main():
+    print("=" * 50)
+    print("🧪 DATASET LOADER TEST")
+    print("=" * 50)
+
+    try:
+        from model import dataset_loader
+        from model.dataset_loader import batch_text, iter_batches, load_frame, normalize_verdict
+    except ImportError as e:
+        print(f"   ❌ {e}")
+        sys.exit(1)
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_fixtures(directory)
+
+        for step, kind in (("1️⃣", "csv"), ("2️⃣", "json"), ("3️⃣", "jsonl")):
+            print(f"\n{step} {kind.upper()}")
+            df = load_frame(paths[kind])
+            failures += check_frame(df)
+
+        print("\n4️⃣ Chunked reading")
+        sizes = [len(batch) for batch in iter_batches(paths["csv"], chunk_size=2)]
+        failures += not check("at most chunk_size cases per batch", sizes == [2, 1], str(sizes))
+        # A read size smaller than one record makes the JSON array decoder refill its buffer
+        read_size = dataset_loader.JSON_READ_SIZE
+        dataset_loader.JSON_READ_SIZE = 16
+        try:
+            df = load_frame(paths["json"], chunk_size=1)
+        finally:
+            dataset_loader.JSON_READ_SIZE = read_size
+        failures += not check("JSON array streamed in small reads",
+                              df["case_id"].tolist() == ["C1", "C2", "C3"], str(df["case_id"].tolist()))
+
+        print("\n5️⃣ Helpers")
+        failures += not check("normalize_verdict", [normalize_verdict(v) for v in
+                              ("plaintiff", " Neutral ", "won", None)] == ["Plaintiff", "Neutral", None, None])
+        text = batch_text(load_frame(paths["jsonl"])).tolist()
+        failures += not check("batch_text joins the three statements",
+                              text[0] == "Tenant paid the deposit Landlord kept it Receipt", repr(text[0]))
+
+        print("\n6️⃣ Bad input")
+        bad = os.path.join(directory, "cases.txt")
+        open(bad, "w").close()
+        try:
+            load_frame(bad)
+            failures += not check("unsupported extension rejected", False)
+        except ValueError:
+            failures += not check("unsupported extension rejected", True)
+        unlabeled = os.path.join(directory, "unlabeled.jsonl")
+        with open(unlabeled, "w") as f:
+            f.write(json.dumps({"plaintiff": "a", "defendant": "b"}) + "\n")
+        try:
+            load_frame(unlabeled)
+            failures += not check("file without verdicts rejected", False)
+        except ValueError:
+            failures += not check("file without verdicts rejected", True)
+
+    print("\n" + "=" * 50)
+    if failures:
+        print(f"❌ {failures} check(s) failed")
+        sys.exit(1)
+    print("✅ All dataset loader checks passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Checks that the ONNX Runtime reasoner produces the same reasoning as the
+PyTorch reasoner it was exported from (greedy decoding), for single,
+batched and streamed generation, and that both streams honour a deadline.
+
+Usage: python test_genai_onnx.py [model_name_or_path] [onnx_bundle_dir]
+The bundle must be a float32 export:
+    python -m model.export_onnx --model <model_name_or_path> --output <onnx_bundle_dir>
+"""
+
+import sys
+import os
+import time
+
+# Add model directory to path
+sys.path.append(os.path.dirname(__file__))
+
+CASES = [
+    ("I paid $500 for a laptop but never received it.",
+     "I shipped the laptop on time.",
+     "Bank statement shows payment",
+     "Plaintiff"),
+    ("My neighbor's tree fell on my car and damaged it.",
+     "The tree fell naturally during a storm, it was an accident.",
+     "",
+     "Defendant"),
+    ("The landlord refused to return my security deposit.",
+     "The tenant damaged the apartment; I have photos of the walls.",
+     "Photos of the walls, signed lease agreement",
+     "Neutral"),
+]
+
+
+def main():
+    print("=" * 50)
+    print("🧪 GENAI ONNX BACKEND TEST")
+    print("=" * 50)
+
+    try:
+        from model.gen_ai_reasoner import LocalGenAIReasoner
+        from model.onnx_reasoner import OnnxGenAIReasoner
+    except ImportError as e:
+        print(f"   ❌ {e}")
+        sys.exit(1)
+
+    model_name = sys.argv[1] if len(sys.argv) > 1 else "TinyLlama/TinyLlama-1.1B-Chat-v1.0"
+    bundle = sys.argv[2] if len(sys.argv) > 2 else os.path.join(
+        os.path.dirname(__file__), "model", "models", "genai-onnx"
+    )
+    reference = LocalGenAIReasoner(model_name, cpu_precision="float32")
+    reasoner = OnnxGenAIReasoner(bundle)
+    if reasoner.cpu_precision != "float32":
+        # Quantized graphs only approximate the float model
+        print(f"   ❌ {bundle} is a {reasoner.cpu_precision} export; re-export without --int8")
+        sys.exit(1)
+
+    for r in (reference, reasoner):
+        r.fast_generation_config.do_sample = False
+        r.fast_generation_config.max_new_tokens = 40
+
+    failures = 0
+
+    def check(label, expected, actual, torch_time, onnx_time):
+        nonlocal failures
+        if expected == actual:
+            print(f"   ✅ {label} matches ({torch_time:.2f}s torch, {onnx_time:.2f}s onnx)")
+        else:
+            print(f"   ❌ {label} differs")
+            print(f"      torch: {expected!r}")
+            print(f"      onnx:  {actual!r}")
+            failures += 1
+
+    for i, case in enumerate(CASES, 1):
+        print(f"\n{i}️⃣ {case[0][:50]}...")
+        start = time.time()
+        expected = reference.generate_reasoning(*case)
+        torch_time = time.time() - start
+        start = time.time()
+        actual = reasoner.generate_reasoning(*case)
+        check("Reasoning", expected, actual, torch_time, time.time() - start)
+
+    print("\n🔢 Batch of all cases")
+    start = time.time()
+    expected = [r["reasoning"] for r in reference.generate_reasoning_batch(CASES)]
+    torch_time = time.time() - start
+    start = time.time()
+    actual = [r["reasoning"] for r in reasoner.generate_reasoning_batch(CASES)]
+    check("Batch", expected, actual, torch_time, time.time() - start)
+
+    print("\n📡 Stream")
+    start = time.time()
+    expected = "".join(reference.generate_reasoning_stream(*CASES[0]))
+    torch_time = time.time() - start
+    start = time.time()
+    actual = "".join(reasoner.generate_reasoning_stream(*CASES[0]))
+    check("Stream", expected, actual, torch_time, time.time() - start)
+
+    print("\n⏰ Stream past its deadline")
+    for name, r in (("torch", reference), ("onnx", reasoner)):
+        stream = r.generate_reasoning_stream(*CASES[0], deadline=time.monotonic())
+        pieces = []
+        try:
+            while True:
+                pieces.append(next(stream))
+        except StopIteration as done:
+            result = done.value
+        if not pieces and result == {"outcome": "timeout"}:
+            print(f"   ✅ {name} stream yields nothing and reports a timeout")
+        else:
+            print(f"   ❌ {name} stream ignored its deadline: {pieces!r}, {result!r}")
+            failures += 1
+
+    print("\n" + "=" * 50)
+    if failures:
+        print(f"❌ {failures} checks failed")
+        sys.exit(1)
+    print("✅ ONNX backend output matches the PyTorch reasoner")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Checks that reusing the precomputed prompt-prefix KV cache gives exactly
+the same output as encoding the full prompt (greedy decoding).
+
+Usage: python test_genai_prefix_cache.py [model_name_or_path]
+"""
+
+import sys
+import os
+import time
+
+# Add model directory to path
+sys.path.append(os.path.dirname(__file__))
+
+CASES = [
+    ("I paid $500 for a laptop but never received it.",
+     "I shipped the laptop on time.",
+     "Bank statement shows payment",
+     "Plaintiff"),
+    ("My neighbor's tree fell on my car and damaged it.",
+     "The tree fell naturally during a storm, it was an accident.",
+     "",
+     "Defendant"),
+    ("The landlord refused to return my security deposit.",
+     "The tenant damaged the apartment; I have photos of the walls.",
+     "Photos of the walls, signed lease agreement",
+     "Neutral"),
+]
+
+
+def main():
+    print("=" * 50)
+    print("🧪 GENAI PREFIX CACHE TEST")
+    print("=" * 50)
+
+    try:
+        import torch
+        from model.gen_ai_reasoner import LocalGenAIReasoner
+    except ImportError as e:
+        print(f"   ❌ {e}")
+        sys.exit(1)
+
+    model_name = sys.argv[1] if len(sys.argv) > 1 else "TinyLlama/TinyLlama-1.1B-Chat-v1.0"
+    # Dynamic int8 quantization picks activation scales per forward pass,
+    # so cached and uncached prefill only match exactly on a float model
+    reasoner = LocalGenAIReasoner(model_name, cpu_precision="float32")
+    if reasoner._prefix_cache is None:
+        print("   ❌ Prefix cache was not built")
+        sys.exit(1)
+
+    config = reasoner.fast_generation_config
+    config.do_sample = False
+    config.max_new_tokens = 40
+
+    failures = 0
+    for i, case in enumerate(CASES, 1):
+        print(f"\n{i}️⃣ {case[0][:50]}...")
+        inputs = reasoner._tokenize(reasoner._build_prompt(*case))
+        cache = reasoner._prefix_cache_for(inputs)
+        if cache is None:
+            print("   ❌ Prompt does not start with the cached prefix tokens")
+            failures += 1
+            continue
+
+        with torch.inference_mode():
+            start = time.time()
+            full = reasoner.model.generate(**inputs, generation_config=config)
+            full_time = time.time() - start
+
+            start = time.time()
+            cached = reasoner.model.generate(**inputs, generation_config=config, past_key_values=cache)
+            cached_time = time.time() - start
+
+        if torch.equal(full, cached):
+            print(f"   ✅ Outputs match ({full_time:.2f}s full prompt, {cached_time:.2f}s with prefix cache)")
+        else:
+            print("   ❌ Outputs differ")
+            print(f"      full:   {reasoner.tokenizer.decode(full[0][inputs['input_ids'].shape[1]:])!r}")
+            print(f"      cached: {reasoner.tokenizer.decode(cached[0][inputs['input_ids'].shape[1]:])!r}")
+            failures += 1
+
+    print("\n" + "=" * 50)
+    if failures:
+        print(f"❌ {failures} of {len(CASES)} cases failed")
+        sys.exit(1)
+    print("✅ Prefix cache output matches the full-prompt path")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Checks that decided cases flow into incremental training: cases posted to
+POST /cases/adjudicated (or appended with append_cases) land in the JSONL
+log, and model.online_training.update() learns exactly those cases and
+publishes a new model version behind the "current" symlink. Runs on a small
+fixture dataset in a temporary directory.
+
+Usage: python test_online_training.py
+"""
+
+import sys
+import os
+import io
+import contextlib
+import tempfile
+
+# Add model directory to path
+sys.path.append(os.path.dirname(__file__))
+
+TOKEN = "test-token"
+CASES = {
+    "Plaintiff": ("I paid invoice {i} and hold the signed contract and bank receipt",
+                  "I have no record of payment {i}", "Signed contract, bank receipt"),
+    "Defendant": ("The goods {i} were late but I cannot prove when they arrived",
+                  "Courier tracking shows delivery {i} on time", "Courier tracking, delivery logs"),
+    "Neutral": ("The storm damaged fence {i} between our houses",
+                "The storm damaged fence {i}, nobody maintained it", "Weather bulletin"),
+}
+
+
+def check(label, ok, detail=""):
+    print(f"   {'✅' if ok else '❌'} {label}{f': {detail}' if detail else ''}")
+    return ok
+
+
+def make_cases(start, count):
+    cases = []
+    for i in range(start, start + count):
+        for verdict, (plaintiff, defendant, evidence) in CASES.items():
+            cases.append({"plaintiff": plaintiff.format(i=i), "defendant": defendant.format(i=i),
+                          "evidence": evidence, "verdict": verdict})
+    return cases
+
+
+def main():
+    print("=" * 50)
+    print("🧪 ONLINE TRAINING TEST")
+    print("=" * 50)
+
+    try:
+        import pandas as pd
+        from model.artifacts import CURRENT_LINK, load_checkpoint
+        from model import online_training
+    except ImportError as e:
+        print(f"   ❌ {e}")
+        sys.exit(1)
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as directory:
+        root = os.path.join(directory, "online")
+        log = os.path.join(directory, "adjudicated_cases.jsonl")
+        dataset = os.path.join(directory, "bootstrap.csv")
+        pd.DataFrame(make_cases(0, 10)).to_csv(dataset, index=False)
+        current = os.path.join(root, CURRENT_LINK)
+
+        print("\n1️⃣ Bootstrap")
+        trainer = online_training.bootstrap_from_dataset(dataset, epochs=3, n_features=1024)
+        trainer.publish(root)
+        first_version = os.path.realpath(current)
+        failures += not check("first version published", os.path.isdir(first_version))
+        failures += not check("nothing logged yet, nothing learned",
+                              online_training.update(root, log) == 0)
+
+        print("\n2️⃣ POST /cases/adjudicated")
+        os.environ.update(GENAI_ENABLED="0", ADJUDICATED_CASES_TOKEN=TOKEN, ADJUDICATED_LOG_PATH=log)
+        with contextlib.redirect_stdout(io.StringIO()):
+            import app
+        client = app.app.test_client()
+        auth = {"Authorization": f"Bearer {TOKEN}"}
+        posted = make_cases(100, 2)
+        response = client.post('/cases/adjudicated', json=posted[0])
+        failures += not check("refused without the token", response.status_code == 401,
+                              str(response.status_code))
+        response = client.post('/cases/adjudicated', headers=auth,
+                               json=[posted[0], {**posted[1], "verdict": "settled"}])
+        failures += not check("invalid verdict rejects the whole batch",
+                              response.status_code == 400 and not os.path.exists(log),
+                              str(response.get_json()))
+        response = client.post('/cases/adjudicated', headers=auth, json={"cases": posted})
+        failures += not check("cases logged", response.status_code == 201
+                              and response.get_json()["logged"] == len(posted), str(response.get_json()))
+
+        print("\n3️⃣ append_cases")
+        appended = [{**case, "verdict": case["verdict"].lower()} for case in make_cases(200, 2)]
+        online_training.append_cases(appended, log)
+        with open(log) as f:
+            lines = f.readlines()
+        failures += not check("one line per case", len(lines) == len(posted) + len(appended),
+                              f"{len(lines)} lines")
+
+        print("\n4️⃣ update() learns the log and publishes")
+        with contextlib.redirect_stdout(io.StringIO()):
+            learned = online_training.update(root, log)
+        failures += not check("every logged case learned", learned == len(lines), f"{learned}")
+        second_version = os.path.realpath(current)
+        failures += not check("new version behind current", second_version != first_version)
+        state = load_checkpoint(current)
+        failures += not check("checkpoint records the log position",
+                              state["log_offset"] == os.path.getsize(log)
+                              and state["seen"] == len(make_cases(0, 10)) + learned,
+                              f"offset={state['log_offset']}, seen={state['seen']}")
+        failures += not check("progressive accuracy tracked", state["progressive_total"] == learned)
+        failures += not check("old version kept", os.path.isdir(first_version))
+
+        print("\n5️⃣ Nothing new, half-written line")
+        failures += not check("no new cases, no new version",
+                              online_training.update(root, log) == 0
+                              and os.path.realpath(current) == second_version)
+        with open(log, "a") as f:
+            f.write('{"plaintiff": "partial')
+        failures += not check("unterminated line left for the next run",
+                              online_training.update(root, log) == 0)
+
+    print("\n" + "=" * 50)
+    if failures:
+        print(f"❌ {failures} check(s) failed")
+        sys.exit(1)
+    print("✅ All online training checks passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -79,6 +79,52 @@ def test_verdict():
         print(f"❌ Verdict endpoint error: {e}")
         return False
 
+def test_verdict_batch():
+    """Test the batch verdict endpoint"""
+    print("\n📚 Testing /verdict/batch endpoint...")
+    
+    test_cases = [
+        {
+            "plaintiff": "I paid for a product but never received it. I have proof of payment.",
+            "defendant": "We shipped the product on time with tracking number.",
+            "evidence": "Tracking confirms delivery to the correct address."
+        },
+        {
+            "plaintiff": "The defendant refused to let me park in their driveway.",
+            "defendant": "It's my private property and they never asked permission.",
+            "evidence": "Property deed confirms defendant ownership"
+        },
+        {
+            "plaintiff": "",
+            "defendant": "Missing plaintiff statement should only fail this case."
+        }
+    ]
+    
+    try:
+        response = requests.post(
+            f"{BASE_URL}/verdict/batch",
+            json=test_cases,
+            headers={"Content-Type": "application/json"}
+        )
+        
+        if response.status_code == 200:
+            data = response.json()
+            results = data.get('results', [])
+            if len(results) != len(test_cases) or 'error' not in results[2]:
+                print(f"❌ Unexpected batch results: {results}")
+                return False
+            print("✅ Batch verdict endpoint passed!")
+            for result in results:
+                print(f"   #{result.get('index')}: {result.get('winner', result.get('error'))}")
+            return True
+        else:
+            print(f"❌ Batch verdict endpoint failed with status {response.status_code}")
+            print(f"   Response: {response.text}")
+            return False
+    except Exception as e:
+        print(f"❌ Batch verdict endpoint error: {e}")
+        return False
+
 def test_genai_reason():
     """Test the GenAI reasoning endpoint"""
     print("\n🧠 Testing /api/genai_reason endpoint...")
@@ -113,6 +159,55 @@ def test_genai_reason():
         print(f"❌ GenAI reasoning endpoint error: {e}")
         return False
 
+def test_genai_reason_stream():
+    """Test the streaming GenAI reasoning endpoint (Server-Sent Events)"""
+    print("\n📡 Testing /api/genai_reason/stream endpoint...")
+    
+    test_data = {
+        "plaintiff": "I paid for a product but never received it.",
+        "defendant": "We shipped the product on time.",
+        "evidence": "Tracking confirms delivery.",
+        "verdict": "Defendant"
+    }
+    
+    try:
+        response = requests.post(
+            f"{BASE_URL}/api/genai_reason/stream",
+            json=test_data,
+            headers={"Content-Type": "application/json"},
+            stream=True
+        )
+        
+        if response.status_code != 200:
+            print(f"❌ Streaming endpoint failed with status {response.status_code}")
+            return False
+        
+        tokens = 0
+        done = None
+        event = None
+        for line in response.iter_lines(decode_unicode=True):
+            if line.startswith("event: "):
+                event = line[len("event: "):]
+            elif line.startswith("data: "):
+                payload = json.loads(line[len("data: "):])
+                if event == "token":
+                    tokens += 1
+                elif event == "done":
+                    done = payload
+        
+        if not done:
+            print("❌ Stream ended without a 'done' event")
+            return False
+        
+        print("✅ Streaming reasoning endpoint passed!")
+        print(f"   Model: {done.get('model')}")
+        print(f"   Token events: {tokens}")
+        print(f"   Reasoning length: {len(done.get('reasoning', ''))} characters")
+        return True
+    except Exception as e:
+        print(f"❌ Streaming reasoning endpoint error: {e}")
+        return False
+
 def main():
     """Run all tests"""
     print("=" * 60)
@@ -128,7 +223,9 @@ def main():
     results.append(("Health Check", test_health()))
     results.append(("Home Endpoint", test_home()))
     results.append(("Verdict Endpoint", test_verdict()))
+    results.append(("Batch Verdict Endpoint", test_verdict_batch()))
     results.append(("GenAI Reasoning", test_genai_reason()))
+    results.append(("GenAI Reasoning Stream", test_genai_reason_stream()))
     
     # Summary
     print("\n" + "=" * 60)
@@ -0,0 +1,162 @@
+"""
+Checks that model/train_indian_legal_model.py trains, publishes and serves
+a verdict model in every feature mode: tfidf, hashing (streamed in chunks)
+and tfidf with --structured evidence columns. Each run trains on a small
+fixture dataset with --dataset, --grid and --jobs, publishes into a
+temporary --root, and the bundle is loaded back with VerdictPredictor to
+predict cases. A dataset too small to split must exit with a clear message.
+
+Usage: python test_training_pipeline.py
+"""
+
+import sys
+import os
+import json
+import subprocess
+import tempfile
+import time
+
+# Add model directory to path
+sys.path.append(os.path.dirname(__file__))
+
+TRAINING_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                               "model", "train_indian_legal_model.py")
+
+# Each verdict gets its own vocabulary and evidence profile, so even a
+# dozen cases per class separate cleanly
+TEMPLATES = {
+    "Plaintiff": ("I paid the invoice {i} and have the signed contract and bank receipt",
+                  "I have no record of the payment {i}",
+                  "Signed contract, bank receipt, witness statement",
+                  {"plaintiff_evidence": 1, "plaintiff_witness": 1, "plaintiff_score": 3}),
+    "Defendant": ("The goods {i} were late but I cannot prove when they arrived",
+                  "Delivery logs and courier tracking show delivery on time {i}",
+                  "Courier tracking, delivery logs, photographs",
+                  {"defendant_evidence": 1, "defendant_witness": 1, "defendant_score": 3}),
+    "Neutral": ("The storm damaged the fence {i} shared between our houses",
+                "The storm damaged the fence {i}, nobody maintained it",
+                "Weather bulletin",
+                {"plaintiff_record": 1, "defendant_record": 1,
+                 "plaintiff_score": 1, "defendant_score": 1}),
+}
+CASES_PER_CLASS = 12
+STRUCTURED = ("plaintiff_evidence", "defendant_evidence", "plaintiff_witness", "defendant_witness",
+              "plaintiff_record", "defendant_record", "plaintiff_expert_support",
+              "defendant_expert_support", "plaintiff_score", "defendant_score")
+GRID = {"Logistic Regression": {"C": [1.0, 10.0]}}
+
+MODES = [
+    ("tfidf", []),
+    ("hashing", ["--features", "hashing", "--hash-features", "1024", "--chunk-size", "10"]),
+    ("tfidf+structured", ["--structured"]),
+]
+
+
+def check(label, ok, detail=""):
+    print(f"   {'✅' if ok else '❌'} {label}{f': {detail}' if detail else ''}")
+    return ok
+
+
+def make_case(verdict, i):
+    plaintiff, defendant, evidence, columns = TEMPLATES[verdict]
+    case = {
+        "case_id": f"{verdict[0]}{i}",
+        "plaintiff": plaintiff.format(i=i),
+        "defendant": defendant.format(i=i),
+        "evidence": evidence,
+        "verdict": verdict,
+    }
+    case.update({column: columns.get(column, 0) for column in STRUCTURED})
+    return case
+
+
+def write_fixtures(directory):
+    import pandas as pd
+
+    cases = [make_case(verdict, i) for i in range(CASES_PER_CLASS) for verdict in TEMPLATES]
+    dataset = os.path.join(directory, "cases.csv")
+    pd.DataFrame(cases).to_csv(dataset, index=False)
+    tiny = os.path.join(directory, "tiny.jsonl")
+    with open(tiny, "w") as f:
+        for verdict in TEMPLATES:
+            f.write(json.dumps(make_case(verdict, 0)) + "\n")
+    grid = os.path.join(directory, "grid.json")
+    with open(grid, "w") as f:
+        json.dump(GRID, f)
+    return dataset, tiny, grid
+
+
+def train(dataset, grid, root, extra):
+    """Run the training script; returns (exit code, output)"""
+    command = [sys.executable, TRAINING_SCRIPT, "--dataset", dataset, "--grid", grid,
+               "--jobs", "1", "--root", root] + extra
+    process = subprocess.run(command, capture_output=True, text=True, timeout=600)
+    return process.returncode, process.stdout + process.stderr
+
+
+def main():
+    print("=" * 50)
+    print("🧪 TRAINING PIPELINE TEST")
+    print("=" * 50)
+
+    try:
+        from model.artifacts import CURRENT_LINK, read_manifest
+        from model.predictor import VerdictPredictor
+    except ImportError as e:
+        print(f"   ❌ {e}")
+        sys.exit(1)
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as directory:
+        dataset, tiny, grid = write_fixtures(directory)
+
+        for step, (mode, extra) in enumerate(MODES, 1):
+            print(f"\n{step}️⃣ {mode}: train -> publish -> load -> predict")
+            root = os.path.join(directory, mode)
+            start = time.perf_counter()
+            code, output = train(dataset, grid, root, extra)
+            if not check("training finished", code == 0,
+                         f"{time.perf_counter() - start:.1f}s" if code == 0 else output[-500:]):
+                failures += 1
+                continue
+
+            bundle = os.path.join(root, CURRENT_LINK)
+            failures += not check("published behind the current symlink", os.path.islink(bundle))
+            manifest = read_manifest(bundle)
+            training = manifest["training"]
+            failures += not check("manifest records the run",
+                                  training.get("features") == mode and training.get("samples") == 3 * CASES_PER_CLASS
+                                  and training.get("dataset") == "cases.csv",
+                                  f"features={training.get('features')}, samples={training.get('samples')}")
+
+            predictor = VerdictPredictor.from_bundle(bundle)
+            failures += not check("structured columns match the mode",
+                                  bool(predictor.structured_columns) == ("structured" in mode))
+            cases = []
+            for verdict in TEMPLATES:
+                case = make_case(verdict, 99)
+                structured = {column: case[column] for column in STRUCTURED}
+                cases.append((case["plaintiff"], case["defendant"], case["evidence"], structured))
+            winners = [result["winner"] for result in predictor.predict_batch(cases)]
+            failures += not check("unseen cases predicted", winners == list(TEMPLATES), str(winners))
+            single = predictor.predict(*cases[0])
+            failures += not check("predict matches predict_batch",
+                                  single["winner"] == winners[0]
+                                  and abs(sum(single["probabilities"].values()) - 1) < 1e-3)
+
+        print(f"\n{len(MODES) + 1}️⃣ Dataset too small to split")
+        root = os.path.join(directory, "tiny")
+        code, output = train(tiny, grid, root, [])
+        failures += not check("exits with status 1", code == 1, str(code))
+        failures += not check("says why", "too small to train on" in output and "Traceback" not in output)
+        failures += not check("publishes nothing", not os.path.exists(os.path.join(root, CURRENT_LINK)))
+
+    print("\n" + "=" * 50)
+    if failures:
+        print(f"❌ {failures} check(s) failed")
+        sys.exit(1)
+    print("✅ All training pipeline checks passed")
+
+
+if __name__ == "__main__":
+    main()